@@ -0,0 +1,160 @@
+# ./CreateMutants/bulkSnippetMutator.py
+import logging
+import math
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Per-character chance of each edit, as in RandomMutantCreator.randomlyMutateSnippet
+EDIT_RATE = 0.025
+INSERT, DELETE, REPLACE = 0, 1, 2
+# Printable ASCII, the range inserted and replacing bytes are drawn from
+LOW_BYTE, HIGH_BYTE = 32, 127
+CHUNK_MUTANTS = 8192
+
+class BulkSnippetMutator:
+    """
+    Generates snippet mutants in bulk from a copy of the file loaded once into a byte buffer.
+    Every mutant edits one non-empty line: each byte is independently inserted before (EDIT_RATE), deleted (EDIT_RATE)
+    or replaced (EDIT_RATE), with one forced edit if none hit. Mutants are returned as edit records, parallel columns
+    line/offset/op/byte with starts[i]:starts[i+1] the edits of mutant i, sorted by offset; materialize() turns one
+    into the (line, original, mutated) triple the filter and SnippetFuzzer use.
+    With NumPy the draws for a whole chunk of mutants are single vectorized calls. Without it, the gaps between edits
+    are drawn geometrically, so the Python-level work is per edit rather than per character.
+    """
+    def __init__(self, filePath, seed=None):
+        self.filePath = filePath
+        with open(filePath, "rb") as fh:
+            self.buffer = fh.read()
+        self.starts = array("I")
+        self.lengths = array("I")
+        pos = 0
+        for raw in self.buffer.split(b"\n"):
+            # Text mode reads \r\n as \n, and original lines have always been compared without it
+            length = len(raw) - 1 if raw.endswith(b"\r") else len(raw)
+            self.starts.append(pos)
+            self.lengths.append(length)
+            pos += len(raw) + 1
+        if self.buffer.endswith(b"\n"):
+            self.starts.pop()
+            self.lengths.pop()
+        self.candidates = array("I", (i for i, length in enumerate(self.lengths) if length))
+        self.rng = random.Random(seed)
+        self.npRng = np.random.default_rng(seed) if np is not None else None
+        logging.debug(f"Loaded {len(self.lengths)} lines ({len(self.candidates)} mutable) from {filePath}")
+
+    def generate(self, numMutants):
+        """
+        Edit records of numMutants mutants: {"starts", "line", "offset", "op", "byte"}. Deletes carry byte 0.
+        """
+        if not self.candidates or numMutants <= 0:
+            return {"starts": array("I", [0]), "line": array("I"), "offset": array("I"), "op": array("B"), "byte": array("B")}
+        if np is None:
+            return self._generateArray(numMutants)
+        parts = [self._generateNumpy(min(CHUNK_MUTANTS, numMutants - done)) for done in range(0, numMutants, CHUNK_MUTANTS)]
+        starts = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for part in parts:
+            starts.append(part["starts"][1:] + base)
+            base += len(part["line"])
+        return {
+            "starts": np.concatenate(starts),
+            "line": np.concatenate([p["line"] for p in parts]),
+            "offset": np.concatenate([p["offset"] for p in parts]),
+            "op": np.concatenate([p["op"] for p in parts]),
+            "byte": np.concatenate([p["byte"] for p in parts]),
+        }
+
+    def count(self, edits):
+        return len(edits["starts"]) - 1
+
+    def originalLine(self, line):
+        start = self.starts[line]
+        return self.buffer[start:start + self.lengths[line]].decode("utf-8", errors="replace")
+
+    def materialize(self, edits, i):
+        """
+        (line number, original line, mutated line) of mutant i. Edits that split a multi-byte character leave a
+        replacement character behind.
+        """
+        first, last = int(edits["starts"][i]), int(edits["starts"][i + 1])
+        line = int(edits["line"][first])
+        start = self.starts[line]
+        original = self.buffer[start:start + self.lengths[line]]
+        out = bytearray()
+        pos = 0
+        for k in range(first, last):
+            offset, op = int(edits["offset"][k]), int(edits["op"][k])
+            out += original[pos:offset]
+            if op == INSERT:
+                out.append(int(edits["byte"][k]))
+                out.append(original[offset])
+            elif op == REPLACE:
+                out.append(int(edits["byte"][k]))
+            pos = offset + 1
+        out += original[pos:]
+        return line, original.decode("utf-8", errors="replace"), out.decode("utf-8", errors="replace")
+
+    def iterMutants(self, edits):
+        for i in range(self.count(edits)):
+            yield self.materialize(edits, i)
+
+    def _generateNumpy(self, n):
+        rng = self.npRng
+        candidates = np.frombuffer(self.candidates, dtype=np.uint32)
+        lengths = np.frombuffer(self.lengths, dtype=np.uint32).astype(np.int64)
+        lines = candidates[rng.integers(0, len(candidates), n)]
+        lineLengths = lengths[lines]
+
+        # One roll per byte of every chosen line
+        owner = np.repeat(np.arange(n), lineLengths)
+        firsts = np.cumsum(lineLengths) - lineLengths
+        offsets = np.arange(len(owner)) - np.repeat(firsts, lineLengths)
+        rolls = rng.random(len(owner))
+        hit = rolls < 3 * EDIT_RATE
+        mutant, offset = owner[hit], offsets[hit]
+        op = (rolls[hit] // EDIT_RATE).astype(np.uint8)
+
+        # Mutants the rolls left untouched get one edit anywhere on their line
+        untouched = np.flatnonzero(np.bincount(mutant, minlength=n) == 0)
+        mutant = np.concatenate([mutant, untouched])
+        offset = np.concatenate([offset, (rng.random(len(untouched)) * lineLengths[untouched]).astype(np.int64)])
+        op = np.concatenate([op, rng.integers(0, 3, len(untouched), dtype=np.uint8)])
+
+        order = np.lexsort((offset, mutant))
+        mutant, offset, op = mutant[order], offset[order], op[order]
+        byte = rng.integers(LOW_BYTE, HIGH_BYTE, len(op), dtype=np.uint8)
+        byte[op == DELETE] = 0
+        starts = np.concatenate([[0], np.cumsum(np.bincount(mutant, minlength=n))])
+        return {"starts": starts, "line": lines[mutant], "offset": offset.astype(np.uint32), "op": op, "byte": byte}
+
+    def _generateArray(self, n):
+        rng = self.rng
+        logMiss = math.log(1 - 3 * EDIT_RATE)
+        starts, lines, offsets, ops, bytes_ = array("I", [0]), array("I"), array("I"), array("B"), array("B")
+
+        def gap():
+            # Bytes skipped before the next edit; geometric, like rolling each byte in turn
+            return int(math.log(1.0 - rng.random()) / logMiss)
+
+        for _ in range(n):
+            line = self.candidates[rng.randrange(len(self.candidates))]
+            length = self.lengths[line]
+            before = len(ops)
+            pos = gap()
+            while pos < length:
+                offsets.append(pos)
+                ops.append(rng.randrange(3))
+                pos += 1 + gap()
+            if len(ops) == before:
+                offsets.append(rng.randrange(length))
+                ops.append(rng.randrange(3))
+            for k in range(before, len(ops)):
+                lines.append(line)
+                bytes_.append(0 if ops[k] == DELETE else rng.randrange(LOW_BYTE, HIGH_BYTE))
+            starts.append(len(ops))
+        return {"starts": starts, "line": lines, "offset": offsets, "op": ops, "byte": bytes_}
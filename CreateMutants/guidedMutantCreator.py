@@ -1,30 +1,75 @@
 # ./CreateMutants/guidedMutantCreator.py
 import os
 import csv
+import json
+import logging
+import math
 import random
+import string
+import threading
+from CreateMutants.randomMutantCreator import RandomMutantCreator
+from Logging.coverageStore import CoverageStore
+
+# Values that tend to sit on branch conditions
+INTERESTING_NUMBERS = ["0", "-1", "1", "2147483647", "-2147483648", "9007199254740991", "NaN", "Infinity", "0.5"]
+INTERESTING_STRINGS = ['""', '" "', '"undefined"', '"null"', '"0"', '"true"', '"\\n"', '"../"', '"%s%n"', '"\\u0000"']
+INTERESTING_LITERALS = ["null", "undefined", "true", "false", "[]", "{}"]
 
 class GuidedMutantCreator:
     """
-    
+    Coverage-guided input creation.
+    For TypeScript files it keeps a corpus of inputs that reached coverage nothing before them reached, seeded from the
+    clean and error CSVs and grown from streamed results (observe), and derives new inputs by mutating and splicing
+    corpus entries picked by energy. Entries that found a lot, or whose children keep finding new coverage, get more
+    energy; entries picked often without result get less. With crash buckets, inputs whose function and argument
+    shape keep failing the way many inputs failed before are picked less.
+    For snippets it mutates the lines that crashed before.
     """
-    def __init__(self, singularCrashesDir, multiCrashesDir):
+    def __init__(self, filePath=None, singularCrashesDir=None, multiCrashesDir=None, cleanCSV=None, errorCSV=None,
+                 coverageStore=None, resultStore=None, buckets=None, explore=0.1, maxDuplicates=1000):
+        self.filePath = filePath
         self.singularCrashesDir = singularCrashesDir
         self.multiCrashesDir = multiCrashesDir
+        self.cleanCSV = cleanCSV
+        self.errorCSV = errorCSV
+        # Without a persistent store, coverage is still interned for this run only
+        self.coverageStore = coverageStore if coverageStore is not None else CoverageStore()
+        # Results are read from the extension's ResultStore when there is one, otherwise from the CSVs
+        self.resultStore = resultStore
+        # Down-weights functions and argument shapes whose runs keep landing in saturated crash buckets
+        self.buckets = buckets
+        # Share of inputs that are generated fresh instead of derived from the corpus
+        self.explore = explore
+        self.maxDuplicates = maxDuplicates
+        self.rng = random.Random()
+        self.randomCreator = RandomMutantCreator(filePath) if filePath else None
+        self.bySignature: dict[str, tuple] = {}
+        self.corpus: list[dict] = []
+        self.covered = 0
+        # Queued inputs derived from a corpus entry, so their results can be credited to it
+        self.parents: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        logging.info("Guided Mutant Creator Initialized")
 
     def guidedMutateSnippet(self, maxTests):
-        crashRecords = self._loadCrashRecords()
+        crashRecords = self.loadCrashRecords()
         mutants = []
         for lineNo, originalLine, buggyLine in crashRecords:
             if len(mutants) >= maxTests:
                 break
-            newMutant = self._mutateLine(buggyLine)
+            newMutant = self.mutateLine(buggyLine)
             mutants.append((lineNo, originalLine, newMutant))
         return mutants
 
     def loadCrashRecords(self):
         records = []
         for crashDir in (self.singularCrashesDir, self.multiCrashesDir):
-            if not os.path.isdir(crashDir):
+            if not crashDir or not os.path.isdir(crashDir):
+                continue
+            if self.resultStore is not None:
+                crashCSV = "multiCrashes.csv" if crashDir == self.multiCrashesDir else "crashes.csv"
+                rows = [list(row.values()) for row in self.resultStore.readRows(os.path.join(crashDir, crashCSV))]
+                records.extend(self.crashRecords(rows))
                 continue
             for fileName in os.listdir(crashDir):
                 if not fileName.lower().endswith('.csv'):
@@ -33,13 +78,18 @@ class GuidedMutantCreator:
                 with open(filePath, newline='', encoding='utf-8') as f:
                     reader = csv.reader(f)
                     next(reader, None)  # skip header
-                    for row in reader:
-                        if len(row) >= 3:
-                            try:
-                                lineNo = int(row[0])
-                            except ValueError:
-                                continue
-                            records.append((lineNo, row[1], row[2]))
+                    records.extend(self.crashRecords(reader))
+        return records
+
+    def crashRecords(self, rows):
+        records = []
+        for row in rows:
+            if len(row) >= 3:
+                try:
+                    lineNo = int(row[0])
+                except ValueError:
+                    continue
+                records.append((lineNo, row[1], row[2]))
         return records
 
     def mutateLine(self, text):
@@ -52,3 +102,245 @@ class GuidedMutantCreator:
         else:
             # duplicate a character
             return text[:idx] + text[idx] + text[idx:]
+
+    def guidedCreateInputs(self, max_cases=None):
+        """
+        Lazily yields unique (modifiers, funcName, args) inputs, like RandomMutantCreator.iterInputs.
+        Stops after max_cases inputs, or after maxDuplicates attempts in a row only produced inputs already yielded.
+        """
+        if self.randomCreator is None:
+            logging.warning("Guided input creation needs the TypeScript file path")
+            return
+        with open(self.filePath, encoding="utf-8") as fh:
+            signatures = self.randomCreator.extractSignatures(fh.read())
+        if not signatures:
+            logging.warning("No callable signatures found in %s", self.filePath)
+            return
+        bySignature = {fn: (modifiers, params) for modifiers, fn, params in signatures}
+        self.bySignature = bySignature
+        self.loadCorpus(bySignature)
+
+        seen = set()
+        count = 0
+        duplicates = 0
+        while max_cases is None or count < max_cases:
+            parent, fn, args = self.nextInput(signatures, bySignature)
+            key = self.inputKey(fn, args)
+            if key in seen:
+                duplicates += 1
+                if duplicates >= self.maxDuplicates:
+                    logging.info(f"Guided creator stopped after {duplicates} duplicate inputs in a row")
+                    return
+                continue
+            duplicates = 0
+            seen.add(key)
+            count += 1
+            if parent is not None:
+                with self._lock:
+                    self.parents[key] = parent
+            yield (bySignature[fn][0], fn, args)
+
+    def loadCorpus(self, bySignature):
+        """
+        Seeds the corpus with every CSV row that reached coverage no earlier row reached.
+        """
+        rows = 0
+        for path in (self.cleanCSV, self.errorCSV):
+            if not path:
+                continue
+            records = self.coverageStore.readCsv(path) if self.resultStore is None else \
+                self.coverageStore.decodeRows(self.resultStore.readRows(path))
+            for row in records:
+                rows += 1
+                fn = row.get("funcName")
+                if fn not in bySignature:
+                    continue
+                try:
+                    args = json.loads(row.get("args") or "[]")
+                except ValueError:
+                    continue
+                if not isinstance(args, list) or len(args) != len(bySignature[fn][1]):
+                    continue
+                self.admit(fn, args, row["coverage"])
+        logging.info(f"Guided corpus seeded with {len(self.corpus)} of {rows} recorded inputs")
+
+    def admit(self, fn, args, bits, newEdges=None):
+        """
+        Adds an input to the corpus if it reached something new. newEdges, when the harness result carries it,
+        overrides the function-level novelty of bits. Returns the corpus entry or None.
+        """
+        with self._lock:
+            newFuncs = bits & ~self.covered
+            self.covered |= bits
+            found = newEdges if newEdges is not None else newFuncs.bit_count()
+            if found <= 0:
+                return None
+            entry = {"funcName": fn, "args": list(args), "found": found, "picks": 0, "finds": 0}
+            self.corpus.append(entry)
+            return entry
+
+    def observe(self, case):
+        """
+        Feedback from a streamed harness result: admits inputs that found new coverage and credits their parent.
+        """
+        fn, args = case.get("funcName"), case.get("args") or []
+        bits = self.coverageStore.encode(case.get("coverage") or {})
+        entry = None
+        # Only inputs for functions of this file can be mutated further
+        if fn in self.bySignature and len(args) == len(self.bySignature[fn][1]):
+            entry = self.admit(fn, args, bits, case.get("newEdges"))
+        with self._lock:
+            parent = self.parents.pop(self.inputKey(fn, args), None)
+            if entry is not None and parent is not None:
+                parent["finds"] += 1
+
+    def inputKey(self, fn, args):
+        return json.dumps([fn, args])
+
+    def energy(self, entry):
+        return (1 + entry["found"]) * (1 + 2 * entry["finds"]) / math.sqrt(1 + entry["picks"])
+
+    def bucketWeight(self, fn, args):
+        return self.buckets.weight(fn, args) if self.buckets is not None else 1.0
+
+    def nextInput(self, signatures, bySignature):
+        """
+        (parent entry or None, funcName, args) of the next input to try.
+        """
+        with self._lock:
+            corpus = list(self.corpus)
+        weights = [self.bucketWeight(e["funcName"], e["args"]) for e in corpus]
+        # Signatures nothing in the corpus covers yet still get fresh inputs, and so does everything once the whole
+        # corpus only lands in saturated crash buckets
+        if not corpus or self.rng.random() < self.explore or self.rng.random() > max(weights):
+            # A fresh input of a saturated shape is kept only with its bucket weight, a few draws at most
+            for _ in range(8):
+                _, fn, params = self.rng.choice(signatures)
+                args = [self.rng.choice(self.randomCreator.valuesFor(t, opt)) for _, t, opt in params]
+                if self.rng.random() < self.bucketWeight(fn, args):
+                    break
+            return None, fn, args
+
+        parent = self.rng.choices(corpus, weights=[self.energy(e) * w for e, w in zip(corpus, weights)])[0]
+        with self._lock:
+            parent["picks"] += 1
+        fn = parent["funcName"]
+        params = bySignature[fn][1]
+        args = list(parent["args"])
+
+        mates = [e for e in corpus if e["funcName"] == fn and e is not parent]
+        if mates and self.rng.random() < 0.25:
+            args = self.splice(args, self.rng.choice(mates)["args"])
+        # Stack a few mutations, like havoc in AFL
+        for _ in range(self.rng.choice((1, 1, 2, 4))):
+            if not args:
+                break
+            i = self.rng.randrange(len(args))
+            _, typ, opt = params[i]
+            args[i] = self.mutateValue(args[i], typ, opt)
+        return parent, fn, args
+
+    def splice(self, a, b):
+        """
+        Takes each argument from a or b.
+        """
+        return [x if self.rng.random() < 0.5 else y for x, y in zip(a, b)]
+
+    def mutateValue(self, value, typ, opt):
+        """
+        Mutates one argument literal. Arguments are JavaScript source text, e.g. '"abc"', '42' or '[1, 2]'.
+        """
+        roll = self.rng.random()
+        if roll < 0.1:
+            return self.rng.choice(self.randomCreator.valuesFor(typ, opt))
+        if roll < 0.2:
+            return self.rng.choice(INTERESTING_LITERALS + INTERESTING_NUMBERS + INTERESTING_STRINGS)
+
+        try:
+            parsed = json.loads(value)
+        except (ValueError, TypeError):
+            return self.mutateText(str(value))
+        if isinstance(parsed, bool):
+            return "false" if parsed else "true"
+        if isinstance(parsed, (int, float)):
+            return self.mutateNumber(parsed)
+        if isinstance(parsed, str):
+            return json.dumps(self.mutateText(parsed))
+        if isinstance(parsed, list):
+            return json.dumps(self.mutateList(parsed))
+        if isinstance(parsed, dict):
+            return json.dumps(self.mutateDict(parsed))
+        return self.mutateText(str(value))
+
+    def mutateNumber(self, n):
+        op = self.rng.randrange(5)
+        if op == 0:
+            return self.numberLiteral(n + self.rng.choice((-1, 1)))
+        if op == 1:
+            return self.numberLiteral(n * 2)
+        if op == 2:
+            return self.numberLiteral(-n)
+        if op == 3:
+            return self.numberLiteral(n + self.rng.choice((-1, 1)) * self.rng.randint(2, 1000))
+        return self.rng.choice(INTERESTING_NUMBERS)
+
+    @staticmethod
+    def numberLiteral(n):
+        """
+        JavaScript source of a number. NaN and the infinities (parsed from "NaN" or "1e999", or reached by doubling)
+        would otherwise come out as Python's nan and inf.
+        """
+        if isinstance(n, float) and not math.isfinite(n):
+            return "NaN" if math.isnan(n) else "Infinity" if n > 0 else "-Infinity"
+        return str(n)
+
+    def mutateText(self, text):
+        op = self.rng.randrange(6)
+        pos = self.rng.randrange(len(text) + 1)
+        if op == 0:
+            return text[:pos] + self.rng.choice(string.printable) + text[pos:]
+        if op == 1 and text:
+            return text[:pos] + text[pos + 1:]
+        if op == 2 and text:
+            i = min(pos, len(text) - 1)
+            return text[:i] + self.rng.choice(string.printable) + text[i + 1:]
+        if op == 3:
+            return text[:pos]
+        if op == 4:
+            return text * self.rng.randint(2, 8)
+        return text[:pos] + self.rng.choice(("/", ".", "-", "_", " ", "%", "\\", "'")) + text[pos:]
+
+    def mutateList(self, items):
+        items = list(items)
+        op = self.rng.randrange(4)
+        if op == 0 and items:
+            del items[self.rng.randrange(len(items))]
+        elif op == 1 and items:
+            items.append(self.rng.choice(items))
+        elif op == 2 and items:
+            i = self.rng.randrange(len(items))
+            items[i] = self.mutateElement(items[i])
+        else:
+            items = [] if items else [0]
+        return items
+
+    def mutateDict(self, obj):
+        obj = dict(obj)
+        op = self.rng.randrange(3)
+        if op == 0 and obj:
+            del obj[self.rng.choice(list(obj))]
+        elif op == 1 and obj:
+            key = self.rng.choice(list(obj))
+            obj[key] = self.mutateElement(obj[key])
+        else:
+            obj["".join(self.rng.choices(string.ascii_lowercase, k=self.rng.randint(1, 8)))] = self.rng.choice((None, 0, "", [], {}))
+        return obj
+
+    def mutateElement(self, value):
+        """
+        Mutates a value nested in an array or object. Mutations with no JSON form (NaN, undefined) become null.
+        """
+        try:
+            return json.loads(self.mutateValue(json.dumps(value), "any", False))
+        except ValueError:
+            return None
@@ -3,6 +3,7 @@ import logging
 import random
 import re
 import string
+from CreateMutants.bulkSnippetMutator import BulkSnippetMutator
 
 class RandomMutantCreator():
     """
@@ -19,6 +20,12 @@ class RandomMutantCreator():
     }
 
     STRING_CHARS = string.ascii_letters + string.digits + string.punctuation
+    # Random numbers are drawn from range(NUMBER_RANGE)
+    NUMBER_RANGE = 1000
+    # Input spaces up to this size are enumerated instead of sampled
+    ENUMERATE_LIMIT = 4096
+    # Duplicates in a row after which a sampled input space counts as exhausted
+    MAX_REPEATS = 1000
     def randAscii(self, n = 8):
         return '"' + "".join(random.choice(RandomMutantCreator.STRING_CHARS) for _ in range(n)) + '"'
     
@@ -61,6 +68,7 @@ class RandomMutantCreator():
 
     def __init__(self, filePath):
         self.filePath = filePath
+        self.bulkMutator = None
         logging.info("Random Mutant Creator Initialized")
             
     def randomlyMutateSnippet(self, numMutants):
@@ -69,70 +77,13 @@ class RandomMutantCreator():
         """
         filename = self.filePath.split("\\")[-1]
         logging.info(f"Attempting to create {numMutants} mutations for {filename}")
-        mutants = []
-        with open(self.filePath, 'r') as f:
-            lines = f.readlines()
+        # The file is read once; every later call draws from the same buffer
+        if self.bulkMutator is None:
+            self.bulkMutator = BulkSnippetMutator(self.filePath)
+        edits = self.bulkMutator.generate(numMutants)
+        mutants = list(self.bulkMutator.iterMutants(edits))
 
-        totalLines = len(lines)
-
-        for _ in range(numMutants):
-            while True:
-                line_no = random.randint(0, totalLines - 1)
-                originalLine = lines[line_no].rstrip('\n')
-
-                if not originalLine:
-                    continue
-
-                mutatedLine = []
-                mutationCount = 0
-                i = 0
-
-                while i < len(originalLine):
-                    char = originalLine[i]
-                    roll = random.random()
-
-                    if roll < 0.025:
-                        insertChar = chr(random.randint(32, 126))
-                        mutatedLine.append(insertChar)
-                        mutatedLine.append(char)
-                        mutationCount += 1
-                        i += 1
-                    elif roll < 0.05:
-                        mutationCount += 1
-                        i += 1
-                    elif roll < 0.075:
-                        replaceChar = chr(random.randint(32, 126))
-                        mutatedLine.append(replaceChar)
-                        mutationCount += 1
-                        i += 1
-                    else:
-                        mutatedLine.append(char)
-                        i += 1
-
-                if mutationCount == 0:
-                    mutationType = random.choice(['insert', 'delete', 'replace'])
-                    pos = random.randint(0, len(originalLine) - 1)
-                    mutatedLine = list(originalLine)
-
-                    if mutationType == 'insert':
-                        insertChar = chr(random.randint(32, 126))
-                        mutatedLine.insert(pos, insertChar)
-                    elif mutationType == 'delete':
-                        mutatedLine.pop(pos)
-                    elif mutationType == 'replace':
-                        replaceChar = chr(random.randint(32, 126))
-                        mutatedLine[pos] = replaceChar
-
-                    mutationCount = 1
-                    mutatedLine = ''.join(mutatedLine)
-                else:
-                    mutatedLine = ''.join(mutatedLine)
-
-                mutants.append((line_no, originalLine, mutatedLine))
-                break
-        
         logging.debug(f"Mutants Created: {mutants}")
-        filename = self.filePath.split("\\")[-1]
         logging.info(f"Created {len(mutants)} mutations for {filename}")
         return mutants
     
@@ -223,28 +174,101 @@ class RandomMutantCreator():
         Main function for TypeScript input generation.
         Calls all other functions to parse the TypeScript and generate inputs.
         """
+        cases = list(self.iterInputs(max_cases))
+
+        logging.debug("Mutated inputs: %s", cases)
+        logging.info("Created %d inputs.", len(cases))
+        return cases
+
+    def iterInputs(self, max_cases=None):
+        """
+        Lazily yields unique (modifiers, funcName, args) inputs. Runs until max_cases inputs were produced,
+        or forever when max_cases is None, so callers decide when to stop pulling.
+        Signatures with a small finite input space (no arguments, booleans, numbers) are enumerated in random order
+        and dropped once exhausted; open-ended ones are sampled until they only repeat themselves. Generation stops
+        early when every signature is exhausted.
+        """
         src = open(self.filePath, encoding="utf-8").read()
         signatures = self.extractSignatures(src)
         if not signatures:
             logging.warning("No callable signatures found in %s", self.filePath)
-            return []
+            return
 
         rng   = random.Random()
         seen  = set()
-        cases = []
-
-        while len(cases) < max_cases:
-            modifiers, fn, params = rng.choice(signatures)
-            args = [random.choice(self.valuesFor(t, opt)) for _, t, opt in params]
+        count = 0
+        # Per signature: an iterator over its whole space if small enough, else None and it is sampled
+        active = []
+        for modifiers, fn, params in signatures:
+            size = self.spaceSize(params)
+            if size is not None and size <= self.ENUMERATE_LIMIT:
+                active.append([modifiers, fn, params, self.enumerateSpace(params, size, rng), 0])
+            else:
+                active.append([modifiers, fn, params, None, 0])
+
+        while active and (max_cases is None or count < max_cases):
+            entry = rng.choice(active)
+            modifiers, fn, params, space, _ = entry
+            if space is not None:
+                args = next(space, None)
+                if args is None:
+                    logging.debug("Input space of %s exhausted", fn)
+                    active.remove(entry)
+                    continue
+            else:
+                args = [random.choice(self.valuesFor(t, opt)) for _, t, opt in params]
             key = (tuple(modifiers), fn, tuple(args))
             if key in seen:
+                # A sampled signature that keeps repeating itself has (practically) run out of new inputs
+                entry[4] += 1
+                if entry[4] >= self.MAX_REPEATS:
+                    logging.debug("Input space of %s looks exhausted after %d repeats in a row", fn, entry[4])
+                    active.remove(entry)
                 continue
+            entry[4] = 0
             seen.add(key)
-            cases.append((modifiers, fn, args))
+            count += 1
+            yield (modifiers, fn, args)
 
-        logging.debug("Mutated inputs: %s", cases)
-        logging.info("Created %d inputs.", len(cases))
-        return cases
+        if not active:
+            logging.info("Every input space of %s was exhausted after %d inputs", self.filePath, count)
+
+    def enumerableValues(self, typ, is_opt):
+        """
+        Every value valuesFor can produce for a parameter, or None if that set is open-ended.
+        """
+        if is_opt:
+            return None
+        typ = self.canonicalType(typ)
+        if typ == "boolean":
+            return ["true", "false"]
+        if typ == "number":
+            return [str(n) for n in range(self.NUMBER_RANGE)]
+        return None
+
+    def spaceSize(self, params):
+        """
+        Number of distinct argument lists of a signature, or None if unbounded. A signature without parameters has one.
+        """
+        size = 1
+        for _, t, opt in params:
+            values = self.enumerableValues(t, opt)
+            if values is None:
+                return None
+            size *= len(values)
+        return size
+
+    def enumerateSpace(self, params, size, rng):
+        """
+        Yields every argument list of a finite signature once, in random order.
+        """
+        domains = [self.enumerableValues(t, opt) for _, t, opt in params]
+        for index in rng.sample(range(size), size):
+            args = []
+            for values in domains:
+                index, digit = divmod(index, len(values))
+                args.append(values[digit])
+            yield args
     
     def valuesFor(self, typ, is_opt):
         """
@@ -255,7 +279,7 @@ class RandomMutantCreator():
             return '"' + ''.join(random.choices(string.ascii_letters + string.digits, k=length)) + '"'
 
         def randNumber():
-            return str(random.randint(0, 999))
+            return str(random.randint(0, self.NUMBER_RANGE - 1))
 
         def randBoolean():
             return random.choice(["true", "false"])
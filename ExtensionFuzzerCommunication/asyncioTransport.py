@@ -0,0 +1,166 @@
+# ./ExtensionFuzzerCommunication/asyncioTransport.py
+import asyncio
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+
+# Requests bigger than this are rejected instead of buffered
+MAX_BODY = 64 * 1024 ** 2
+
+class AsyncioTransport:
+    """
+    Minimal HTTP/1.1 server on asyncio for the communicator. Listens on a Unix domain socket when socketPath is set,
+    otherwise on TCP. Connections are kept alive, so a harness pays for the connect once per session.
+    Handlers can block (long-polling /latest, generating a /tests page), so they run on a thread pool.
+    """
+    def __init__(self, communicator, host='127.0.0.1', port=5000, socketPath=None, maxWorkers=16):
+        self.communicator = communicator
+        self.host = host
+        self.port = port
+        self.socketPath = socketPath
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix="fuzz-comm")
+        self.loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stopping = None
+        self._startError = None
+        self._connections: set[asyncio.Task] = set()
+        self._busy: set[asyncio.Task] = set()
+
+    def start(self):
+        """
+        Starts the event loop thread and returns once the socket is listening.
+        """
+        self._thread = threading.Thread(target=self._runLoop, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._startError is not None:
+            raise self._startError
+
+    def stop(self, timeout=5):
+        """
+        Closes the listener and every open connection, then waits for the loop thread to exit.
+        """
+        if self.loop is not None and self._stopping is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _runLoop(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self._serve())
+        except Exception as e:
+            self._startError = e
+        finally:
+            self._ready.set()
+            self.loop.close()
+
+    async def _serve(self):
+        self._stopping = asyncio.Event()
+        if self.socketPath:
+            if os.path.exists(self.socketPath):
+                # Stale socket from a run that didn't exit cleanly
+                os.unlink(self.socketPath)
+            server = await asyncio.start_unix_server(self._handleConnection, path=self.socketPath)
+        else:
+            server = await asyncio.start_server(self._handleConnection, host=self.host, port=self.port, reuse_address=True)
+        self._ready.set()
+
+        async with server:
+            await self._stopping.wait()
+            server.close()
+            # Idle keep-alive connections go at once; requests in progress (e.g. /shutdown itself) get to answer
+            for task in list(self._connections - self._busy):
+                task.cancel()
+            if self._busy:
+                await asyncio.wait(list(self._busy), timeout=2)
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+        if self.socketPath and os.path.exists(self.socketPath):
+            os.unlink(self.socketPath)
+
+    async def _handleConnection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request = await self._readRequest(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                self._busy.add(task)
+                status, payload, contentType = await self._respond(method, target, headers, body)
+
+                keepAlive = headers.get("connection", "").lower() != "close" and not self._stopping.is_set()
+                head = (
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: {contentType}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keepAlive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + payload)
+                await writer.drain()
+                self._busy.discard(task)
+                if not keepAlive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        except ValueError as e:
+            logging.debug(f"Dropping malformed request: {e}")
+        finally:
+            self._busy.discard(task)
+            self._connections.discard(task)
+            writer.close()
+
+    async def _readRequest(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ValueError(f"bad request line {line!r}")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0) or 0)
+        if length > MAX_BODY:
+            raise ValueError(f"request body of {length} bytes is too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _respond(self, method, target, headers, body):
+        url = urlsplit(target)
+        args = dict(parse_qsl(url.query))
+        data = None
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                data = None
+
+        try:
+            result, status = await self.loop.run_in_executor(
+                self.executor, self.communicator.dispatch, method, url.path, args, data, headers
+            )
+        except Exception as e:
+            logging.error(f"Handler for {method} {url.path} failed: {e}")
+            result, status = {'error': str(e)}, 500
+
+        if isinstance(result, str):
+            return status, result.encode("utf-8"), "text/plain; charset=utf-8"
+        return status, json.dumps(result).encode("utf-8"), "application/json"
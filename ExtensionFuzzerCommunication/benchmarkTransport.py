@@ -0,0 +1,115 @@
+# ./ExtensionFuzzerCommunication/benchmarkTransport.py
+"""
+Compares communicator transports on the harness round trip: fetch a /tests page, stream its results to
+/report/cases, repeat. Run with: python -m ExtensionFuzzerCommunication.benchmarkTransport
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from ExtensionFuzzerCommunication.extensionFuzzerCommunicator import ExtensionFuzzerCommunicator
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socketPath, timeout=10):
+        super().__init__("localhost", timeout=timeout)
+        self.socketPath = socketPath
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socketPath)
+
+def callServer(conn, method, path, body=None):
+    headers = {}
+    payload = None
+    if body is not None:
+        payload = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Content-Length": str(len(payload))}
+    conn.request(method, path, body=payload, headers=headers)
+    res = conn.getresponse()
+    data = res.read()
+    return res.status, data
+
+def runClient(connect, rounds, pageSize, latencies):
+    conn = connect()
+    after = 0
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        _, data = callServer(conn, "GET", f"/tests?after={after}&limit={pageSize}")
+        page = json.loads(data)
+        cases = [{"index": c["index"], "outcome": "clean", "funcName": c["funcName"], "args": c["args"], "coverage": {}}
+                 for c in page["cases"]]
+        callServer(conn, "POST", "/report/cases", {"cases": cases})
+        latencies.append(time.perf_counter() - t0)
+        after = page["next"]
+    conn.close()
+
+def benchmark(name, communicator, connect, clients, rounds, pageSize):
+    communicator.run()
+    for _ in range(50):
+        try:
+            conn = connect()
+            callServer(conn, "GET", "/ping")
+            conn.close()
+            break
+        except OSError:
+            time.sleep(0.1)
+
+    # Endless queue so every round gets a full page
+    communicator.setTestQueue({"funcName": "f", "args": [i]} for i in iter(int, 1))
+
+    latencies = []
+    threads = [threading.Thread(target=runClient, args=(connect, rounds, pageSize, latencies)) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    t0 = time.perf_counter()
+    communicator.stop()
+    shutdown = time.perf_counter() - t0
+
+    latencies.sort()
+    total = clients * rounds
+    print(f"{name:<14} {total / elapsed:9.0f} round trips/s   "
+          f"p50 {latencies[len(latencies) // 2] * 1000:6.2f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.2f} ms   "
+          f"shutdown {shutdown * 1000:6.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark communicator transports")
+    parser.add_argument('--clients', type=int, default=4, help='Concurrent harness connections.')
+    parser.add_argument('--rounds', type=int, default=500, help='Page + report round trips per client.')
+    parser.add_argument('--page_size', type=int, default=8, help='Cases per /tests page.')
+    parser.add_argument('--base_port', type=int, default=5900, help='First TCP port to use.')
+    args = parser.parse_args()
+
+    # Per-request access logs would dominate the Flask numbers
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    host = '127.0.0.1'
+    socketPath = os.path.join(tempfile.mkdtemp(prefix="fuzz-bench-"), "comm.sock")
+
+    runs = [
+        ("flask/tcp", ExtensionFuzzerCommunicator(host, args.base_port, "flask"),
+         lambda: http.client.HTTPConnection(host, args.base_port, timeout=10)),
+        ("asyncio/tcp", ExtensionFuzzerCommunicator(host, args.base_port + 1, "asyncio"),
+         lambda: http.client.HTTPConnection(host, args.base_port + 1, timeout=10)),
+    ]
+    if hasattr(socket, "AF_UNIX"):
+        runs.append(("asyncio/unix", ExtensionFuzzerCommunicator(host, args.base_port + 2, "asyncio", socketPath),
+                     lambda: UnixHTTPConnection(socketPath)))
+
+    print(f"{args.clients} clients x {args.rounds} rounds, {args.page_size} cases per page")
+    for name, communicator, connect in runs:
+        benchmark(name, communicator, connect, args.clients, args.rounds, args.page_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# ./ExtensionFuzzerCommunication/coverageTables.py
+import base64
+import logging
+from collections import OrderedDict
+
+class CoverageTables:
+    """
+    Decodes the compact wire format. A harness interns every script URL and (URL, function) pair once per session
+    and sends only the new table entries with each batch. Per-case coverage is then either "cov", a list of symbol IDs,
+    or "bits", a base64 little-endian bitmap over the symbol table. Block ranges ("blk") are keyed by URL ID.
+    Decoded cases get the usual {url: [functionName, ...]} coverage dict back, so downstream code is unchanged.
+    """
+    def __init__(self, maxSessions=8):
+        self.maxSessions = maxSessions
+        self.sessions: OrderedDict[str, tuple[list[str], list[tuple[int, str]]]] = OrderedDict()
+
+    def decode(self, tables, cases):
+        """
+        Decodes a batch against the session's tables plus the entries it carries. The tables themselves only grow
+        in commit(), once the batch was accepted, so a batch the server failed on can be sent again unchanged.
+        """
+        session = str(tables.get("session"))
+        merged = self._newEntries(session, tables)
+        # Bases tell us where the new entries start; a mismatch means a batch went missing
+        if merged is None:
+            logging.error(f"Coverage tables for harness session {session} are out of sync; dropping coverage")
+            for case in cases:
+                case.pop("cov", None)
+                case.pop("bits", None)
+                case.pop("blk", None)
+                case.setdefault("coverage", {})
+            return cases
+        (urls, newUrls), (symbols, newSymbols) = merged
+
+        def url(uid):
+            return urls[uid] if uid < len(urls) else newUrls[uid - len(urls)]
+
+        def symbol(sid):
+            return symbols[sid] if sid < len(symbols) else newSymbols[sid - len(symbols)]
+
+        urlCount, symbolCount = len(urls) + len(newUrls), len(symbols) + len(newSymbols)
+        for case in cases:
+            blocks = case.pop("blk", None)
+            if blocks is not None:
+                case["blocks"] = {url(int(u)): ranges for u, ranges in blocks.items() if 0 <= int(u) < urlCount}
+            ids = case.pop("cov", None)
+            bits = case.pop("bits", None)
+            if bits is not None:
+                ids = self.bitmapIds(bits)
+            if ids is None:
+                continue
+            coverage = {}
+            for sid in ids:
+                if 0 <= sid < symbolCount:
+                    urlId, name = symbol(sid)
+                    coverage.setdefault(url(urlId), []).append(name)
+            case["coverage"] = coverage
+        return cases
+
+    def commit(self, tables):
+        """
+        Appends the entries of an accepted batch to its session's tables.
+        """
+        session = str(tables.get("session"))
+        merged = self._newEntries(session, tables)
+        if merged is None:
+            return
+        (urls, newUrls), (symbols, newSymbols) = merged
+        if session not in self.sessions:
+            self.sessions[session] = (urls, symbols)
+            # Old harness sessions (previous VS Code windows) will never send again
+            while len(self.sessions) > self.maxSessions:
+                self.sessions.popitem(last=False)
+        self.sessions.move_to_end(session)
+        urls.extend(newUrls)
+        symbols.extend(newSymbols)
+
+    def _newEntries(self, session, tables):
+        """
+        ((urls, new urls), (symbols, new symbols)) of a batch, or None if its bases do not line up with the session.
+        A batch sent again after its response was lost repeats entries the server already has; those are skipped.
+        """
+        urls, symbols = self.sessions.get(session, ([], []))
+        merged = []
+        for have, base, sent in (
+            (urls, tables.get("urlBase", len(urls)), list(tables.get("urls", []))),
+            (symbols, tables.get("symBase", len(symbols)), [(int(u), str(n)) for u, n in tables.get("symbols", [])]),
+        ):
+            overlap = len(have) - base if isinstance(base, int) else -1
+            if overlap < 0 or overlap > len(sent) or have[base:] != sent[:overlap]:
+                return None
+            merged.append((have, sent[overlap:]))
+        return merged
+
+    def bitmapIds(self, bits):
+        value = int.from_bytes(base64.b64decode(bits), "little")
+        ids = []
+        while value:
+            low = value & -value
+            ids.append(low.bit_length() - 1)
+            value ^= low
+        return ids
@@ -1,114 +1,262 @@
 # ./ExtensionFuzzerCommunication/extensionFuzzerCommunication.py
 from flask import Flask, request, jsonify
+from werkzeug.serving import make_server
 import threading
 import logging
-import requests
+import re
+from ExtensionFuzzerCommunication.asyncioTransport import AsyncioTransport
+from ExtensionFuzzerCommunication.fuzzSession import FuzzSession
+
+# Requests without a session ID (the snippet extension, single-harness runs) land here
+DEFAULT_SESSION = "default"
+SESSION_HEADER = "x-fuzz-session"
+SESSION_PATH_RE = re.compile(r"^/s/(?P<session>[A-Za-z0-9_.-]+)(?P<path>/.*)$")
+
 class ExtensionFuzzerCommunicator:
     """
     HTTP server so harness can retrieve information and send results back to python scripts.
+    transport is "flask" (Werkzeug, TCP) or "asyncio" (stdlib HTTP/1.1 with keep-alive, on TCP or on socketPath).
+    Each harness talks to its own FuzzSession, picked by an X-Fuzz-Session header or a /s/<id>/ path prefix.
+    The methods on this class act on the default session.
     """
-    def __init__(self, host='127.0.0.1', port=5000):
+    def __init__(self, host='127.0.0.1', port=5000, transport="flask", socketPath=None):
+        if transport not in ("flask", "asyncio"):
+            raise ValueError(f"Unknown transport: {transport}")
         self.host = host
         self.port = port
+        self.transport = transport
+        self.socketPath = socketPath
+        self._server = None
+        self._stopLock = threading.Lock()
         self.app = Flask(__name__)
-        self.latestTestResult = None
+        self.sessions: dict[str, FuzzSession] = {}
+        self._sessionLock = threading.Lock()
+        self.sessionId = DEFAULT_SESSION
+        self.defaultSession = self.session(DEFAULT_SESSION)
         self.setupRoutes()
-        self.testQueue = None
+
+    def session(self, sessionId):
+        """
+        Returns the session with this ID, creating it on first use.
+        """
+        with self._sessionLock:
+            if sessionId not in self.sessions:
+                self.sessions[sessionId] = FuzzSession(sessionId, self)
+                logging.debug(f"Created communicator session {sessionId}")
+            return self.sessions[sessionId]
+
+    def closeSession(self, sessionId):
+        with self._sessionLock:
+            session = self.sessions.pop(sessionId, None)
+        if session is not None:
+            session.finishQueue()
 
     def setupRoutes(self):
         """
         Various routes used by Extension to communicate with python scripts.
+        Every transport dispatches into the same handlers, so the endpoints behave identically.
+        """
+        self.routes = {
+            # Extension reports data to python.
+            ('POST', '/report'): self.handleReport,
+            # Harness streams finished cases here as they complete
+            ('POST', '/report/cases'): self.handleReportCases,
+            # Latest info from extension. ?wait=<seconds> long-polls until a result arrives or the wait runs out.
+            ('GET', '/latest'): self.handleLatest,
+            # Reset so latest can be waited on again
+            ('POST', '/reset'): self.handleReset,
+            # Allow python to set tests generated
+            ('POST', '/setTests'): self.handleSetTests,
+            # Harness pages through the queue with /tests?after=<next index>&limit=<page size>
+            ('GET', '/tests'): self.handleTests,
+            # Sidecar harness polls for the next batch and the module it targets, then pages its cases from /tests
+            ('GET', '/batch'): self.handleBatch,
+            # Harness is alive and working on the given case index
+            ('POST', '/heartbeat'): self.handleHeartbeat,
+            # Counters for this session, or for every session
+            ('GET', '/stats'): self.handleStats,
+            ('GET', '/sessions'): self.handleSessions,
+            # Check to see if server is online.
+            ('GET', '/ping'): self.handlePing,
+            ('POST', '/shutdown'): self.handleShutdown,
+        }
+
+        def view(subpath=""):
+            headers = {k.lower(): v for k, v in request.headers.items()}
+            body, status = self.dispatch(request.method, request.path, request.args.to_dict(), request.get_json(silent=True), headers)
+            if isinstance(body, str):
+                return body, status
+            return jsonify(body), status
+
+        self.app.add_url_rule("/", endpoint="dispatch_root", view_func=view, methods=["GET", "POST"])
+        self.app.add_url_rule("/<path:subpath>", endpoint="dispatch", view_func=view, methods=["GET", "POST"])
+
+    def dispatch(self, method, path, args, data, headers=None):
+        """
+        Runs the handler for method and path in the addressed session.
+        Returns (body, status); str bodies are plain text, anything else JSON.
         """
-        # Extension reports data to python.
-        @self.app.route('/report', methods=['POST'])
-        def report():
-            data = request.get_json()
-            if not data:
-                return jsonify({'error': 'No JSON payload provided.'}), 400
-
-            self.latestTestResult = data
-            logging.info(f"Received test result: {data}")
-            return jsonify({'status': 'received'}), 200
-        
-        # Call to keep retrieving the latest info from extension
-        @self.app.route('/latest', methods=['GET'])
-        def latest():
-            return jsonify({"result": self.latestTestResult})
-        
-        # Reset so latest can be waited on again
-        @self.app.route('/reset', methods=['POST'])
-        def reset():
-            self.latestTestResult = None
-            logging.info("Extension test result reset.")
-            return jsonify({'status': 'reset'}), 200
-        
-        # Allow python to set tests generated
-        @self.app.route('/setTests', methods=['POST'])
-        def set_tests():
-            data = request.get_json()
-            if not isinstance(data, list):
-                return jsonify({'error':'expected JSON array'}), 400
-            self.testQueue = data
-            logging.info(f"Test queue set: {len(data)} cases")
-            return jsonify({'status':'ok'}), 200
-
-        # Allow harness to retrieve tests
-        @self.app.route('/tests', methods=['GET'])
-        def get_tests():
-            return jsonify(self.testQueue), 200
-        
-        # Check to see if server is online.
-        @self.app.route("/ping")
-        def ping():
-            return "OK", 200
-        
-        @self.app.route('/shutdown', methods=['POST'])
-        def _shutdown():
-            func = request.environ.get('werkzeug.server.shutdown')
-            if func is None:                      # <‑‑ don’t raise, just return OK
-                return jsonify({'status': 'not running with Werkzeug'}), 200
-            func()
-            return jsonify({'status': 'shutting down'}), 200
+        sessionId = (headers or {}).get(SESSION_HEADER) or DEFAULT_SESSION
+        m = SESSION_PATH_RE.match(path)
+        if m:
+            sessionId, path = m.group("session"), m.group("path")
+
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in self.routes):
+                return {'error': 'method not allowed'}, 405
+            return {'error': 'not found'}, 404
+        session = self.session(sessionId)
+        session.noteRequest(method, path)
+        return handler(session, args, data)
+
+    def _arg(self, args, name, default, cast):
+        try:
+            return cast(args[name]) if name in args else default
+        except (TypeError, ValueError):
+            return default
+
+    def handleReport(self, session, args, data):
+        if not data:
+            return {'error': 'No JSON payload provided.'}, 400
+
+        session.setLatestResult(data)
+        logging.info(f"Received test result: {data}")
+        return {'status': 'received'}, 200
+
+    def handleReportCases(self, session, args, data):
+        cases = data.get('cases') if isinstance(data, dict) else None
+        if not isinstance(cases, list):
+            return {'error': 'expected {"cases": [...]}'}, 400
+        tables = data.get('tables') if isinstance(data.get('tables'), dict) else None
+        if tables is not None:
+            cases = session.decodeCases(tables, cases)
+        session.receiveCases(cases)
+        # Only an accepted batch extends the tables; after a failure the harness re-sends the same entries
+        if tables is not None:
+            session.commitTables(tables)
+        return {'status': 'received', 'count': len(cases)}, 200
+
+    def handleLatest(self, session, args, data):
+        wait = self._arg(args, 'wait', 0, float)
+        if wait > 0:
+            return {"result": session.waitForResult(timeout=min(wait, 300))}, 200
+        return {"result": session.getLatestResult()}, 200
+
+    def handleReset(self, session, args, data):
+        session.resetLatestResult()
+        return {'status': 'reset'}, 200
+
+    def handleSetTests(self, session, args, data):
+        if not isinstance(data, list):
+            return {'error':'expected JSON array'}, 400
+        session.setTestQueue(data)
+        logging.info(f"Test queue set: {len(data)} cases")
+        return {'status':'ok'}, 200
+
+    def handleTests(self, session, args, data):
+        after = self._arg(args, 'after', 0, int)
+        limit = self._arg(args, 'limit', 64, int)
+        return session.page(after, max(1, min(limit, 1024))), 200
+
+    def handleBatch(self, session, args, data):
+        return session.batch(self._arg(args, 'after', 0, int)), 200
+
+    def handleHeartbeat(self, session, args, data):
+        session.heartbeat(data.get('index') if isinstance(data, dict) else None)
+        return {'status': 'ok'}, 200
+
+    def handleStats(self, session, args, data):
+        return session.stats(), 200
+
+    def handleSessions(self, session, args, data):
+        with self._sessionLock:
+            sessions = list(self.sessions.values())
+        return {'sessions': [s.stats() for s in sessions]}, 200
+
+    def handlePing(self, session, args, data):
+        return "OK", 200
+
+    def handleShutdown(self, session, args, data):
+        # Stopping joins the server thread, so it can't happen on the request thread itself
+        threading.Thread(target=self.stop, daemon=True).start()
+        return {'status': 'shutting down'}, 200
 
     # Run
     def run(self):
-        self._thread = threading.Thread(
-            target=self.app.run,
-            kwargs={
-                'host': self.host,
-                'port': self.port,
-                'debug': False,
-                'use_reloader': False
-            },
-            daemon=True,
-        )
-        self._thread.start()
-        print(f"HTTP server is running on http://{self.host}:{self.port}")
-    
+        if self.transport == "asyncio":
+            self._server = AsyncioTransport(self, self.host, self.port, self.socketPath)
+            self._server.start()
+        else:
+            # make_server instead of app.run so stop() can shut the server down deterministically
+            self._server = make_server(self.host, self.port, self.app, threaded=True)
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        print(f"HTTP server is running on {self.address()} ({self.transport})")
+
     def stop(self):
-        try:
-            requests.post(f"http://{self.host}:{self.port}/shutdown", timeout=2)
-        except requests.RequestException:
-            pass
-        if getattr(self, "_thread", None):
-            self._thread.join(timeout=5)
+        # A clean shutdown ends every queue; only a fuzzer that died without stopping leaves a cursor to recover
+        with self._sessionLock:
+            sessions = list(self.sessions.values())
+        for session in sessions:
+            session.finishQueue()
+        with self._stopLock:
+            server, self._server = getattr(self, "_server", None), None
+        if server is None:
+            return
+        if self.transport == "asyncio":
+            server.stop()
+        else:
+            server.shutdown()
+            server.server_close()
+            if getattr(self, "_thread", None):
+                self._thread.join(timeout=5)
+        logging.info(f"HTTP server on {self.address()} stopped")
+
+    def address(self):
+        if self.socketPath and self.transport == "asyncio":
+            return f"unix:{self.socketPath}"
+        return f"http://{self.host}:{self.port}"
 
     """
-    All 3 methods below are self-explanatory by intuition and function names.
+    Default-session shortcuts, so single-harness callers can keep using the communicator directly.
     """
 
     def getLatestResult(self):
-        return self.latestTestResult
-    
+        return self.defaultSession.getLatestResult()
+
+    def waitForResult(self, timeout=None):
+        return self.defaultSession.waitForResult(timeout)
+
     def resetLatestResult(self):
-        try:
-            response = requests.post(f"http://{self.host}:{self.port}/reset")
-            if response.status_code == 200:
-                logging.debug("Successfully reset test result on server.")
-            else:
-                logging.warning("Failed to reset test result on server.")
-        except Exception as e:
-            logging.error(f"Error resetting test result: {e}")
-
-    def setTestQueue(self, cases):
-        self.testQueue = cases
\ No newline at end of file
+        self.defaultSession.resetLatestResult()
+
+    def receiveCases(self, cases):
+        self.defaultSession.receiveCases(cases)
+
+    def setCaseSink(self, sink):
+        self.defaultSession.setCaseSink(sink)
+
+    def firstUnreportedCase(self):
+        return self.defaultSession.firstUnreportedCase()
+
+    def runningCase(self):
+        return self.defaultSession.runningCase()
+
+    def lastSignOfLife(self):
+        return self.defaultSession.lastSignOfLife()
+
+    def resetLiveness(self):
+        self.defaultSession.resetLiveness()
+
+    def skipCase(self, index):
+        self.defaultSession.skipCase(index)
+
+    def setTestQueue(self, cases, **kwargs):
+        self.defaultSession.setTestQueue(cases, **kwargs)
+
+    def finishQueue(self):
+        self.defaultSession.finishQueue()
+
+    def closeBatches(self):
+        self.defaultSession.closeBatches()
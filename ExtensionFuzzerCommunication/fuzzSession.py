@@ -0,0 +1,257 @@
+# ./ExtensionFuzzerCommunication/fuzzSession.py
+import threading
+import logging
+import time
+from collections import Counter
+from ExtensionFuzzerCommunication.lazyTestQueue import LazyTestQueue
+from ExtensionFuzzerCommunication.coverageTables import CoverageTables
+from ExtensionFuzzerCommunication.queueCursor import QueueCursor
+
+class FuzzSession:
+    """
+    Queue, result slot and liveness of one harness. The communicator routes every request to a session by ID,
+    so several harnesses (or a snippet run and a TS run) can share one server.
+    Exposes the communicator's connection details, so it can be handed to TsExtensionFuzzer in its place.
+    """
+    def __init__(self, sessionId, server):
+        self.sessionId = sessionId
+        self.server = server
+        # Guards everything below except latestTestResult, which has its own condition
+        self.lock = threading.RLock()
+        # Serializes sink calls. The sink writes results to disk, so it runs outside self.lock, which heartbeats
+        # and the watchdog need promptly.
+        self.sinkLock = threading.RLock()
+        self.latestTestResult = None
+        # Signalled whenever /report delivers a result so waiters wake immediately
+        self.resultCondition = threading.Condition()
+        # Per-case results streamed by the harness while a queue is running
+        self.caseSink = None
+        self.pendingCases = []
+        self.cursor = QueueCursor()
+        self.lastCaseReport = None
+        # Harness liveness, used by the watchdog in TsExtensionFuzzer. heartbeatIndex is the highest case index a
+        # heartbeat announced; the harness sends one before every case, so it names the case a hang is stuck in.
+        self.lastHeartbeat = None
+        self.heartbeatIndex = None
+        # Intern tables for harnesses that send compact coverage
+        self.coverageTables = CoverageTables()
+        self.testQueue = None
+        self.batchId = 0
+        self.batchModule = None
+        self.batchesClosed = False
+        self.created = time.time()
+        self.lastSeen = None
+        self.requests = Counter()
+        self.counters = Counter()
+
+    @property
+    def host(self):
+        return self.server.host
+
+    @property
+    def port(self):
+        return self.server.port
+
+    @property
+    def transport(self):
+        return self.server.transport
+
+    @property
+    def socketPath(self):
+        return self.server.socketPath
+
+    def noteRequest(self, method, path):
+        with self.lock:
+            self.requests[f"{method} {path}"] += 1
+            self.lastSeen = time.time()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "session": self.sessionId,
+                "created": self.created,
+                "lastSeen": self.lastSeen,
+                "requests": dict(self.requests),
+                "casesReceived": self.counters["cases"],
+                "outcomes": {k[len("outcome:"):]: v for k, v in self.counters.items() if k.startswith("outcome:")},
+                "results": self.counters["results"],
+                "heartbeats": self.counters["heartbeats"],
+                "queued": self.testQueue.produced if self.testQueue is not None else 0,
+                "acknowledged": self.cursor.acked,
+                "batchId": self.batchId,
+                "batchModule": self.batchModule,
+            }
+
+    """
+    All methods below are self-explanatory by intuition and function names.
+    """
+
+    def getLatestResult(self):
+        return self.latestTestResult
+
+    def setLatestResult(self, data):
+        with self.resultCondition:
+            self.latestTestResult = data
+            self.resultCondition.notify_all()
+        with self.lock:
+            self.counters["results"] += 1
+
+    def waitForResult(self, timeout=None):
+        """
+        Blocks until the harness reports a result (returned immediately) or timeout seconds pass (returns None).
+        """
+        with self.resultCondition:
+            self.resultCondition.wait_for(lambda: self.latestTestResult is not None, timeout=timeout)
+            return self.latestTestResult
+
+    def resetLatestResult(self):
+        with self.resultCondition:
+            self.latestTestResult = None
+        logging.debug(f"Extension test result reset for session {self.sessionId}.")
+
+    def decodeCases(self, tables, cases):
+        with self.lock:
+            return self.coverageTables.decode(tables, cases)
+
+    def commitTables(self, tables):
+        with self.lock:
+            self.coverageTables.commit(tables)
+
+    def receiveCases(self, cases):
+        """
+        Records streamed case results and hands them to the sink, or holds them until a sink is set.
+        """
+        with self.sinkLock:
+            with self.lock:
+                self.cursor.acknowledge(case['index'] for case in cases if isinstance(case.get('index'), int))
+                self.lastCaseReport = time.monotonic()
+                self.counters["cases"] += len(cases)
+                for case in cases:
+                    self.counters[f"outcome:{case.get('outcome', 'unknown')}"] += 1
+                if self.testQueue is not None:
+                    self.testQueue.noteResults(cases)
+                sink = self.caseSink
+                if sink is None:
+                    self.pendingCases.extend(cases)
+            if sink is not None:
+                sink(cases)
+        logging.debug(f"Received {len(cases)} streamed case results for session {self.sessionId}")
+
+    def setCaseSink(self, sink):
+        """
+        sink(cases) is called with every batch of streamed results. Results that arrived before a sink was set
+        are delivered immediately.
+        """
+        with self.sinkLock:
+            with self.lock:
+                self.caseSink = sink
+                pending = []
+                if sink is not None:
+                    pending, self.pendingCases = self.pendingCases, []
+            if pending:
+                sink(pending)
+
+    def firstUnreportedCase(self):
+        """
+        Index and case of the first dispatched case without a streamed result, or (None, None) if all reported.
+        """
+        with self.lock:
+            cursor = self.cursor
+        return cursor.firstUnacknowledged()
+
+    def runningCase(self):
+        """
+        Index and case the harness is running: the case its latest heartbeat announced, unless that case already
+        reported. The harness announces every case before running it, so without a heartbeat none was started;
+        earlier unreported cases may just be buffered in its report batch. (None, None) if no case is in flight.
+        """
+        with self.lock:
+            index, cursor = self.heartbeatIndex, self.cursor
+        if index is None:
+            return None, None
+        case = cursor.unacknowledgedCase(index)
+        return (index, case) if case is not None else (None, None)
+
+    def heartbeat(self, index):
+        with self.lock:
+            self.lastHeartbeat = time.monotonic()
+            # Heartbeats are handled concurrently, so a late one must not move the index back
+            if isinstance(index, int) and (self.heartbeatIndex is None or index > self.heartbeatIndex):
+                self.heartbeatIndex = index
+            self.counters["heartbeats"] += 1
+            cursor = self.cursor
+        # Persisted so a run that dies here blames this case on restart; the write stays outside the session lock
+        if isinstance(index, int):
+            cursor.noteHeartbeat(index)
+
+    def lastSignOfLife(self):
+        """
+        Monotonic time of the latest heartbeat or streamed result since the last resetLiveness, or None.
+        """
+        with self.lock:
+            seen = [t for t in (self.lastHeartbeat, self.lastCaseReport) if t is not None]
+        return max(seen) if seen else None
+
+    def resetLiveness(self):
+        with self.lock:
+            self.lastHeartbeat = None
+            self.heartbeatIndex = None
+            self.lastCaseReport = None
+
+    def skipCase(self, index):
+        """
+        Marks case index as handled so a restarted harness resumes with the case after it.
+        """
+        with self.lock:
+            self.cursor.acknowledge([index])
+            if self.testQueue is not None:
+                self.testQueue.skipPast(index)
+
+    def page(self, after, limit):
+        with self.lock:
+            queue = self.testQueue
+        if queue is None:
+            return {'cases': [], 'next': after, 'done': True}
+        # Generating a page can be slow, so it runs outside the session lock
+        return queue.page(after, limit)
+
+    def setTestQueue(self, cases, module=None, maxCases=None, timeBudget=None, plateau=None, cursorPath=None):
+        """
+        Sets the cases the harness will run. cases can be a list or a generator; generators are only advanced
+        as the harness asks for more pages. Passing module publishes them as a new sidecar batch.
+        cursorPath persists which cases were dispatched and acknowledged (see QueueCursor).
+        """
+        with self.lock:
+            self.cursor = QueueCursor(cursorPath, source=module)
+            self.pendingCases = []
+            self.lastCaseReport = None
+            self.heartbeatIndex = None
+            self.testQueue = LazyTestQueue(cases, maxCases=maxCases, timeBudget=timeBudget, plateau=plateau, cursor=self.cursor)
+            if module is not None:
+                self.batchModule = module
+                self.batchId += 1
+                logging.info(f"Published batch {self.batchId} for {module} in session {self.sessionId}")
+
+    def batch(self, after):
+        with self.lock:
+            if self.batchesClosed:
+                return {'done': True}
+            if self.batchModule is None or self.batchId <= after:
+                return {'id': after, 'pending': True}
+            return {'id': self.batchId, 'module': self.batchModule}
+
+    def finishQueue(self):
+        """
+        Called once the harness reported the end of the queue; drops the persisted cursor and the exhausted queue,
+        so nothing can page the previous file's cases once they are finished.
+        """
+        with self.lock:
+            self.cursor.close()
+            self.testQueue = None
+
+    def closeBatches(self):
+        """
+        Tells a sidecar harness there is nothing left to run.
+        """
+        with self.lock:
+            self.batchesClosed = True
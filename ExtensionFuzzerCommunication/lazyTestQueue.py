@@ -0,0 +1,108 @@
+# ./ExtensionFuzzerCommunication/lazyTestQueue.py
+import logging
+import threading
+import time
+
+class LazyTestQueue:
+    """
+    Test cases pulled from a generator one page at a time, so inputs are created while the harness runs.
+    Only the pages the harness has not finished are kept in memory. The queue ends when the source runs dry,
+    maxCases cases were handed out, timeBudget seconds passed since the first page, or plateau consecutive
+    cases reached no function (or, with block coverage, no block) that had not been covered before.
+    """
+    def __init__(self, source, maxCases=None, timeBudget=None, plateau=None, cursor=None):
+        self.source = iter(source)
+        self.cursor = cursor
+        self.maxCases = maxCases
+        self.timeBudget = timeBudget
+        self.plateau = plateau
+        self.started = None
+        self.produced = 0
+        self.stopReason = None
+        self.inFlight: dict[int, dict] = {}
+        self.covered: set[tuple] = set()
+        self.sinceNewCoverage = 0
+        self.resumeFrom = 0
+        self._lock = threading.Lock()
+
+    def page(self, after=0, limit=64):
+        """
+        Cases with index >= after, at most limit of them. Asking for a page past a case means the harness
+        has run it, so it is dropped from memory. An empty page means the queue is finished.
+        """
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+            # A restarted harness starts over at 0; send it past the case it hung on
+            after = max(after, self.resumeFrom)
+
+            for index in [i for i in self.inFlight if i < after]:
+                del self.inFlight[index]
+
+            # Cases already handed out are served again if the harness retries the same cursor
+            cases = [dict(self.inFlight[i], index=i) for i in sorted(self.inFlight) if after <= i < after + limit]
+
+            while len(cases) < limit and not self._shouldStop():
+                try:
+                    case = next(self.source)
+                except StopIteration:
+                    self._stop("input source exhausted")
+                    break
+                index = self.produced
+                self.produced += 1
+                self.inFlight[index] = case
+                cases.append(dict(case, index=index))
+
+            if self.cursor is not None and cases:
+                self.cursor.dispatched(cases)
+
+            nextCursor = cases[-1]["index"] + 1 if cases else after
+            return {"cases": cases, "next": nextCursor, "done": not cases}
+
+    def noteResults(self, results):
+        """
+        Updates the plateau counter from streamed case results.
+        """
+        with self._lock:
+            for result in results:
+                new = False
+                for url, funcs in (result.get("coverage") or {}).items():
+                    for func in funcs:
+                        if (url, func) not in self.covered:
+                            self.covered.add((url, func))
+                            new = True
+                # Block coverage: a block that ran for the first time counts as new as well
+                for url, ranges in (result.get("blocks") or {}).items():
+                    for start, end, count in ranges:
+                        if count > 0 and (url, start, end) not in self.covered:
+                            self.covered.add((url, start, end))
+                            new = True
+                self.sinceNewCoverage = 0 if new else self.sinceNewCoverage + 1
+
+    def skipPast(self, index):
+        """
+        Drops case index and everything before it, so the next page starts right after it.
+        """
+        with self._lock:
+            self.resumeFrom = max(self.resumeFrom, index + 1)
+            for i in [i for i in self.inFlight if i < self.resumeFrom]:
+                del self.inFlight[i]
+
+    def caseAt(self, index):
+        with self._lock:
+            return self.inFlight.get(index)
+
+    def _shouldStop(self):
+        if self.stopReason is not None:
+            return True
+        if self.maxCases is not None and self.produced >= self.maxCases:
+            self._stop(f"reached {self.maxCases} cases")
+        elif self.timeBudget is not None and time.monotonic() - self.started >= self.timeBudget:
+            self._stop(f"time budget of {self.timeBudget}s spent")
+        elif self.plateau is not None and self.sinceNewCoverage >= self.plateau:
+            self._stop(f"no new coverage in {self.sinceNewCoverage} cases")
+        return self.stopReason is not None
+
+    def _stop(self, reason):
+        self.stopReason = reason
+        logging.info(f"Test queue finished after {self.produced} cases: {reason}")
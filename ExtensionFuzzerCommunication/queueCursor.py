@@ -0,0 +1,111 @@
+# ./ExtensionFuzzerCommunication/queueCursor.py
+import json
+import logging
+import os
+import threading
+import time
+
+class QueueCursor:
+    """
+    Record of which queued cases were handed to the harness and which it acknowledged with a streamed result.
+    With a path, every dispatched page is written to disk before the harness sees it and acknowledgements are
+    flushed at most every flushInterval seconds (default: every batch), so even a crash of the whole fuzzer
+    leaves the unacknowledged inputs behind. The highest case index a heartbeat announced is kept with them, as
+    that is the only case the harness had started; the others were waiting or buffered in its report batch.
+    """
+    def __init__(self, path=None, source=None, flushInterval=0.0):
+        self.path = path
+        self.source = source
+        self.flushInterval = flushInterval
+        self.acked = 0
+        self.unacked: dict[int, dict] = {}
+        self.done: set[int] = set()
+        self.heartbeat = None
+        self._lastFlush = 0.0
+        # Reentrant, as a signal handler closing the cursor can interrupt the main thread holding it
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def loadStale(path):
+        """
+        Contents of a cursor left behind by a run that never finished its queue, or None.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        return state if state.get("unacked") else None
+
+    def dispatched(self, cases):
+        with self._lock:
+            for case in cases:
+                index = case["index"]
+                if index >= self.acked and index not in self.done:
+                    self.unacked[index] = {k: v for k, v in case.items() if k != "index"}
+            self._flush(force=True)
+
+    def acknowledge(self, indices):
+        with self._lock:
+            for index in indices:
+                self.unacked.pop(index, None)
+                self.done.add(index)
+            # Advance the watermark over every contiguous finished index
+            while self.acked in self.done:
+                self.done.discard(self.acked)
+                self.acked += 1
+            self._flush()
+
+    def noteHeartbeat(self, index):
+        with self._lock:
+            if self.heartbeat is None or index > self.heartbeat:
+                self.heartbeat = index
+                self._flush()
+
+    def firstUnacknowledged(self):
+        with self._lock:
+            if not self.unacked:
+                return None, None
+            index = min(self.unacked)
+            return index, self.unacked[index]
+
+    def unacknowledgedCase(self, index):
+        """
+        Case index if it was dispatched and has no result yet, otherwise None.
+        """
+        with self._lock:
+            return self.unacked.get(index)
+
+    def isAcknowledged(self, index):
+        with self._lock:
+            return index < self.acked or index in self.done
+
+    def close(self):
+        """
+        The queue finished normally; nothing is left to resume.
+        """
+        with self._lock:
+            self.unacked.clear()
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _flush(self, force=False):
+        if not self.path:
+            return
+        now = time.monotonic()
+        if not force and now - self._lastFlush < self.flushInterval:
+            return
+        self._lastFlush = now
+        state = {
+            "source": self.source,
+            "acked": self.acked,
+            "heartbeat": self.heartbeat,
+            "unacked": {str(i): case for i, case in sorted(self.unacked.items())},
+        }
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(state, fh)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning(f"Could not persist queue cursor {self.path}: {e}")
@@ -0,0 +1,150 @@
+# ./FilterMutants/fingerprintIndex.py
+import csv
+import io
+import json
+import logging
+import os
+import threading
+from Logging.resultStore import ResultStore
+
+INDEX_FILE = "fingerprints.idx"
+OFFSETS_FILE = "fingerprints.offsets.json"
+RECORD_SIZE = 8
+
+class FingerprintIndex:
+    """
+    Persistent set of the inputs already tested in one input directory, for O(1) duplicate checks.
+    An input's fingerprint is the first 64 bits of ResultStore.fingerprint, so both agree on what the same input is.
+    Fingerprints are appended to fingerprints.idx (8 bytes each) and the result CSVs are absorbed incrementally: the
+    byte offset read up to is kept per CSV, so later syncs only parse rows appended since.
+    With bloomBits the fingerprints are held in a Bloom filter of that many bits instead of a set, which bounds memory
+    at the cost of occasionally taking an untested input for a tested one.
+    """
+    def __init__(self, indexDir, bloomBits=None, hashes=7):
+        self.indexDir = indexDir
+        self.path = os.path.join(indexDir, INDEX_FILE)
+        self.offsetsPath = os.path.join(indexDir, OFFSETS_FILE)
+        self.bloomBits = bloomBits
+        self.hashes = hashes
+        self.fingerprints: set[int] = set()
+        self.bloom = bytearray((bloomBits + 7) // 8) if bloomBits else None
+        self.count = 0
+        self.offsets: dict[str, int] = {}
+        self._fh = None
+        self._lock = threading.Lock()
+        os.makedirs(indexDir, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def key(func, args):
+        return int(ResultStore.fingerprint(func, args)[:16], 16)
+
+    def contains(self, func, args):
+        return self._contains(self.key(func, args))
+
+    def add(self, func, args):
+        """
+        Records an input as tested. Returns False if it was already known.
+        """
+        fp = self.key(func, args)
+        with self._lock:
+            if self._contains(fp):
+                return False
+            self._insert(fp)
+            if self._fh is None:
+                self._fh = open(self.path, "ab")
+            self._fh.write(fp.to_bytes(RECORD_SIZE, "little"))
+        return True
+
+    def absorbCsv(self, path, rowKey):
+        """
+        Adds every row appended to a result CSV since the last call. rowKey maps a CSV row to (func, args), or None
+        for rows to skip such as the header. Returns the number of new fingerprints.
+        """
+        if not path or not os.path.isfile(path):
+            return 0
+        name = os.path.relpath(os.path.abspath(path), os.path.abspath(self.indexDir))
+        offset = self.offsets.get(name, 0)
+        size = os.path.getsize(path)
+        if size < offset:
+            # The CSV was recreated; fingerprints already added stay valid
+            offset = 0
+        if size == offset:
+            return 0
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            data = fh.read(size - offset)
+        # Rows are appended whole, but a concurrent writer may be mid-row; leave an unterminated tail for next time
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return 0
+        added = 0
+        reader = csv.reader(io.StringIO(data[:end].decode("utf-8", errors="replace"), newline=""))
+        for row in reader:
+            if not row:
+                continue
+            key = rowKey(row)
+            if key is not None and self.add(*key):
+                added += 1
+        self.offsets[name] = offset + end
+        self.sync()
+        if added:
+            logging.debug(f"Indexed {added} new fingerprints from {path}")
+        return added
+
+    def sync(self):
+        """
+        Makes appended fingerprints and CSV offsets durable. The index file is reopened by the next add.
+        """
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            tmp = self.offsetsPath + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self.offsets, fh)
+            os.replace(tmp, self.offsetsPath)
+
+    def __len__(self):
+        return self.count
+
+    def _contains(self, fp):
+        if self.bloom is None:
+            return fp in self.fingerprints
+        return all(self.bloom[b >> 3] & (1 << (b & 7)) for b in self._bloomBits(fp))
+
+    def _insert(self, fp):
+        if self.bloom is None:
+            self.fingerprints.add(fp)
+        else:
+            for b in self._bloomBits(fp):
+                self.bloom[b >> 3] |= 1 << (b & 7)
+        self.count += 1
+
+    def _bloomBits(self, fp):
+        # Double hashing over the two halves of the fingerprint
+        h1, h2 = fp & 0xFFFFFFFF, (fp >> 32) | 1
+        return [(h1 + i * h2) % self.bloomBits for i in range(self.hashes)]
+
+    def _load(self):
+        if os.path.isfile(self.offsetsPath):
+            try:
+                with open(self.offsetsPath, "r", encoding="utf-8") as fh:
+                    self.offsets = json.load(fh)
+            except (OSError, ValueError):
+                logging.warning(f"Unreadable {self.offsetsPath}; result CSVs will be re-indexed")
+                self.offsets = {}
+        if not os.path.isfile(self.path):
+            # Offsets without the fingerprints they produced are worthless
+            self.offsets = {}
+            return
+        size = os.path.getsize(self.path)
+        if size % RECORD_SIZE:
+            # A torn last record from an interrupted append
+            with open(self.path, "r+b") as fh:
+                fh.truncate(size - size % RECORD_SIZE)
+        with open(self.path, "rb") as fh:
+            while chunk := fh.read(RECORD_SIZE * 8192):
+                for i in range(0, len(chunk), RECORD_SIZE):
+                    self._insert(int.from_bytes(chunk[i:i + RECORD_SIZE], "little"))
+        logging.debug(f"Loaded {self.count} fingerprints from {self.path}")
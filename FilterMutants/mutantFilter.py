@@ -1,13 +1,14 @@
 # ./FilterMutants/mutantFilter.py
+import json
 import logging
 import os
-import csv
+from FilterMutants.fingerprintIndex import FingerprintIndex
 
 class MutantFilter():
     """
     Takes in generated mutants for snippet or TypeScript files and makes sure no duplicates make it to be fuzzed.
     """
-    def __init__(self, inputDir=None, singularSnippetCrashes=None, multiSnippetCrashes=None, snippetClean=None, cleanCSV=None, errorCSV=None, crashCSV=None):
+    def __init__(self, inputDir=None, singularSnippetCrashes=None, multiSnippetCrashes=None, snippetClean=None, cleanCSV=None, errorCSV=None, crashCSV=None, resultStore=None, bloomBits=None):
         self.cleanDir = snippetClean
         self.inputDir = inputDir
         self.singularCrashesDir = singularSnippetCrashes
@@ -15,79 +16,103 @@ class MutantFilter():
         self.cleanCSV = cleanCSV
         self.errorCSV = errorCSV
         self.crashCSV = crashCSV
+        # With a ResultStore, each input is looked up by fingerprint instead of rescanning the CSVs
+        self.resultStore = resultStore
+        # Without one, tested inputs are kept in a persistent fingerprint index next to the CSVs
+        self.index = None
+        self.bloomBits = bloomBits
         logging.info("Mutant Filter Initialized")
 
     def filterSnippetMutants(self, potentialMuts):
         """
-        Read CSVs and filter duplicates.
+        Filter mutants already recorded in the snippet CSVs.
         """
-        csvFiles = [
+        if self.resultStore is not None:
+            anyCSV = os.path.join(self.singularCrashesDir, "crashes.csv")
+            filteredMutants = [
+                mutant for mutant in potentialMuts
+                if not self.resultStore.hasTested(anyCSV, str(mutant[0]), [mutant[1], mutant[2]])
+            ]
+            logging.debug(f"{len(filteredMutants)} leftover after filtration.")
+            return filteredMutants
+
+        index = self.snippetIndex()
+        filteredMutants = [
+            mutant for mutant in potentialMuts
+            if not index.contains(str(mutant[0]), [mutant[1], mutant[2]])
+        ]
+
+        logging.debug(f"{len(filteredMutants)} leftover after filtration.")
+        return filteredMutants
+
+    def snippetIndex(self):
+        """
+        Fingerprint index of the snippet crash and clean CSVs, caught up with rows appended since the last call.
+        """
+        if self.index is None:
+            self.index = FingerprintIndex(self.inputDir, bloomBits=self.bloomBits)
+        for filePath in (
             os.path.join(self.singularCrashesDir, "crashes.csv"),
             os.path.join(self.multiCrashesDir, "multiCrashes.csv"),
             os.path.join(self.cleanDir, "clean.csv")
-        ]
-        alreadyTested = set()
+        ):
+            self.index.absorbCsv(filePath, self.snippetRowKey)
+        return self.index
 
-        for filePath in csvFiles:
-            if os.path.exists(filePath):
-                logging.debug(f"Processing file for duplicate tests: {filePath}")
-                with open(filePath, mode='r', newline='', encoding='utf-8') as csvfile:
-                    reader = csv.reader(csvfile)
-                    next(reader, None)
-                    for row in reader:
-                        if len(row) < 3:
-                            continue
-                        alreadyTested.add((str(row[0]), row[1], row[2]))
-            else:
-                logging.debug(f"File not found (skipping): {filePath}")
+    @staticmethod
+    def snippetRowKey(row):
+        if len(row) < 3 or not row[0].strip().lstrip("-").isdigit():
+            return None
+        return str(row[0]), [row[1], row[2]]
 
-        filteredMutants = []
-        for mutant in potentialMuts:
-            line_no, originalLine, mutatedLine = mutant
-            mutantTuple = (str(line_no), originalLine, mutatedLine)
-            if mutantTuple not in alreadyTested:
-                filteredMutants.append(mutant)
-        
-        logging.debug(f"{len(filteredMutants)} leftover after filtration.")
-        return filteredMutants
-    
     def filterTypeScriptMutants(self, potentialInputs):
         """
-        Read CSVs and filter mutants.
+        Filter inputs already recorded in the clean, error and crash CSVs.
         """
-        tested = set()
+        potentialInputs = list(potentialInputs)
+        filtered = list(self.iterFilterTypeScriptMutants(potentialInputs))
 
-        if self.cleanCSV and os.path.exists(self.cleanCSV):
-            with open(self.cleanCSV, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if not row:
-                        continue
-                    tested.add(tuple(row))
-        
-        if self.errorCSV and os.path.exists(self.errorCSV):
-            with open(self.errorCSV, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if not row:
-                        continue
-                    tested.add(tuple(row))
+        logging.info(f"{len(filtered)} / {len(potentialInputs)} inputs remain after filtering")
+        return filtered
+
+    def typeScriptIndex(self):
+        """
+        Fingerprint index of the clean, error and crash CSVs, caught up with rows appended since the last call.
+        """
+        if self.index is None:
+            self.index = FingerprintIndex(self.inputDir, bloomBits=self.bloomBits)
+        for path in (self.cleanCSV, self.errorCSV, self.crashCSV):
+            self.index.absorbCsv(path, self.typeScriptRowKey)
+        return self.index
 
-        if self.crashCSV and os.path.exists(self.crashCSV):
-            with open(self.crashCSV, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if not row:
-                        continue
-                    tested.add(tuple(row))
+    @staticmethod
+    def typeScriptRowKey(row):
+        """
+        (funcName, args) of a TypeScript result row; the coverage and error columns are not part of the input.
+        """
+        if len(row) < 2:
+            return None
+        try:
+            args = json.loads(row[1])
+        except ValueError:
+            return None  # header
+        return row[0], args
 
-        filtered = []
+    def iterFilterTypeScriptMutants(self, potentialInputs):
+        """
+        Lazy version of filterTypeScriptMutants. The index catches up with the CSVs once, when the first input is pulled.
+        """
+        if self.resultStore is not None:
+            for funcName, argsList in potentialInputs:
+                if self.resultStore.hasTested(self.cleanCSV, funcName, argsList):
+                    logging.debug(f"Skipping already-tested input: {funcName}{argsList}")
+                else:
+                    yield (funcName, argsList)
+            return
+
+        index = self.typeScriptIndex()
         for funcName, argsList in potentialInputs:
-            key = tuple([funcName] + argsList)
-            if key in tested:
-                logging.debug(f"Skipping already-tested input: {key}")
+            if index.contains(funcName, argsList):
+                logging.debug(f"Skipping already-tested input: {funcName}{argsList}")
             else:
-                filtered.append((funcName, argsList))
-
-        logging.info(f"{len(filtered)} / {len(potentialInputs)} inputs remain after filtering")
-        return filtered
\ No newline at end of file
+                yield (funcName, argsList)
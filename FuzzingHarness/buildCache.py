@@ -0,0 +1,218 @@
+# ./FuzzingHarness/buildCache.py
+import os
+import shutil
+import json
+import hashlib
+import logging
+import time
+import threading
+from collections import Counter
+
+# Files at the extension root that change what the compiled fuzz copy looks like
+BUILD_INPUTS: tuple[str, ...] = (
+    "package.json",
+    "package-lock.json",
+    "yarn.lock",
+    "tsconfig.json",
+    "webpack.config.js",
+)
+
+# Directories that never feed into a build
+IGNORED_DIRS: set[str] = {".git", ".vscode-server", "node_modules", "__pycache__", "out", "dist", "vsix"}
+
+ENTRY_PREFIX = "ext-fuzz-"
+META_FILE = ".fuzz-cache.json"
+
+class BuildCache:
+    """
+    Content-addressed cache of prepared and compiled fuzz copies.
+    Entries are keyed by a hash of the extension sources, build configuration and harness template,
+    so a hit lets TsExtensionFuzzer skip copying, installing and compiling entirely.
+    lookup() and store() pin the entry they return until release(), and eviction never removes a pinned entry,
+    so a worker's VS Code keeps running from its copy while another worker stores a new one.
+    """
+    def __init__(self, cacheDir, maxBytes=2 * 1024 ** 3, maxAge=72 * 3600):
+        self.cacheDir = os.path.abspath(cacheDir)
+        self.maxBytes = maxBytes
+        self.maxAge = maxAge
+        self._pins = Counter()
+        self._lock = threading.Lock()
+        os.makedirs(self.cacheDir, exist_ok=True)
+        logging.info(f"Build cache initialized at {self.cacheDir}")
+
+    def computeKey(self, rootPath, harnessSource, *extra):
+        """
+        Hash every source file under src/, the root build inputs, the harness template and any extra
+        strings (target module, custom hooks) that end up baked into the compiled copy.
+        """
+        digest = hashlib.sha256()
+
+        def feed(path):
+            rel = os.path.relpath(path, rootPath).replace(os.sep, "/")
+            digest.update(rel.encode("utf-8") + b"\0")
+            with open(path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 16), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+
+        srcDir = os.path.join(rootPath, "src")
+        for dirPath, dirs, files in os.walk(srcDir):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+            for f in sorted(files):
+                feed(os.path.join(dirPath, f))
+
+        for name in BUILD_INPUTS:
+            path = os.path.join(rootPath, name)
+            if os.path.isfile(path):
+                feed(path)
+
+        with open(harnessSource, "rb") as fh:
+            digest.update(b"harness\0" + fh.read())
+
+        for value in extra:
+            digest.update(b"extra\0" + str(value).encode("utf-8"))
+
+        key = digest.hexdigest()[:24]
+        logging.debug(f"Build cache key: {key}")
+        return key
+
+    def entryPath(self, key):
+        # Keep the ext-fuzz- prefix so the harness still recognises the copy's scripts in coverage
+        return os.path.join(self.cacheDir, f"{ENTRY_PREFIX}{key}")
+
+    def lookup(self, key, baseName):
+        """
+        Returns the cached fuzz copy for key, or None on a miss.
+        """
+        entry = self.entryPath(key)
+        fuzzCopy = os.path.join(entry, baseName)
+        meta = self._readMeta(entry)
+        if meta is None or not os.path.isdir(fuzzCopy):
+            logging.info(f"Build cache miss for {key}")
+            return None
+
+        self._pin(key)
+        meta["lastUsed"] = time.time()
+        meta["hits"] = meta.get("hits", 0) + 1
+        self._writeMeta(entry, meta)
+        logging.info(f"Build cache hit for {key}; skipping copy, install and compile")
+        return fuzzCopy
+
+    def release(self, key):
+        """
+        The session using key's entry has closed; the entry may be evicted again.
+        """
+        with self._lock:
+            self._pins[key] -= 1
+            if self._pins[key] <= 0:
+                del self._pins[key]
+
+    def store(self, key, fuzzCopy):
+        """
+        Moves a freshly compiled fuzz copy into the cache and returns its new location, pinned like a lookup hit.
+        If another session stored the same key first, that entry wins and ours is discarded.
+        Only store builds that compiled; a failed build would otherwise be served for good.
+        """
+        entry = self.entryPath(key)
+        baseName = os.path.basename(fuzzCopy)
+        cached = os.path.join(entry, baseName)
+        self._pin(key)
+
+        if self._readMeta(entry) is not None and os.path.isdir(cached):
+            logging.debug(f"Build cache entry {key} already stored; discarding duplicate build")
+            shutil.rmtree(fuzzCopy, ignore_errors=True)
+            return cached
+
+        staging = f"{entry}.tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        shutil.move(fuzzCopy, os.path.join(staging, baseName))
+
+        now = time.time()
+        self._writeMeta(staging, {
+            "key": key,
+            "created": now,
+            "lastUsed": now,
+            "hits": 0,
+            "size": self._dirSize(staging),
+        })
+
+        if os.path.isdir(entry) and self._readMeta(entry) is None:
+            # Half-written entry left behind by an interrupted run
+            shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            # A parallel worker stored the same key between our check and now
+            logging.debug(f"Build cache entry {key} stored concurrently; discarding duplicate build")
+            shutil.rmtree(staging, ignore_errors=True)
+            return cached
+        logging.info(f"Stored compiled fuzz copy in build cache as {key}")
+
+        self.evict()
+        return cached
+
+    def evict(self):
+        """
+        Drops entries older than maxAge, then least recently used entries until the cache fits in maxBytes.
+        Pinned entries count towards the size but are never dropped, even if they alone exceed maxBytes.
+        """
+        now = time.time()
+        with self._lock:
+            pinned = {self.entryPath(key) for key in self._pins}
+        entries = []
+        total = 0
+        for name in os.listdir(self.cacheDir):
+            entry = os.path.join(self.cacheDir, name)
+            if not name.startswith(ENTRY_PREFIX) or not os.path.isdir(entry):
+                continue
+            meta = self._readMeta(entry)
+            if entry in pinned:
+                total += meta.get("size", 0) if meta else 0
+                continue
+            if meta is None:
+                # Leftover staging dir or half-written entry; recent ones may still be in progress
+                if now - os.path.getmtime(entry) > 3600:
+                    shutil.rmtree(entry, ignore_errors=True)
+                continue
+            if self.maxAge is not None and now - meta.get("lastUsed", 0) > self.maxAge:
+                logging.info(f"Evicting build cache entry {name} (expired)")
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            entries.append((meta.get("lastUsed", 0), meta.get("size", 0), entry))
+
+        if self.maxBytes is None:
+            return
+        entries.sort()
+        total += sum(size for _, size, _ in entries)
+        while entries and total > self.maxBytes:
+            _, size, entry = entries.pop(0)
+            logging.info(f"Evicting build cache entry {os.path.basename(entry)} (size limit)")
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def _pin(self, key):
+        with self._lock:
+            self._pins[key] += 1
+
+    def _readMeta(self, entry):
+        try:
+            with open(os.path.join(entry, META_FILE), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _writeMeta(self, entry, meta):
+        tmp = os.path.join(entry, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2)
+        os.replace(tmp, os.path.join(entry, META_FILE))
+
+    def _dirSize(self, path):
+        total = 0
+        for dirPath, _, files in os.walk(path):
+            for f in files:
+                fp = os.path.join(dirPath, f)
+                if not os.path.islink(fp):
+                    total += os.path.getsize(fp)
+        return total
@@ -0,0 +1,271 @@
+# ./FuzzingHarness/compileStrategy.py
+import os
+import shutil
+import json
+import logging
+import subprocess
+import threading
+import time
+
+# Build state kept inside a fuzz copy so relative paths stay valid wherever the copy lives
+BUILD_STATE_DIR = ".fuzz-build"
+
+_stateLock = threading.Lock()
+# Webpack builds of one extension share a build directory, so they run one at a time
+_buildLocks: dict[str, threading.Lock] = {}
+
+def _npm():
+    return "npm.cmd" if os.name == "nt" else "npm"
+
+def _npx():
+    return "npx.cmd" if os.name == "nt" else "npx"
+
+def _copyTree(src, dst):
+    """
+    Replaces dst with a copy of src. Used to move persistent build state in and out of fuzz copies.
+    """
+    tmp = f"{dst}.tmp-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.copytree(src, tmp, symlinks=True)
+    shutil.rmtree(dst, ignore_errors=True)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    os.rename(tmp, dst)
+
+def _syncTree(src, dst, skip=()):
+    """
+    Makes dst a mirror of src, copying only files whose size or modification time differ. Unchanged files keep
+    their timestamps, which is what incremental build caches compare. Top-level names in skip are left alone.
+    """
+    copied = 0
+    for dirPath, dirNames, fileNames in os.walk(src):
+        rel = os.path.relpath(dirPath, src)
+        if rel == ".":
+            dirNames[:] = [d for d in dirNames if d not in skip]
+            fileNames = [f for f in fileNames if f not in skip]
+        target = os.path.normpath(os.path.join(dst, rel))
+        os.makedirs(target, exist_ok=True)
+        wanted = set(dirNames) | set(fileNames)
+        for name in os.listdir(target):
+            if name not in wanted and not (rel == "." and name in skip):
+                gone = os.path.join(target, name)
+                if os.path.isdir(gone) and not os.path.islink(gone):
+                    shutil.rmtree(gone)
+                else:
+                    os.unlink(gone)
+        for name in list(dirNames) + fileNames:
+            source, copy = os.path.join(dirPath, name), os.path.join(target, name)
+            if os.path.islink(source):
+                # Symlinked directories (a shared node_modules) are mirrored as links, not walked
+                if name in dirNames:
+                    dirNames.remove(name)
+                if not os.path.islink(copy) or os.readlink(copy) != os.readlink(source):
+                    if os.path.isdir(copy) and not os.path.islink(copy):
+                        shutil.rmtree(copy)
+                    elif os.path.lexists(copy):
+                        os.unlink(copy)
+                    os.symlink(os.readlink(source), copy)
+                continue
+            if name in dirNames:
+                if os.path.lexists(copy) and not os.path.isdir(copy):
+                    os.unlink(copy)
+                continue
+            stat = os.stat(source)
+            try:
+                known = os.lstat(copy)
+                if known.st_size == stat.st_size and known.st_mtime_ns == stat.st_mtime_ns and not os.path.islink(copy):
+                    continue
+                if os.path.isdir(copy) and not os.path.islink(copy):
+                    shutil.rmtree(copy)
+            except FileNotFoundError:
+                pass
+            shutil.copy2(source, copy)
+            copied += 1
+    return copied
+
+class CompileStrategy:
+    """
+    How a fuzz copy gets compiled. Subclasses keep incremental build state per extension in stateDir,
+    restore it into the fuzz copy before compiling and save it back afterwards.
+    """
+    name = "none"
+
+    def __init__(self, stateDir=None, outDir="dist"):
+        self.stateDir = os.path.join(stateDir, self.name) if stateDir else None
+        self.outDir = outDir
+
+    def statePaths(self):
+        """
+        Paths (relative to the fuzz copy) carried between builds.
+        """
+        return []
+
+    def restore(self, extPath):
+        if not self.stateDir or not os.path.isdir(self.stateDir):
+            return
+        with _stateLock:
+            for rel in self.statePaths():
+                saved = os.path.join(self.stateDir, rel)
+                if os.path.isdir(saved):
+                    _copyTree(saved, os.path.join(extPath, rel))
+                elif os.path.isfile(saved):
+                    os.makedirs(os.path.dirname(os.path.join(extPath, rel)), exist_ok=True)
+                    shutil.copy2(saved, os.path.join(extPath, rel))
+        logging.debug(f"Restored {self.name} build state into {extPath}")
+
+    def save(self, extPath):
+        if not self.stateDir:
+            return
+        with _stateLock:
+            for rel in self.statePaths():
+                built = os.path.join(extPath, rel)
+                if os.path.isdir(built):
+                    _copyTree(built, os.path.join(self.stateDir, rel))
+                elif os.path.isfile(built):
+                    os.makedirs(os.path.dirname(os.path.join(self.stateDir, rel)), exist_ok=True)
+                    shutil.copy2(built, os.path.join(self.stateDir, rel))
+        logging.debug(f"Saved {self.name} build state from {extPath}")
+
+    def build(self, extPath):
+        logging.warning("No build script or tsconfig.json found; skipping compile.")
+
+    def compile(self, extPath):
+        self.restore(extPath)
+        try:
+            self.build(extPath)
+        finally:
+            self.save(extPath)
+
+class NpmScriptStrategy(CompileStrategy):
+    """
+    Runs the extension's own compile or build script with no incremental state.
+    """
+    name = "npm-script"
+
+    def __init__(self, script, stateDir=None, outDir="dist"):
+        super().__init__(stateDir, outDir)
+        self.script = script
+
+    def build(self, extPath):
+        logging.info(f"Running '{_npm()} run {self.script}' in {extPath}")
+        subprocess.run([_npm(), "run", self.script], cwd=extPath, check=True)
+
+class TscStrategy(CompileStrategy):
+    """
+    The extension's plain tsc compile script, run with --incremental. The .tsbuildinfo file and the emitted outDir
+    are carried between fuzz copies, so only files whose content changed (the harness and the patched entry file)
+    are re-emitted.
+    """
+    name = "tsc"
+
+    def __init__(self, project=".", stateDir=None, outDir="dist"):
+        super().__init__(stateDir, outDir)
+        self.project = project
+
+    def statePaths(self):
+        return [os.path.join(BUILD_STATE_DIR, "tsconfig.tsbuildinfo"), self.outDir]
+
+    def build(self, extPath):
+        buildInfo = os.path.join(BUILD_STATE_DIR, "tsconfig.tsbuildinfo")
+        logging.info(f"Running incremental tsc in {extPath}")
+        subprocess.run(
+            [_npx(), "tsc", "-p", self.project, "--incremental", "--tsBuildInfoFile", buildInfo, "--outDir", self.outDir],
+            cwd=extPath,
+            check=True
+        )
+
+class WebpackStrategy(CompileStrategy):
+    """
+    A compile script that is a single webpack call, built with webpack's persistent filesystem cache.
+    Cache entries embed absolute paths and file timestamps, so the build runs in a stable directory under stateDir
+    instead of the fuzz copy's random temp path: the copy is synced into it (only changed files are copied), built
+    there, and the bundle directory is copied back. With a warm cache only the harness and the patched entry module
+    are rebuilt. Falls back to the unmodified script if the webpack CLI rejects the cache flags.
+    """
+    name = "webpack"
+
+    def __init__(self, script, stateDir, outDir="dist", bundleDir="dist"):
+        super().__init__(stateDir, outDir)
+        self.script = script
+        self.bundleDir = bundleDir
+        self.buildDir = os.path.join(self.stateDir, "workspace")
+
+    def compile(self, extPath):
+        with _stateLock:
+            lock = _buildLocks.setdefault(self.buildDir, threading.Lock())
+        with lock:
+            start = time.perf_counter()
+            copied = _syncTree(extPath, self.buildDir, skip=(BUILD_STATE_DIR, ".git", self.bundleDir))
+            logging.info(f"Synced {copied} changed files into {self.buildDir} in {time.perf_counter() - start:.2f}s")
+            self.build(self.buildDir)
+            bundle = os.path.join(self.buildDir, self.bundleDir)
+            if os.path.isdir(bundle):
+                _copyTree(bundle, os.path.join(extPath, self.bundleDir))
+
+    def build(self, extPath):
+        cacheDir = os.path.join(extPath, BUILD_STATE_DIR, "webpack")
+        logging.info(f"Running '{_npm()} run {self.script}' with webpack filesystem cache in {extPath}")
+        try:
+            subprocess.run(
+                [_npm(), "run", self.script, "--", "--cache-type=filesystem", f"--cache-cache-directory={cacheDir}"],
+                cwd=extPath,
+                check=True
+            )
+        except subprocess.CalledProcessError:
+            logging.warning("Webpack build with cache flags failed; retrying without them.")
+            subprocess.run([_npm(), "run", self.script], cwd=extPath, check=True)
+
+def plainTscProject(command):
+    """
+    Project argument of a script that is nothing but a tsc call ("tsc", "tsc -p ./"), or None for anything else,
+    such as bundlers or "tsc && copy ...", whose output a bare tsc would not reproduce.
+    """
+    tokens = command.split()
+    if not tokens or tokens[0] != "tsc":
+        return None
+    if len(tokens) == 1:
+        return "."
+    if len(tokens) == 3 and tokens[1] in ("-p", "--project"):
+        return tokens[2]
+    return None
+
+def isPlainWebpack(command):
+    """
+    True for a script that is a single webpack call ("webpack", "webpack --mode development"), the only kind
+    the cache flags can be appended to.
+    """
+    tokens = command.split()
+    return bool(tokens) and tokens[0] == "webpack" and not any(t in ("&&", "||", ";", "|") for t in tokens)
+
+def detectCompileStrategy(extPath, stateDir=None, outDir="dist"):
+    """
+    Runs a compile/build script that is a plain tsc call incrementally, a single webpack call with a persistent
+    cache (given a stateDir), and any other script (esbuild, gulp, chained commands) unchanged. Without either
+    script a project with a tsconfig.json is compiled with incremental tsc, so the harness still gets JS.
+    """
+    pkg = {}
+    try:
+        with open(os.path.join(extPath, "package.json"), "r", encoding="utf-8") as fh:
+            pkg = json.load(fh)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not read package.json scripts ({e})")
+    scripts = pkg.get("scripts", {}) or {}
+
+    script = "compile" if "compile" in scripts else "build" if "build" in scripts else None
+    project = plainTscProject(scripts[script]) if script else None
+
+    if project is not None:
+        strategy = TscStrategy(project, stateDir, outDir)
+    elif script and stateDir and isPlainWebpack(scripts[script]):
+        # The bundle lands where package.json's main points
+        main = os.path.normpath(pkg.get("main") or os.path.join(outDir, "extension.js"))
+        bundleDir = main.split(os.sep)[0] if os.sep in main else outDir
+        strategy = WebpackStrategy(script, stateDir, outDir, bundleDir)
+    elif script:
+        strategy = NpmScriptStrategy(script, stateDir, outDir)
+    elif os.path.isfile(os.path.join(extPath, "tsconfig.json")):
+        strategy = TscStrategy(".", stateDir, outDir)
+    else:
+        strategy = CompileStrategy(stateDir, outDir)
+
+    logging.info(f"Using '{strategy.name}' compile strategy")
+    return strategy
@@ -0,0 +1,61 @@
+# ./FuzzingHarness/coverageAggregator.py
+import threading
+from Logging.coverageStore import CoverageStore
+
+COVERAGE_MODES = ("off", "function", "block")
+
+class CoverageAggregator:
+    """
+    Counts new-edge discovery over streamed case results, in the harness's coverage mode.
+    function: an edge is a (script, function) the case called.
+    block: an edge is a (script, start, end) block range the case ran, with its count bucketed like AFL does
+    (1, 2, 3, 4-7, 8-15, ...), so running a loop noticeably more often is also new behaviour.
+    off: cases carry no coverage and nothing is ever new.
+    Script URLs are made relative to the fuzz copy, so edges are comparable across sessions.
+    """
+    def __init__(self, mode="function"):
+        if mode not in COVERAGE_MODES:
+            raise ValueError(f"Unknown coverage mode: {mode}")
+        self.mode = mode
+        self.edges: set[tuple] = set()
+        self.cases = 0
+        self.casesWithNewEdges = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket(count):
+        return count if count < 4 else 1 << (count.bit_length() - 1)
+
+    def caseEdges(self, case):
+        edges = set()
+        if self.mode == "function":
+            for url, funcs in (case.get("coverage") or {}).items():
+                path = CoverageStore.normalizeUrl(url)
+                edges.update((path, func) for func in funcs)
+        elif self.mode == "block":
+            for url, ranges in (case.get("blocks") or {}).items():
+                path = CoverageStore.normalizeUrl(url)
+                edges.update((path, start, end, self.bucket(count)) for start, end, count in ranges if count > 0)
+        return edges
+
+    def observe(self, case):
+        """
+        Adds a case's edges and returns how many were not seen before.
+        """
+        edges = self.caseEdges(case)
+        with self._lock:
+            new = edges - self.edges
+            self.edges |= new
+            self.cases += 1
+            if new:
+                self.casesWithNewEdges += 1
+        return len(new)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "edges": len(self.edges),
+                "cases": self.cases,
+                "casesWithNewEdges": self.casesWithNewEdges,
+            }
@@ -0,0 +1,102 @@
+# ./FuzzingHarness/dependencyStore.py
+import os
+import shutil
+import json
+import hashlib
+import logging
+import subprocess
+import threading
+
+# Files npm needs to reproduce the extension's dependency tree
+LOCK_FILES: tuple[str, ...] = ("package-lock.json", "npm-shrinkwrap.json", "yarn.lock", ".npmrc")
+DEPENDENCY_KEYS: tuple[str, ...] = ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+
+class DependencyStore:
+    """
+    Keeps one installed node_modules tree per extension, keyed by a hash of its lockfile and declared dependencies,
+    and links it into every fuzz copy so sessions never run npm install from scratch.
+    """
+    def __init__(self, storeDir, linkMode="symlink"):
+        if linkMode not in ("symlink", "hardlink"):
+            raise ValueError(f"Unknown link mode: {linkMode}")
+        self.storeDir = os.path.abspath(storeDir)
+        self.linkMode = linkMode
+        self._lock = threading.Lock()
+        os.makedirs(self.storeDir, exist_ok=True)
+        logging.info(f"Dependency store initialized at {self.storeDir} ({linkMode})")
+
+    def computeKey(self, rootPath):
+        """
+        Hash the lockfiles and the dependency sections of package.json. Name, version and scripts are
+        patched in every fuzz copy, so they are left out on purpose.
+        """
+        digest = hashlib.sha256()
+        with open(os.path.join(rootPath, "package.json"), "r", encoding="utf-8") as fh:
+            pkg = json.load(fh)
+        deps = {k: pkg.get(k, {}) for k in DEPENDENCY_KEYS}
+        digest.update(json.dumps(deps, sort_keys=True).encode("utf-8"))
+
+        for name in LOCK_FILES:
+            path = os.path.join(rootPath, name)
+            if os.path.isfile(path):
+                with open(path, "rb") as fh:
+                    digest.update(name.encode("utf-8") + b"\0" + fh.read())
+
+        key = digest.hexdigest()[:24]
+        logging.debug(f"Dependency store key: {key}")
+        return key
+
+    def ensure(self, rootPath):
+        """
+        Returns the shared node_modules directory for rootPath, installing it once if it does not exist yet.
+        """
+        key = self.computeKey(rootPath)
+        entry = os.path.join(self.storeDir, key)
+        modules = os.path.join(entry, "node_modules")
+
+        with self._lock:
+            if os.path.isdir(modules):
+                logging.info(f"Reusing installed dependencies {key}")
+                return modules
+
+            staging = f"{entry}.tmp-{os.getpid()}"
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            for name in ("package.json",) + LOCK_FILES:
+                src = os.path.join(rootPath, name)
+                if os.path.isfile(src):
+                    shutil.copy2(src, os.path.join(staging, name))
+
+            npm_cmd = "npm.cmd" if os.name == "nt" else "npm"
+            logging.info(f"Installing dependencies {key} into shared store")
+            try:
+                subprocess.run([npm_cmd, "install", "--legacy-peer-deps"], cwd=staging, check=True)
+            except (subprocess.CalledProcessError, OSError):
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            # npm skips the directory entirely when there is nothing to install
+            os.makedirs(os.path.join(staging, "node_modules"), exist_ok=True)
+
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another process finished the same install first
+                shutil.rmtree(staging, ignore_errors=True)
+            return modules
+
+    def link(self, modules, fuzzCopy):
+        """
+        Makes modules available as fuzzCopy/node_modules.
+        """
+        target = os.path.join(fuzzCopy, "node_modules")
+        if os.path.lexists(target):
+            if os.path.islink(target) or os.path.isfile(target):
+                os.unlink(target)
+            else:
+                shutil.rmtree(target)
+
+        if self.linkMode == "symlink":
+            os.symlink(modules, target, target_is_directory=True)
+        else:
+            shutil.copytree(modules, target, symlinks=True, copy_function=os.link)
+        logging.debug(f"Linked shared dependencies into {target}")
@@ -1,5 +1,5 @@
 import * as vscode from 'vscode';
-const fetch: typeof globalThis.fetch = globalThis.fetch;
+import * as http from 'http';
 import * as inspector from 'inspector';
 
 PLACEHOLDER_IMPORT
@@ -7,14 +7,20 @@ PLACEHOLDER_IMPORT
 const dummyUrl = 'http://127.0.0.1:8080';
 const airflowCfg = vscode.workspace.getConfiguration('airflow');
 
+// off: no profiler at all, for raw executions per second
+// function: call counts per function (V8 skips block instrumentation)
+// block: per-block ranges with counts, sent with every case
+const COVERAGE_MODE = process.env.FUZZ_COVERAGE ?? 'function';
+
 const covSession = new inspector.Session();
+if (COVERAGE_MODE !== 'off') {
   covSession.connect();
   covSession.post('Profiler.enable');
   covSession.post('Profiler.startPreciseCoverage', {
     callCount: true,
-    detailed : true,
-  }
-);
+    detailed : COVERAGE_MODE === 'block',
+  });
+}
 
 for (const key of ['url', 'baseUrl']) {
   if (!airflowCfg.get(key)) {
@@ -37,8 +43,52 @@ for (const key of ['username', 'password']) {
 
 
 const HOST = '127.0.0.1';
-const PORT = 5000;
-const BASE = `http://${HOST}:${PORT}`;
+const PORT = Number(process.env.FUZZ_PORT ?? 5000);
+// Set when the communicator listens on a Unix domain socket instead of TCP
+const SOCKET = process.env.FUZZ_SOCKET || undefined;
+const BASE = SOCKET ? `unix:${SOCKET}` : `http://${HOST}:${PORT}`;
+// Which communicator session this harness belongs to when several share one server
+const SESSION = process.env.FUZZ_SESSION || undefined;
+
+// One kept-alive connection per concurrent request instead of a new TCP handshake per call
+const agent = new http.Agent({ keepAlive: true, maxSockets: 4 });
+
+interface HarnessResponse {
+  ok: boolean;
+  status: number;
+  data: any;
+}
+
+// onSent fires once the request is handed to the OS, which is all a caller about to block needs
+function callServer(method: string, path: string, body?: unknown, onSent?: () => void): Promise<HarnessResponse> {
+  return new Promise((resolve, reject) => {
+    const payload = body === undefined ? undefined : Buffer.from(JSON.stringify(body));
+    const headers: Record<string, string | number> = {};
+    if (SESSION) headers['X-Fuzz-Session'] = SESSION;
+    if (payload) {
+      headers['Content-Type'] = 'application/json';
+      headers['Content-Length'] = payload.length;
+    }
+    const target = SOCKET ? { socketPath: SOCKET } : { host: HOST, port: PORT };
+    const req = http.request({ ...target, path, method, headers, agent }, res => {
+      const chunks: Buffer[] = [];
+      res.on('data', c => chunks.push(c));
+      res.on('end', () => {
+        const text = Buffer.concat(chunks).toString('utf8');
+        let data: any = text;
+        if ((res.headers['content-type'] ?? '').includes('application/json')) {
+          try { data = JSON.parse(text); } catch { }
+        }
+        const status = res.statusCode ?? 0;
+        resolve({ ok: status >= 200 && status < 300, status, data });
+      });
+      res.on('error', reject);
+    });
+    req.on('error', reject);
+    if (payload) req.write(payload);
+    req.end(onSent);
+  });
+}
 
 console.log('Harness booted, BASE =', BASE);
 console.log('Airflow URL in settings =', airflowCfg.get('url') || airflowCfg.get('baseUrl'));
@@ -47,27 +97,80 @@ interface FuzzCase {
   funcName: string;
   args: any[];
   coverage: Record<string, string[]>;
+  // block mode: [startOffset, endOffset, count] of every range in functions that ran
+  blocks?: Record<string, [number, number, number][]>;
   error?: string;
 }
 
+interface CaseResult extends FuzzCase {
+  index: number;
+  outcome: 'clean' | 'error' | 'timeout';
+}
+
+// Async calls that never settle are cut off here; synchronous hangs are caught by the python watchdog
+const CASE_TIMEOUT_MS = Number(process.env.FUZZ_CASE_TIMEOUT_MS ?? 10000);
+const HEARTBEAT_MS = Number(process.env.FUZZ_HEARTBEAT_MS ?? 1000);
+let currentIndex = -1;
+
+class CaseTimeout extends Error {}
+
+function withTimeout<T>(p: Promise<T>, ms: number): Promise<T> {
+  let timer: ReturnType<typeof setTimeout> | undefined;
+  const expired = new Promise<T>((_, reject) => {
+    timer = setTimeout(() => reject(new CaseTimeout(`<timeout> case exceeded ${ms}ms`)), ms);
+  });
+  return Promise.race([p, expired]).then(
+    v => { clearTimeout(timer); return v; },
+    e => { clearTimeout(timer); throw e; },
+  );
+}
+
+// Resolves once the heartbeat is on the wire, without waiting for the response. Every case announces its index
+// this way before it runs, so the case a synchronous hang blocks is always the last index python heard of.
+function sendHeartbeat(index: number): Promise<void> {
+  return new Promise(resolve => {
+    callServer('POST', '/heartbeat', { index }, resolve).catch(() => resolve());
+  });
+}
+
+function startHeartbeat() {
+  const timer = setInterval(() => { sendHeartbeat(currentIndex); }, HEARTBEAT_MS);
+  timer.unref?.();
+}
+
+// Results are streamed to /report/cases in small batches as cases finish
+const REPORT_BATCH = Number(process.env.FUZZ_REPORT_BATCH ?? 8);
+const REPORT_FLUSH_MS = Number(process.env.FUZZ_REPORT_FLUSH_MS ?? 250);
+const REPORT_RETRIES = Number(process.env.FUZZ_REPORT_RETRIES ?? 5);
+// compact: URLs and function names are interned once per session and cases carry symbol IDs
+const WIRE_FORMAT = process.env.FUZZ_WIRE ?? 'json';
+const WIRE_SESSION = `${process.pid}-${Date.now()}`;
+// Cases are pulled from /tests a page at a time while python keeps generating them
+const PAGE_SIZE = Number(process.env.FUZZ_PAGE_SIZE ?? 64);
+
+interface FuzzPage {
+  cases: (FuzzCase & { index: number })[];
+  next: number;
+  done: boolean;
+}
+
 function diffCoverage(
   before: Map<string, number>,
   raw: any[]
 ): Record<string, string[]> {
   const newlyHit: Record<string, string[]> = {};
   for (const s of raw) {
-    if (!s.url.includes('/ext-fuzz-')) continue;
     for (const fn of s.functions) {
-      for (const r of fn.ranges) {
-        if (r.count === 0) continue;
-        const key = `${s.url}::${fn.functionName}`;
-        const prev = before.get(key) || 0;
-        if (r.count > prev) {
-          (newlyHit[s.url] ??= []).push(fn.functionName || '<anon>');
-        }
-        // update running tally
-        before.set(key, r.count);
+      // The outer range is the function's call count; block ranges inside it never run without it
+      const r = fn.ranges[0];
+      if (!r || r.count === 0) continue;
+      const key = `${s.url}::${fn.functionName}`;
+      const prev = before.get(key) || 0;
+      if (r.count > prev) {
+        (newlyHit[s.url] ??= []).push(fn.functionName || '<anon>');
       }
+      // update running tally
+      before.set(key, r.count);
     }
   }
   return newlyHit;
@@ -76,7 +179,7 @@ function diffCoverage(
 async function waitForServerReady(): Promise<void> {
   for (let i = 0; i < 10; i++) {
     try {
-      const r = await fetch(`${BASE}/ping`, { method: 'GET' });
+      const r = await callServer('GET', '/ping');
       if (r.ok) return;
     } catch { }
     await new Promise(r => setTimeout(r, 500));
@@ -84,19 +187,19 @@ async function waitForServerReady(): Promise<void> {
   throw new Error('HTTP server never became ready');
 }
 
-export async function fetchFuzzCases(): Promise<FuzzCase[]> {
+export async function fetchFuzzPage(after: number): Promise<FuzzPage | null> {
   try {
-    const res = await fetch(`${BASE}/tests`);
+    const res = await callServer('GET', `/tests?after=${after}&limit=${PAGE_SIZE}`);
     if (!res.ok) {
-      console.error('GET /tests ->', res.status, res.statusText);
-      return [];
+      console.error('GET /tests ->', res.status);
+      return null;
     }
-    const data = await res.json();
-    console.log('Fetched queue size', Array.isArray(data) ? data.length : 0);
-    return Array.isArray(data) ? data as FuzzCase[] : [];
+    const data = res.data as FuzzPage;
+    console.log('Fetched page of', data.cases?.length ?? 0, 'cases after', after);
+    return data;
   } catch (err) {
     console.error('Fetch to /tests failed:', err);
-    return [];
+    return null;
   }
 }
 
@@ -104,13 +207,172 @@ async function sendReport(
   clean: FuzzCase[], 
   errors: FuzzCase[], 
   crash: FuzzCase | null, 
-  coverage: Record<string, { total: number; hit: number }>
+  coverage: Record<string, { total: number; hit: number }>,
+  rawCoverage: ScriptCoverage[] = []
 ) {
-  await fetch(`${BASE}/report`, {
-    method : 'POST',
-    headers: { 'Content-Type': 'application/json' },
-    body   : JSON.stringify({ clean, errors, crash, coverage }),
-  });
+  await callServer('POST', '/report', { clean, errors, crash, coverage, rawCoverage });
+}
+
+interface CoverageTableDelta {
+  session: string;
+  urlBase: number;
+  urls: string[];
+  symBase: number;
+  symbols: [number, string][];
+}
+
+class CoverageInterner {
+  private urlIds = new Map<string, number>();
+  private symIds = new Map<string, number>();
+  private newUrls: string[] = [];
+  private newSymbols: [number, string][] = [];
+  private urlBase = 0;
+  private symBase = 0;
+
+  internCoverage(coverage: Record<string, string[]>): number[] {
+    const ids: number[] = [];
+    for (const [url, funcs] of Object.entries(coverage)) {
+      let urlId = this.urlIds.get(url);
+      if (urlId === undefined) {
+        urlId = this.urlIds.size;
+        this.urlIds.set(url, urlId);
+        this.newUrls.push(url);
+      }
+      for (const fn of funcs) {
+        const key = `${urlId}\0${fn}`;
+        let symId = this.symIds.get(key);
+        if (symId === undefined) {
+          symId = this.symIds.size;
+          this.symIds.set(key, symId);
+          this.newSymbols.push([urlId, fn]);
+        }
+        ids.push(symId);
+      }
+    }
+    return ids;
+  }
+
+  // Dense cases are cheaper as a bitmap over every symbol interned so far
+  packIds(ids: number[]): { cov: number[] } | { bits: string } {
+    const bytes = Math.ceil(this.symIds.size / 8);
+    if (bytes * 4 / 3 >= ids.length * 3) return { cov: ids };
+    const bitmap = new Uint8Array(bytes);
+    for (const id of ids) bitmap[id >> 3] |= 1 << (id & 7);
+    return { bits: Buffer.from(bitmap).toString('base64') };
+  }
+
+  // Entries the server has not seen yet; only forgotten once commitTables() confirms delivery
+  pendingTables(): CoverageTableDelta {
+    return {
+      session: WIRE_SESSION,
+      urlBase: this.urlBase,
+      urls: this.newUrls,
+      symBase: this.symBase,
+      symbols: this.newSymbols,
+    };
+  }
+
+  // Block ranges keyed by URL ID instead of the full URL
+  internBlocks(blocks: Record<string, [number, number, number][]>): Record<number, [number, number, number][]> {
+    const out: Record<number, [number, number, number][]> = {};
+    for (const [url, ranges] of Object.entries(blocks)) {
+      let urlId = this.urlIds.get(url);
+      if (urlId === undefined) {
+        urlId = this.urlIds.size;
+        this.urlIds.set(url, urlId);
+        this.newUrls.push(url);
+      }
+      out[urlId] = ranges;
+    }
+    return out;
+  }
+
+  commitTables() {
+    this.urlBase += this.newUrls.length;
+    this.symBase += this.newSymbols.length;
+    this.newUrls = [];
+    this.newSymbols = [];
+  }
+}
+
+const interner = new CoverageInterner();
+
+class CaseReporter {
+  private pending: CaseResult[] = [];
+  private lastFlush = Date.now();
+  // Sends go out one after another, so batches arrive in order and share one view of the intern tables
+  private sending: Promise<boolean> = Promise.resolve(true);
+  // Results also go out while a case is still awaiting, so python sees every finished case before a hang
+  private timer = setInterval(() => {
+    if (this.resultsDue()) this.flushResults();
+  }, REPORT_FLUSH_MS);
+  public sent = 0;
+
+  constructor() {
+    this.timer.unref?.();
+  }
+
+  async addResult(result: CaseResult) {
+    this.pending.push(result);
+    if (this.pending.length >= REPORT_BATCH || this.resultsDue()) {
+      await this.flushResults();
+    }
+  }
+
+  resultsDue(): boolean {
+    return this.pending.length > 0 && Date.now() - this.lastFlush >= REPORT_FLUSH_MS;
+  }
+
+  // Resolves to false if results are still pending because the POST failed
+  flushResults(): Promise<boolean> {
+    this.lastFlush = Date.now();
+    this.sending = this.sending.then(() => this.sendResults());
+    return this.sending;
+  }
+
+  // Retries a failed send a few times, for the end of a queue where no later flush would pick it up
+  async drainResults(): Promise<boolean> {
+    for (let attempt = 0; attempt < REPORT_RETRIES; attempt++) {
+      if (await this.flushResults()) return true;
+      await new Promise(r => setTimeout(r, REPORT_FLUSH_MS));
+    }
+    console.error('Giving up on', this.pending.length, 'unreported case results');
+    return false;
+  }
+
+  stopReporter() {
+    clearInterval(this.timer);
+  }
+
+  // A batch that was not accepted goes back to the front of pending: python only acknowledges cases it
+  // received, so a dropped batch would later be blamed as crashes
+  private async sendResults(): Promise<boolean> {
+    if (this.pending.length === 0) return true;
+    const cases = this.pending;
+    this.pending = [];
+    try {
+      let res;
+      if (WIRE_FORMAT === 'compact') {
+        // Re-interning a returned batch reuses its IDs, and uncommitted table entries are sent again
+        const encoded = cases.map(({ coverage, blocks, ...rest }) => ({
+          ...rest,
+          ...interner.packIds(interner.internCoverage(coverage)),
+          ...(blocks ? { blk: interner.internBlocks(blocks) } : {}),
+        }));
+        res = await callServer('POST', '/report/cases', { cases: encoded, tables: interner.pendingTables() });
+        if (res.ok) interner.commitTables();
+      } else {
+        res = await callServer('POST', '/report/cases', { cases });
+      }
+      if (!res.ok) throw new Error(`status ${res.status}`);
+      this.sent += cases.length;
+      return true;
+    } catch (err) {
+      console.error('POST /report/cases failed:', err);
+      this.pending = cases.concat(this.pending);
+      return false;
+    }
+  }
 }
 
 const resolveFn = (name: string): Function | undefined => {
@@ -146,78 +408,271 @@ const resolveFn = (name: string): Function | undefined => {
   return undefined;                                   // still not found
 };
 
-async function runFuzzerHarness() {
-  await waitForServerReady();
-  const cases = await fetchFuzzCases();
+interface FuzzBatch {
+  id: number;
+  module?: string;
+  pending?: boolean;
+  done?: boolean;
+}
 
-  const clean:  FuzzCase[] = [];
-  let   crash:  FuzzCase | null = null;
-  const errors: FuzzCase[] = [];
+// Sidecar mode: the module to target arrives with every batch instead of being baked in
+async function fetchBatch(after: number): Promise<FuzzBatch | null> {
+  try {
+    const res = await callServer('GET', `/batch?after=${after}`);
+    if (!res.ok) {
+      console.error('GET /batch ->', res.status);
+      return null;
+    }
+    return res.data as FuzzBatch;
+  } catch (err) {
+    console.error('Fetch to /batch failed:', err);
+    return null;
+  }
+}
 
-  console.log('Available exports:', Object.keys(targetModule));
-  const hitCounts = new Map<string, number>();
+// Script IDs never change URL, so each script is checked for being part of the fuzz copy only once
+const fuzzScripts = new Map<string, boolean>();
 
-  for (const { funcName, args } of cases) {
-  /* snapshot BEFORE the call */
-  const before = new Map(hitCounts);
+function fuzzScriptsOf(raw: any[]): any[] {
+  return raw.filter(s => {
+    let keep = fuzzScripts.get(s.scriptId);
+    if (keep === undefined) fuzzScripts.set(s.scriptId, keep = s.url.includes('/ext-fuzz-'));
+    return keep;
+  });
+}
 
-  try {
-    const fn = resolveFn(funcName);
-    if (typeof fn !== 'function')
-      throw new Error(`No such function: ${funcName}`);
-
-    const out = fn(...args);
-    if (out instanceof Promise) await out;
-
-    /* snapshot AFTER and compute delta */
-    const raw = await new Promise<any[]>((res, rej) =>
-      covSession.post('Profiler.takePreciseCoverage',
-        (e, r) => (e ? rej(e) : res(r.result)))
-    );
-    const covDelta = diffCoverage(before, raw);
-
-    clean.push({ funcName, args, coverage: covDelta });
-
-  } catch (e) {
-    const raw = await new Promise<any[]>((res, rej) =>
-      covSession.post('Profiler.takePreciseCoverage',
-        (er, r) => (er ? rej(er) : res(r.result)))
-    );
-    const covDelta = diffCoverage(before, raw);
-
-    errors.push({
-      funcName,
-      args,
-      coverage: covDelta,
-      error: e instanceof Error ? e.stack ?? e.message : String(e),
+function takeCoverage(): Promise<any[]> {
+  if (COVERAGE_MODE === 'off') return Promise.resolve([]);
+  return new Promise((resolve, reject) => {
+    covSession.post('Profiler.takePreciseCoverage', (err, res) => {
+      if (err) reject(err);
+      else     resolve(fuzzScriptsOf(res.result));
     });
-  }
+  });
 }
 
-  function takeCoverage(): Promise<any[]> {
-    return new Promise((resolve, reject) => {
-      covSession.post('Profiler.takePreciseCoverage', (err, res) => {
-        if (err) reject(err);
-        else     resolve(res.result);
-      });
-    });
+function blockCoverage(raw: any[]): Record<string, [number, number, number][]> {
+  const blocks: Record<string, [number, number, number][]> = {};
+  for (const s of raw) {
+    for (const fn of s.functions) {
+      // Functions that did not run this case have nothing but a zero-count outer range
+      if (!fn.ranges.length || fn.ranges[0].count === 0) continue;
+      const out = (blocks[s.url] ??= []);
+      for (const r of fn.ranges) out.push([r.startOffset, r.endOffset, r.count]);
+    }
   }
-  
-  const rawCov = await takeCoverage();
-  covSession.post('Profiler.stopPreciseCoverage');
-  covSession.disconnect();
-  
+  return blocks;
+}
+
+function summarizeCoverage(rawCov: any[]): Record<string, { total: number; hit: number }> {
   const summary: Record<string, { total: number; hit: number }> = {};
   for (const s of rawCov) {
-    if (!s.url.includes('/ext-fuzz-')) continue;
     let hit = 0;
     for (const fn of s.functions) {
       if (fn.ranges.some((r: { count: number }) => r.count > 0)) hit += 1;
     }
     summary[s.url] = { total: s.functions.length, hit };
   }
-  
-  await sendReport(clean, errors, crash, summary);
+  return summary;
+}
+
+const hitCounts = new Map<string, number>();
+
+interface CoverageRange { startOffset: number; endOffset: number; count: number }
+interface ScriptCoverage {
+  url: string;
+  functions: { functionName: string; ranges: CoverageRange[] }[];
+  hits: [number, number][];
+}
+
+// takePreciseCoverage resets V8's counters, so every take is folded in here and python gets the whole
+// session with the final report. Function call counts add up across takes; block counts do not (a block is
+// only reported when its count differs from the function's), so blocks are kept as executed offset intervals.
+const cumulative = new Map<string, { functions: Map<string, { functionName: string; range: CoverageRange }>; hits: [number, number][] }>();
+
+function hitIntervals(ranges: CoverageRange[]): [number, number][] {
+  const ordered = ranges.slice().sort((a, b) => a.startOffset - b.startOffset || b.endOffset - a.endOffset);
+  const hits: [number, number][] = [];
+  const stack: CoverageRange[] = [];
+  let pos = 0;
+  // The innermost range around [pos, end) decides whether it ran
+  const emitInterval = (end: number) => {
+    const top = stack[stack.length - 1];
+    if (end > pos && top && top.count > 0) {
+      const last = hits[hits.length - 1];
+      if (last && last[1] === pos) last[1] = end;
+      else hits.push([pos, end]);
+    }
+    pos = Math.max(pos, end);
+  };
+  const closeRange = () => {
+    emitInterval(stack[stack.length - 1].endOffset);
+    stack.pop();
+  };
+  for (const r of ordered) {
+    while (stack.length && stack[stack.length - 1].endOffset <= r.startOffset) closeRange();
+    emitInterval(r.startOffset);
+    stack.push(r);
+  }
+  while (stack.length) closeRange();
+  return hits;
+}
+
+function unionIntervals(a: [number, number][], b: [number, number][]): [number, number][] {
+  const all = a.concat(b).sort((x, y) => x[0] - y[0]);
+  const out: [number, number][] = [];
+  for (const [s, e] of all) {
+    const last = out[out.length - 1];
+    if (last && s <= last[1]) last[1] = Math.max(last[1], e);
+    else out.push([s, e]);
+  }
+  return out;
+}
+
+function accumulateCoverage(raw: any[]) {
+  for (const s of raw) {
+    let entry = cumulative.get(s.url);
+    if (!entry) cumulative.set(s.url, entry = { functions: new Map(), hits: [] });
+    const ranges: CoverageRange[] = [];
+    for (const fn of s.functions) {
+      const [outer] = fn.ranges;
+      if (!outer) continue;
+      ranges.push(...fn.ranges);
+      const key = `${outer.startOffset}:${outer.endOffset}`;
+      const prev = entry.functions.get(key);
+      if (prev) prev.range.count += outer.count;
+      else entry.functions.set(key, { functionName: fn.functionName, range: { ...outer } });
+    }
+    const hits = hitIntervals(ranges);
+    if (hits.length) entry.hits = unionIntervals(entry.hits, hits);
+  }
+}
+
+function cumulativeCoverage(): ScriptCoverage[] {
+  return [...cumulative].map(([url, { functions, hits }]) => ({
+    url,
+    functions: [...functions.values()].map(({ functionName, range }) => ({ functionName, ranges: [range] })),
+    hits,
+  }));
+}
+
+async function runCases() {
+  const reporter = new CaseReporter();
+
+  console.log('Available exports:', Object.keys(targetModule));
+
+  let after = 0;
+  for (;;) {
+    const page = await fetchFuzzPage(after);
+    if (!page || page.done || page.cases.length === 0) break;
+
+    for (const { index, funcName, args } of page.cases) {
+      // Results still buffered from fast cases go out before a case that may never return
+      if (reporter.resultsDue()) await reporter.flushResults();
+      currentIndex = index;
+      await sendHeartbeat(index);
+      /* snapshot BEFORE the call */
+      const before = new Map(hitCounts);
+
+      try {
+        const fn = resolveFn(funcName);
+        if (typeof fn !== 'function')
+          throw new Error(`No such function: ${funcName}`);
+
+        const out = fn(...args);
+        if (out instanceof Promise) await withTimeout(out, CASE_TIMEOUT_MS);
+
+        /* snapshot AFTER and compute delta */
+        const raw = await takeCoverage();
+        accumulateCoverage(raw);
+        const covDelta = diffCoverage(before, raw);
+        const blocks = COVERAGE_MODE === 'block' ? blockCoverage(raw) : undefined;
+
+        await reporter.addResult({ index, outcome: 'clean', funcName, args, coverage: covDelta, blocks });
+
+      } catch (e) {
+        const raw = await takeCoverage();
+        accumulateCoverage(raw);
+        const covDelta = diffCoverage(before, raw);
+
+        await reporter.addResult({
+          index,
+          outcome: e instanceof CaseTimeout ? 'timeout' : 'error',
+          funcName,
+          args,
+          coverage: covDelta,
+          blocks: COVERAGE_MODE === 'block' ? blockCoverage(raw) : undefined,
+          error: e instanceof Error ? e.stack ?? e.message : String(e),
+        });
+      }
+    }
+
+    // Everything before the next cursor must be reported before python is told it ran
+    await reporter.flushResults();
+    after = page.next;
+  }
+
+  currentIndex = -1;
+  await reporter.drainResults();
+  reporter.stopReporter();
+  return { streamed: reporter.sent };
+}
+
+async function runFuzzerHarness() {
+  await waitForServerReady();
+  startHeartbeat();
+
+  await runCases();
+
+  const rawCov = await takeCoverage();
+  accumulateCoverage(rawCov);
+  if (COVERAGE_MODE !== 'off') {
+    covSession.post('Profiler.stopPreciseCoverage');
+    covSession.disconnect();
+  }
+
+  // Clean and error cases were already streamed; the final report only closes the queue
+  await sendReport([], [], null, summarizeCoverage(rawCov), cumulativeCoverage());
+}
+
+async function runSidecarHarness() {
+  await waitForServerReady();
+  startHeartbeat();
+  let after = 0;
+
+  for (;;) {
+    const batch = await fetchBatch(after);
+    if (batch?.done) break;
+    if (!batch || batch.pending || !batch.module) {
+      await new Promise(r => setTimeout(r, 250));
+      continue;
+    }
+    after = batch.id;
+    cumulative.clear();
+
+    let crash: FuzzCase | null = null;
+    try {
+      selectTarget(batch.module);
+      await runCases();
+    } catch (e) {
+      crash = {
+        funcName: `<load:${batch.module}>`,
+        args: [],
+        coverage: {},
+        error: e instanceof Error ? e.stack ?? e.message : String(e),
+      };
+    }
+
+    const rawCov = await takeCoverage();
+    accumulateCoverage(rawCov);
+    await sendReport([], [], crash, summarizeCoverage(rawCov), cumulativeCoverage());
+  }
+
+  if (COVERAGE_MODE !== 'off') {
+    covSession.post('Profiler.stopPreciseCoverage');
+    covSession.disconnect();
+  }
 }
 
-runFuzzerHarness();
+if (HARNESS_MODE === 'sidecar') runSidecarHarness();
+else runFuzzerHarness();
@@ -0,0 +1,33 @@
+// ./FuzzingHarness/nodeBackend/runHarness.js
+// Runs a compiled fuzz copy under plain node: `node runHarness.js <fuzzCopy>`.
+// `vscode` is redirected to the stub next to this file, then the extension's main is loaded,
+// which imports the harness and starts fuzzing exactly as it would inside VS Code.
+'use strict';
+
+const Module = require('module');
+const path = require('path');
+const fs = require('fs');
+
+const stubPath = path.join(__dirname, 'vscode.js');
+const originalResolve = Module._resolveFilename;
+Module._resolveFilename = function (request, ...rest) {
+  if (request === 'vscode') return stubPath;
+  return originalResolve.call(this, request, ...rest);
+};
+
+const fuzzCopy = path.resolve(process.argv[2] || '.');
+const pkg = JSON.parse(fs.readFileSync(path.join(fuzzCopy, 'package.json'), 'utf8'));
+const main = path.resolve(fuzzCopy, pkg.main || './dist/extension.js');
+
+process.on('unhandledRejection', (reason) => {
+  console.error('[node-backend] unhandled rejection:', reason);
+});
+
+const extension = require(main);
+if (typeof extension.activate === 'function') {
+  // VS Code would activate the extension too (activationEvents is forced to "*")
+  const vscode = require('vscode');
+  Promise.resolve()
+    .then(() => extension.activate(vscode.__createExtensionContext(fuzzCopy)))
+    .catch((err) => console.error('[node-backend] activate failed:', err));
+}
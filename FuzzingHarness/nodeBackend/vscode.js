@@ -0,0 +1,232 @@
+// ./FuzzingHarness/nodeBackend/vscode.js
+// Minimal stand-in for the `vscode` module so the compiled harness can run under plain node.
+// Covers what the harness and the fuzzed extensions touch; anything else resolves to a no-op.
+'use strict';
+
+const path = require('path');
+
+const missing = new Set();
+function noop() { return undefined; }
+
+// Callable placeholder for APIs the stub does not model
+function placeholder(name) {
+  if (!missing.has(name)) {
+    missing.add(name);
+    console.error(`[vscode-stub] unmodelled API: ${name}`);
+  }
+  return new Proxy(function () {}, {
+    get: (_t, prop) => (prop === 'then' || typeof prop === 'symbol') ? undefined : placeholder(`${name}.${String(prop)}`),
+    apply: () => undefined,
+    construct: () => ({}),
+  });
+}
+
+function withFallback(name, obj) {
+  return new Proxy(obj, {
+    get: (target, prop) => {
+      if (prop in target || prop === 'then' || typeof prop === 'symbol') return target[prop];
+      return placeholder(`${name}.${String(prop)}`);
+    },
+  });
+}
+
+class Disposable {
+  constructor(callOnDispose) { this._dispose = callOnDispose || noop; }
+  static from(...items) { return new Disposable(() => items.forEach(i => i && i.dispose && i.dispose())); }
+  dispose() { const d = this._dispose; this._dispose = noop; d(); }
+}
+
+class EventEmitter {
+  constructor() {
+    this._listeners = [];
+    this.event = (listener, thisArg) => {
+      const entry = thisArg ? listener.bind(thisArg) : listener;
+      this._listeners.push(entry);
+      return new Disposable(() => { this._listeners = this._listeners.filter(l => l !== entry); });
+    };
+  }
+  fire(data) { for (const l of [...this._listeners]) l(data); }
+  dispose() { this._listeners = []; }
+}
+
+const noEvent = () => new Disposable();
+
+class Uri {
+  constructor(scheme, authority, p, query, fragment) {
+    this.scheme = scheme; this.authority = authority || ''; this.path = p || '';
+    this.query = query || ''; this.fragment = fragment || '';
+  }
+  get fsPath() { return this.path; }
+  static file(p) { return new Uri('file', '', path.resolve(p)); }
+  static parse(value) {
+    try {
+      const u = new URL(value);
+      return new Uri(u.protocol.replace(/:$/, ''), u.host, decodeURIComponent(u.pathname), u.search.replace(/^\?/, ''), u.hash.replace(/^#/, ''));
+    } catch {
+      return new Uri('file', '', value);
+    }
+  }
+  static joinPath(base, ...segments) { return new Uri(base.scheme, base.authority, path.posix.join(base.path, ...segments)); }
+  with(change) {
+    return new Uri(change.scheme ?? this.scheme, change.authority ?? this.authority, change.path ?? this.path,
+                   change.query ?? this.query, change.fragment ?? this.fragment);
+  }
+  toString() { return `${this.scheme}://${this.authority}${this.path}`; }
+  toJSON() { return this.toString(); }
+}
+
+class Memento {
+  constructor() { this._data = new Map(); }
+  get(key, defaultValue) { return this._data.has(key) ? this._data.get(key) : defaultValue; }
+  update(key, value) { this._data.set(key, value); return Promise.resolve(); }
+  keys() { return [...this._data.keys()]; }
+  setKeysForSync() {}
+}
+
+// workspace.getConfiguration: one in-memory store shared by every section
+const settings = new Map();
+function getConfiguration(section) {
+  const prefix = section ? `${section}.` : '';
+  return withFallback('WorkspaceConfiguration', {
+    get: (key, defaultValue) => settings.has(prefix + key) ? settings.get(prefix + key) : defaultValue,
+    has: (key) => settings.has(prefix + key),
+    inspect: (key) => ({ key: prefix + key, globalValue: settings.get(prefix + key) }),
+    update: (key, value) => { settings.set(prefix + key, value); return Promise.resolve(); },
+  });
+}
+
+function outputChannel(name) {
+  return withFallback('OutputChannel', {
+    name,
+    append: (text) => process.stdout.write(`[${name}] ${text}`),
+    appendLine: (text) => console.log(`[${name}] ${text}`),
+    replace: noop, clear: noop, show: noop, hide: noop, dispose: noop,
+  });
+}
+
+function webviewPanel(viewType, title) {
+  const webview = withFallback('Webview', {
+    html: '',
+    options: {},
+    cspSource: 'vscode-stub:',
+    onDidReceiveMessage: noEvent,
+    postMessage: () => Promise.resolve(true),
+    asWebviewUri: (uri) => uri,
+  });
+  return withFallback('WebviewPanel', {
+    viewType, title, webview, visible: true, active: true,
+    onDidDispose: noEvent, onDidChangeViewState: noEvent,
+    reveal: noop, dispose: noop,
+  });
+}
+
+class TreeItem {
+  constructor(labelOrUri, collapsibleState) {
+    if (typeof labelOrUri === 'string') this.label = labelOrUri;
+    else this.resourceUri = labelOrUri;
+    this.collapsibleState = collapsibleState ?? 0;
+  }
+}
+
+class ThemeIcon { constructor(id, color) { this.id = id; this.color = color; } }
+ThemeIcon.File = new ThemeIcon('file');
+ThemeIcon.Folder = new ThemeIcon('folder');
+class ThemeColor { constructor(id) { this.id = id; } }
+class MarkdownString {
+  constructor(value = '') { this.value = value; }
+  appendText(v) { this.value += v; return this; }
+  appendMarkdown(v) { this.value += v; return this; }
+  appendCodeblock(v) { this.value += v; return this; }
+}
+class Position { constructor(line, character) { this.line = line; this.character = character; } }
+class Range { constructor(start, end) { this.start = start; this.end = end; } }
+class Selection extends Range { constructor(anchor, active) { super(anchor, active); this.anchor = anchor; this.active = active; } }
+class CancellationTokenSource {
+  constructor() { this.token = { isCancellationRequested: false, onCancellationRequested: noEvent }; }
+  cancel() { this.token.isCancellationRequested = true; }
+  dispose() {}
+}
+
+const commandRegistry = new Map();
+
+const vscode = {
+  version: '1.99.0-stub',
+  Disposable, EventEmitter, Uri, TreeItem, ThemeIcon, ThemeColor, MarkdownString,
+  Position, Range, Selection, CancellationTokenSource,
+  TreeItemCollapsibleState: { None: 0, Collapsed: 1, Expanded: 2 },
+  ViewColumn: { Active: -1, Beside: -2, One: 1, Two: 2, Three: 3 },
+  ProgressLocation: { SourceControl: 1, Window: 10, Notification: 15 },
+  StatusBarAlignment: { Left: 1, Right: 2 },
+  ConfigurationTarget: { Global: 1, Workspace: 2, WorkspaceFolder: 3 },
+  ExtensionMode: { Production: 1, Development: 2, Test: 3 },
+
+  commands: withFallback('commands', {
+    registerCommand: (id, cb) => { commandRegistry.set(id, cb); return new Disposable(() => commandRegistry.delete(id)); },
+    executeCommand: async (id, ...args) => { const cb = commandRegistry.get(id); return cb ? cb(...args) : undefined; },
+    getCommands: async () => [...commandRegistry.keys()],
+  }),
+
+  window: withFallback('window', {
+    showInformationMessage: () => Promise.resolve(undefined),
+    showWarningMessage: () => Promise.resolve(undefined),
+    showErrorMessage: () => Promise.resolve(undefined),
+    showInputBox: () => Promise.resolve(undefined),
+    showQuickPick: () => Promise.resolve(undefined),
+    showOpenDialog: () => Promise.resolve(undefined),
+    showSaveDialog: () => Promise.resolve(undefined),
+    showTextDocument: () => Promise.resolve(undefined),
+    createOutputChannel: (name) => outputChannel(name),
+    createTreeView: (id) => withFallback('TreeView', {
+      id, visible: true, message: undefined, title: undefined, description: undefined,
+      onDidChangeVisibility: noEvent, onDidChangeSelection: noEvent, onDidExpandElement: noEvent, onDidCollapseElement: noEvent,
+      reveal: () => Promise.resolve(), dispose: noop,
+    }),
+    registerTreeDataProvider: () => new Disposable(),
+    registerWebviewViewProvider: () => new Disposable(),
+    createWebviewPanel: (viewType, title) => webviewPanel(viewType, title),
+    createStatusBarItem: () => withFallback('StatusBarItem', { text: '', show: noop, hide: noop, dispose: noop }),
+    withProgress: (_options, task) => Promise.resolve(task({ report: noop }, new CancellationTokenSource().token)),
+    onDidChangeActiveTextEditor: noEvent,
+    activeTextEditor: undefined,
+    visibleTextEditors: [],
+  }),
+
+  workspace: withFallback('workspace', {
+    getConfiguration,
+    workspaceFolders: undefined,
+    rootPath: undefined,
+    openTextDocument: () => Promise.resolve(withFallback('TextDocument', { getText: () => '', lineCount: 0 })),
+    onDidChangeConfiguration: noEvent,
+    onDidSaveTextDocument: noEvent,
+    onDidChangeWorkspaceFolders: noEvent,
+  }),
+
+  env: withFallback('env', {
+    appName: 'Visual Studio Code (node stub)',
+    language: 'en',
+    machineId: 'fuzzer',
+    clipboard: { readText: () => Promise.resolve(''), writeText: () => Promise.resolve() },
+    openExternal: () => Promise.resolve(true),
+  }),
+
+  extensions: withFallback('extensions', { getExtension: () => undefined, all: [] }),
+
+  // Used by the runner to build the ExtensionContext passed to activate()
+  __createExtensionContext(extensionPath) {
+    return withFallback('ExtensionContext', {
+      subscriptions: [],
+      extensionPath,
+      extensionUri: Uri.file(extensionPath),
+      globalState: new Memento(),
+      workspaceState: new Memento(),
+      secrets: { get: () => Promise.resolve(undefined), store: () => Promise.resolve(), delete: () => Promise.resolve(), onDidChange: noEvent },
+      globalStorageUri: Uri.file(path.join(extensionPath, '.fuzz-storage', 'global')),
+      storageUri: Uri.file(path.join(extensionPath, '.fuzz-storage', 'workspace')),
+      logUri: Uri.file(path.join(extensionPath, '.fuzz-storage', 'log')),
+      extensionMode: 2,
+      asAbsolutePath: (rel) => path.join(extensionPath, rel),
+    });
+  },
+};
+
+module.exports = withFallback('vscode', vscode);
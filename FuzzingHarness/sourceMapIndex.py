@@ -0,0 +1,295 @@
+# ./FuzzingHarness/sourceMapIndex.py
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from Logging.coverageStore import CoverageStore
+
+BASE64_DIGITS = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+SOURCE_MAPPING_RE = re.compile(r"//[#@]\s*sourceMappingURL=(\S+)\s*$")
+WEBPACK_PREFIX_RE = re.compile(r"^webpack://[^/]*/")
+# JavaScript line terminators, which is what generated lines in a source map are split on
+JS_LINE_RE = re.compile(r"[^\r\n\u2028\u2029]*(?:\r\n|[\r\n\u2028\u2029])")
+
+class SourceMapIndex:
+    """
+    Maps V8 precise coverage of compiled scripts back to TypeScript lines and functions through the build's source maps.
+    Each script's map is decoded once into parallel arrays sorted by generated offset, so attributing a range is a bisect.
+    Decoded scripts are kept per build key in memory and, with cacheDir, on disk, so later reports for the same build
+    only pay for the lookup.
+    """
+    def __init__(self, cacheDir=None):
+        self.cacheDir = cacheDir
+        if cacheDir:
+            os.makedirs(cacheDir, exist_ok=True)
+        self.scripts: dict[tuple[str, str], dict | None] = {}
+        self._lock = threading.Lock()
+
+    def attribute(self, rawCoverage, fuzzCopy, buildKey=None):
+        """
+        Per-TS-file coverage of a list of V8 ScriptCoverage entries ({url, functions}). An entry may also carry
+        "hits", [start, end) offsets executed at least once, when the harness merged several takes already.
+        Returns {sourcePath: {"lines": {line: hit}, "functions": {"name:line": callCount}}}, lines 1-based.
+        """
+        report: dict[str, dict] = {}
+        for script in rawCoverage or []:
+            rel = CoverageStore.normalizeUrl(script.get("url", ""))
+            index = self.scriptIndex(fuzzCopy, rel, buildKey)
+            if index is None:
+                continue
+            functions = script.get("functions", [])
+            hits = script.get("hits")
+            if hits is None:
+                hits = self.hitIntervals([r for fn in functions for r in fn.get("ranges", [])])
+            self._attributeLines(index, hits, report)
+            self._attributeFunctions(index, functions, report)
+        return report
+
+    def scriptIndex(self, fuzzCopy, rel, buildKey=None):
+        """
+        Decoded source map of the compiled script at rel (relative to the fuzz copy), or None if it has none.
+        """
+        scriptPath = os.path.join(fuzzCopy, rel)
+        key = buildKey or self._fileHash(scriptPath)
+        if key is None:
+            return None
+        with self._lock:
+            if (key, rel) in self.scripts:
+                return self.scripts[(key, rel)]
+
+        index = self._loadCached(key, rel)
+        if index is None:
+            index = self._buildIndex(fuzzCopy, rel)
+            if index is not None:
+                self._storeCached(key, rel, index)
+        with self._lock:
+            self.scripts[(key, rel)] = index
+        return index
+
+    @staticmethod
+    def hitIntervals(ranges):
+        """
+        Disjoint [start, end) offsets whose innermost V8 range has a count above zero. V8 ranges nest, and a block
+        range overrides the count of the function range around it.
+        """
+        ordered = sorted(ranges, key=lambda r: (r["startOffset"], -r["endOffset"]))
+        hits: list[list[int]] = []
+        stack: list[dict] = []
+        pos = 0
+
+        def emit(end):
+            nonlocal pos
+            if end > pos and stack and stack[-1]["count"] > 0:
+                if hits and hits[-1][1] == pos:
+                    hits[-1][1] = end
+                else:
+                    hits.append([pos, end])
+            pos = max(pos, end)
+
+        for r in ordered:
+            while stack and stack[-1]["endOffset"] <= r["startOffset"]:
+                emit(stack[-1]["endOffset"])
+                stack.pop()
+            emit(r["startOffset"])
+            stack.append(r)
+        while stack:
+            emit(stack[-1]["endOffset"])
+            stack.pop()
+        return hits
+
+    @staticmethod
+    def summarize(report):
+        """
+        {sourcePath: {"lines": [hit, total], "functions": [hit, total]}} of an attribute() or merge() result.
+        """
+        summary = {}
+        for path, cov in report.items():
+            lines = cov.get("lines", {})
+            funcs = cov.get("functions", {})
+            summary[path] = {
+                "lines": [sum(1 for hit in lines.values() if hit), len(lines)],
+                "functions": [sum(1 for count in funcs.values() if count > 0), len(funcs)],
+            }
+        return summary
+
+    @staticmethod
+    def merge(old, new):
+        """
+        Combines two reports: a line is hit if either hit it, function call counts add up.
+        Line keys may be strings when a report was read back from JSON.
+        """
+        merged = {}
+        for report in (old or {}, new or {}):
+            for path, cov in report.items():
+                target = merged.setdefault(path, {"lines": {}, "functions": {}})
+                for line, hit in cov.get("lines", {}).items():
+                    line = int(line)
+                    target["lines"][line] = bool(target["lines"].get(line)) or bool(hit)
+                for name, count in cov.get("functions", {}).items():
+                    target["functions"][name] = target["functions"].get(name, 0) + count
+        return merged
+
+    def _attributeLines(self, index, hits, report):
+        offsets, sources, lines, paths = index["offsets"], index["sources"], index["lines"], index["paths"]
+        starts = [h[0] for h in hits]
+        for i, offset in enumerate(offsets):
+            path = paths[sources[i]]
+            if path is None:
+                continue
+            h = bisect.bisect_right(starts, offset) - 1
+            hit = h >= 0 and offset < hits[h][1]
+            fileLines = report.setdefault(path, {"lines": {}, "functions": {}})["lines"]
+            line = lines[i] + 1
+            fileLines[line] = fileLines.get(line, False) or hit
+
+    def _attributeFunctions(self, index, functions, report):
+        offsets, sources, lines, paths = index["offsets"], index["sources"], index["lines"], index["paths"]
+        for fn in functions:
+            ranges = fn.get("ranges") or []
+            if not ranges:
+                continue
+            start, end = ranges[0]["startOffset"], ranges[0]["endOffset"]
+            # The function is attributed to the first mapped position inside its own range
+            i = bisect.bisect_left(offsets, start)
+            if i >= len(offsets) or offsets[i] >= end or paths[sources[i]] is None:
+                continue
+            # Script-level wrappers span the whole bundle and say nothing about a TS function
+            if not fn.get("functionName") and start == 0:
+                continue
+            funcs = report.setdefault(paths[sources[i]], {"lines": {}, "functions": {}})["functions"]
+            key = f"{fn.get('functionName') or '<anon>'}:{lines[i] + 1}"
+            funcs[key] = funcs.get(key, 0) + ranges[0]["count"]
+
+    def _buildIndex(self, fuzzCopy, rel):
+        scriptPath = os.path.join(fuzzCopy, rel)
+        try:
+            # newline="" keeps \r\n, which V8 counts as two code units
+            with open(scriptPath, "r", encoding="utf-8", errors="replace", newline="") as fh:
+                text = fh.read()
+        except OSError:
+            return None
+
+        mapPath = scriptPath + ".map"
+        match = SOURCE_MAPPING_RE.search(text[-512:])
+        if match and not match.group(1).startswith("data:"):
+            mapPath = os.path.join(os.path.dirname(scriptPath), match.group(1))
+        try:
+            with open(mapPath, "r", encoding="utf-8") as fh:
+                sourceMap = json.load(fh)
+        except (OSError, ValueError):
+            logging.debug(f"No source map for {rel}")
+            return None
+
+        # V8 offsets and source map columns both count UTF-16 code units
+        lineStarts = [0]
+        for match in JS_LINE_RE.finditer(text):
+            line = match.group(0)
+            lineStarts.append(lineStarts[-1] + len(line.encode("utf-16-le")) // 2)
+
+        paths = [self._sourcePath(src, sourceMap.get("sourceRoot") or "", os.path.dirname(mapPath), fuzzCopy)
+                 for src in sourceMap.get("sources", [])]
+        offsets, sources, lines = [], [], []
+        try:
+            for genLine, genCol, src, srcLine in self._decodeMappings(sourceMap.get("mappings", "")):
+                if genLine >= len(lineStarts):
+                    break
+                if not 0 <= src < len(paths):
+                    continue
+                offsets.append(lineStarts[genLine] + genCol)
+                sources.append(src)
+                lines.append(srcLine)
+        except (KeyError, AttributeError) as e:
+            # A character outside base64, or mappings that are not a string
+            logging.warning(f"Malformed source map mappings for {rel}: {e!r}")
+            return None
+        logging.debug(f"Indexed {len(offsets)} source map segments for {rel}")
+        return {"paths": paths, "offsets": offsets, "sources": sources, "lines": lines}
+
+    def _decodeMappings(self, mappings):
+        """
+        Yields (generatedLine, generatedColumn, sourceIndex, sourceLine) for every segment that maps to a source.
+        Segments come out sorted by generated position.
+        """
+        src = srcLine = srcCol = name = 0
+        for genLine, group in enumerate(mappings.split(";")):
+            genCol = 0
+            for segment in group.split(","):
+                if not segment:
+                    continue
+                fields = self._decodeVlq(segment)
+                genCol += fields[0]
+                if len(fields) < 4:
+                    continue
+                src += fields[1]
+                srcLine += fields[2]
+                srcCol += fields[3]
+                if len(fields) > 4:
+                    name += fields[4]
+                yield genLine, genCol, src, srcLine
+
+    @staticmethod
+    def _decodeVlq(segment):
+        values = []
+        value = shift = 0
+        for char in segment:
+            digit = BASE64_DIGITS[char]
+            value += (digit & 31) << shift
+            if digit & 32:
+                shift += 5
+                continue
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+        return values
+
+    @staticmethod
+    def _sourcePath(source, sourceRoot, mapDir, fuzzCopy):
+        """
+        Source path relative to the extension root, or None for sources outside it (webpack runtime, externals).
+        """
+        if WEBPACK_PREFIX_RE.match(source):
+            source = WEBPACK_PREFIX_RE.sub("", source)
+            if source.startswith(("external ", "webpack/")):
+                return None
+            path = os.path.normpath(os.path.join(fuzzCopy, source))
+        else:
+            path = os.path.normpath(os.path.join(mapDir, sourceRoot, source))
+        rel = os.path.relpath(path, fuzzCopy).replace(os.sep, "/")
+        if rel.startswith("../"):
+            return None
+        return rel
+
+    def _fileHash(self, path):
+        try:
+            with open(path, "rb") as fh:
+                return hashlib.sha256(fh.read()).hexdigest()[:24]
+        except OSError:
+            return None
+
+    def _cachePath(self, key, rel):
+        name = hashlib.sha256(rel.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cacheDir, key, f"{name}.json")
+
+    def _loadCached(self, key, rel):
+        if not self.cacheDir:
+            return None
+        try:
+            with open(self._cachePath(key, rel), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _storeCached(self, key, rel, index):
+        if not self.cacheDir:
+            return
+        path = self._cachePath(key, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(index, fh)
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning(f"Could not cache source map index for {rel}: {e}")
@@ -9,13 +9,59 @@ import logging
 import re
 import signal
 import sys
+from ExtensionFuzzerCommunication.queueCursor import QueueCursor
+from FuzzingHarness.buildCache import BuildCache
+from FuzzingHarness.dependencyStore import DependencyStore
+from FuzzingHarness.workdirMaterializer import WorkdirMaterializer
+from FuzzingHarness.compileStrategy import detectCompileStrategy
+from Logging.coverageStore import CoverageStore
+from Logging.resultStore import ResultStore
+from FuzzingHarness.sourceMapIndex import SourceMapIndex
+from FuzzingHarness.coverageAggregator import CoverageAggregator
+from Logging.crashBuckets import CrashBuckets
 
 # Symbols/functions to not include in my output csvs 
+# Bundlers put the harness in the same script as the extension, so it is told apart by name: helpers the harness
+# adds get names that target code would not use, never generic ones like "add" or "flush".
 HARNESS_FUNCS: set[str] = {
     "waitForServerReady",
     "fetchFuzzCases",
+    "fetchFuzzPage",
+    "fetchBatch",
+    "callServer",
+    "sendReport",
+    "CoverageInterner",
+    "internCoverage",
+    "internBlocks",
+    "packIds",
+    "pendingTables",
+    "commitTables",
+    "CaseTimeout",
+    "withTimeout",
+    "sendHeartbeat",
+    "startHeartbeat",
+    "runCases",
+    "runSidecarHarness",
+    "selectTarget",
+    "takeCoverage",
+    "fuzzScriptsOf",
+    "blockCoverage",
+    "summarizeCoverage",
+    "CaseReporter",
+    "addResult",
+    "resultsDue",
+    "flushResults",
+    "sendResults",
+    "drainResults",
+    "stopReporter",
     "resolveFn",
     "diffCoverage",
+    "hitIntervals",
+    "unionIntervals",
+    "accumulateCoverage",
+    "cumulativeCoverage",
+    "emitInterval",
+    "closeRange",
     "runFuzzerHarness",
     "walk",
     "raw",
@@ -23,8 +69,23 @@ HARNESS_FUNCS: set[str] = {
     "<anon>",
 }
 
+# Per-extension code injected into the harness right after the target import
+CUSTOM_HOOKS: dict[str, str] = {
+    "airflow-vscode-extension-main": "(targetModule as any).Api.isApiParamsSet = () => true;",
+    "vscode-airflow-dag-viewer-main": "// no custom hook required for DAG viewer",
+    "vscode-bentoml-main": "// Need to install python extension",
+    "vscode-dvc-main": "// Nothing for now",
+    "vscode-zenml-develop": "// Nothing for now"
+}
+
+# Generated into src/ of a sidecar fuzz copy so every module is compiled once and loaded on demand
+MODULE_REGISTRY_FILE = "fuzzerModules.ts"
+
+# Per-TS-file line and function coverage, next to the CSVs of the file being fuzzed
+TS_COVERAGE_FILE = "tsCoverage.json"
+
 class TsExtensionFuzzer:
-    def __init__(self, rootPath, communicator, tmpDir, repoRoot, cleanup):
+    def __init__(self, rootPath, communicator, tmpDir, repoRoot, cleanup, buildCache=None, harnessMode="static", depStore=None, materializer=None, isolated=False, backend="vscode", buildStateDir=None, wireFormat="json", caseTimeout=10, heartbeatTimeout=5, maxRestarts=3, coverageStore=None, sourceMaps=None, coverageMode="function", resultStore=None, buckets=None, reportBatch=8):
         self.rootPath = rootPath
         self.communicator = communicator
         self.currentDir = os.path.dirname(os.path.abspath(__file__))
@@ -40,6 +101,44 @@ class TsExtensionFuzzer:
         self.vscodeProc = None
         self.vscodePath = "/usr/local/bin/code-gui"
         self.cleanup = cleanup
+        self.buildCache: BuildCache | None = buildCache
+        # Key of the cache entry this session runs from, pinned against eviction until closeFuzzSession
+        self.pinnedKey = None
+        if harnessMode not in ("static", "sidecar"):
+            raise ValueError(f"Unknown harness mode: {harnessMode}")
+        self.harnessMode = harnessMode
+        self.depStore: DependencyStore | None = depStore
+        self.materializer: WorkdirMaterializer | None = materializer
+        self.isolated = isolated
+        if backend not in ("vscode", "node"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        self.nodeRunner = os.path.join(self.currentDir, "nodeBackend", "runHarness.js")
+        self.buildStateDir = buildStateDir
+        if wireFormat not in ("json", "compact"):
+            raise ValueError(f"Unknown wire format: {wireFormat}")
+        self.wireFormat = wireFormat
+        # Harness cuts off async cases after caseTimeout; the watchdog restarts it after heartbeatTimeout of silence
+        self.caseTimeout = caseTimeout
+        self.heartbeatTimeout = heartbeatTimeout
+        self.maxRestarts = maxRestarts
+        # Streamed results per /report/cases request; buffered results also go out every 250ms
+        self.reportBatch = reportBatch
+        # Writes CSV coverage as interned bitsets; without it rows keep the JSON coverage dict
+        self.coverageStore: CoverageStore | None = coverageStore
+        # Attributes the harness's session coverage to TypeScript lines; buildKey is the build cache key of the copy
+        self.sourceMaps: SourceMapIndex | None = sourceMaps
+        self.buildKey = None
+        # What the harness collects per case; edges counts new-edge discovery over every file this fuzzer runs
+        self.coverageMode = coverageMode
+        self.edges = CoverageAggregator(coverageMode)
+        # Results go to the extension's SQLite store instead of the per-file CSVs when one is given
+        self.resultStore: ResultStore | None = resultStore
+        # Buckets every recorded error and crash by normalized stack, and counts runs per argument shape for scheduling
+        self.buckets: CrashBuckets | None = buckets
+        # Called with every streamed case after its new edges are counted, e.g. by the guided input creator
+        self.caseObserver = None
+        self.phaseTimes: dict[str, float] = {}
 
     def __enter__(self):
         return self
@@ -67,7 +166,64 @@ class TsExtensionFuzzer:
         out_dir = cfg.get("compilerOptions", {}).get("outDir", "dist")
         return cfg, out_dir
 
-    def prepareFuzzCopy(self, path):
+    def modulePathFor(self, path):
+        """
+        Import specifier of a TypeScript file relative to the extension's src directory.
+        """
+        rel = os.path.relpath(path, os.path.join(self.rootPath, "src"))
+        return "./" + os.path.splitext(rel)[0].replace(os.sep, "/")
+
+    def moduleTargets(self):
+        """
+        Returns the import specifiers of every TypeScript module under src/ that the sidecar harness can target.
+        """
+        srcDir = os.path.join(self.rootPath, "src")
+        targets = []
+        for dirPath, dirs, files in os.walk(srcDir):
+            dirs[:] = sorted(d for d in dirs if d not in ("node_modules", "__pycache__"))
+            for f in sorted(files):
+                if f.endswith(".ts") and not f.endswith(".d.ts"):
+                    targets.append(self.modulePathFor(os.path.join(dirPath, f)))
+        return targets
+
+    def harnessInjection(self, path):
+        """
+        Code that replaces PLACEHOLDER_IMPORT in the harness template.
+        Static mode imports a single target; sidecar mode imports the module registry and switches targets per batch.
+        """
+        hook = CUSTOM_HOOKS.get(self.repoRoot, "// no special hooks")
+        if self.harnessMode == "static":
+            injection_code = f"import * as targetModule from '{self.modulePathFor(path)}';\n"
+            injection_code += "const HARNESS_MODE: string = 'static';\n"
+            injection_code += "function selectTarget(_modPath: string) {}\n"
+            injection_code += hook
+            return injection_code
+
+        registry = os.path.splitext(MODULE_REGISTRY_FILE)[0]
+        injection_code = f"import {{ FUZZ_MODULES }} from './{registry}';\n"
+        injection_code += "const HARNESS_MODE: string = 'sidecar';\n"
+        injection_code += "let targetModule: any = {};\n"
+        injection_code += "function selectTarget(modPath: string) {\n"
+        injection_code += "  const load = FUZZ_MODULES[modPath];\n"
+        injection_code += "  if (!load) throw new Error(`Module not compiled into harness: ${modPath}`);\n"
+        injection_code += "  targetModule = load();\n"
+        injection_code += f"  try {{ {hook} }} catch {{ }}\n"
+        injection_code += "}\n"
+        return injection_code
+
+    def writeModuleRegistry(self, srcDir):
+        """
+        Writes the lazy module registry used by the sidecar harness.
+        """
+        lines = ["export const FUZZ_MODULES: Record<string, () => any> = {\n"]
+        for modPath in self.moduleTargets():
+            lines.append(f"  '{modPath}': () => require('{modPath}'),\n")
+        lines.append("};\n")
+        with open(os.path.join(srcDir, MODULE_REGISTRY_FILE), "w", encoding="utf-8") as fh:
+            fh.writelines(lines)
+        logging.debug(f"Wrote module registry with {len(lines) - 2} targets")
+
+    def prepareFuzzCopy(self, path=None):
         # This somehow fixes issues in the containerized version
         def ignore_bad_dirs(dir, files):
             ignore_list = []
@@ -77,38 +233,37 @@ class TsExtensionFuzzer:
             return ignore_list
         workdir  = tempfile.mkdtemp(prefix="ext-fuzz-", dir=self.tmpDir)
         fuzzCopy = os.path.join(workdir, os.path.basename(self.rootPath))
-        shutil.copytree(self.rootPath, fuzzCopy, symlinks=True, dirs_exist_ok=True, ignore=ignore_bad_dirs)
+        if self.materializer is not None:
+            self.materializer.materialize(self.rootPath, fuzzCopy)
+        else:
+            shutil.copytree(self.rootPath, fuzzCopy, symlinks=True, dirs_exist_ok=True, ignore=ignore_bad_dirs)
         logging.debug(f"Created temp working dir: {fuzzCopy}")
 
+        def detach(path_):
+            # Linked files must become private copies before they are patched
+            if self.materializer is not None:
+                self.materializer.detach(path_)
+
         srcDir     = os.path.join(fuzzCopy, "src")
         dstHarness = os.path.join(srcDir, "fuzzerHarness.ts")
         os.makedirs(srcDir, exist_ok=True)
+        detach(dstHarness)
         shutil.copy2(self.harnessSource, dstHarness)
 
         with open(self.harnessSource, "r", encoding="utf-8") as fh:
             tpl = fh.read()
-        rel       = os.path.relpath(path, os.path.join(self.rootPath, "src"))
-        modPath   = "./" + os.path.splitext(rel)[0].replace(os.sep, "/")
-
-        custom_hooks = {
-            "airflow-vscode-extension-main": "(targetModule as any).Api.isApiParamsSet = () => true;",
-            "vscode-airflow-dag-viewer-main": "// no custom hook required for DAG viewer",
-            "vscode-bentoml-main": "// Need to install python extension",
-            "vscode-dvc-main": "// Nothing for now",
-            "vscode-zenml-develop": "// Nothing for now"
-        }
-
-        injection_code = f"import * as targetModule from '{modPath}';\n"
-        injection_code += custom_hooks.get(self.repoRoot, "// no special hooks")
-
-        harnessTS = tpl.replace("PLACEHOLDER_IMPORT", injection_code)
+        harnessTS = tpl.replace("PLACEHOLDER_IMPORT", self.harnessInjection(path))
         with open(dstHarness, "w", encoding="utf-8") as fh:
             fh.write(harnessTS)
         logging.debug("Injected module import into harness")
 
+        if self.harnessMode == "sidecar":
+            self.writeModuleRegistry(srcDir)
+
         pkgFile = os.path.join(fuzzCopy, "package.json")
         if not os.path.isfile(pkgFile):
             raise FileNotFoundError(f"package.json missing in {pkgFile}")
+        detach(pkgFile)
         pkg = json.load(open(pkgFile, "r", encoding="utf-8"))
 
         pkg["name"]        = pkg.get("name", "extension") + "-fuzz"
@@ -125,6 +280,7 @@ class TsExtensionFuzzer:
         json.dump(pkg, open(pkgFile, "w", encoding="utf-8"), indent=2)
         
         tsconfig_path = os.path.join(fuzzCopy, "tsconfig.json")
+        detach(tsconfig_path)
         tscfg, out_dir = self._load_tsconfig(tsconfig_path) if os.path.isfile(tsconfig_path) else ({}, "dist")
 
         compiler_opts = tscfg.get("compilerOptions", {})
@@ -162,6 +318,7 @@ class TsExtensionFuzzer:
                 src = fh.readlines()
             if "import './fuzzerHarness';" not in "".join(src):
                 src.insert(0, "import './fuzzerHarness';\n")
+                detach(entry_ts)
                 with open(entry_ts, "w", encoding="utf-8") as fh:
                     fh.writelines(src)
                 logging.debug(f"Injected harness import into {entry_ts}")
@@ -171,36 +328,128 @@ class TsExtensionFuzzer:
         harness_rel = os.path.relpath(dstHarness, fuzzCopy).replace("\\", "/")
         if "files" in tscfg and harness_rel not in tscfg["files"]:
             tscfg["files"].append(harness_rel)
+            if self.harnessMode == "sidecar":
+                tscfg["files"].append(f"src/{MODULE_REGISTRY_FILE}")
             json.dump(tscfg, open(tsconfig_path, "w", encoding="utf-8"), indent=2)
 
         logging.debug("Finished patching copy; returning paths")
         return workdir, fuzzCopy
 
+    def _timePhase(self, phase, start):
+        elapsed = time.perf_counter() - start
+        self.phaseTimes[phase] = elapsed
+        logging.info(f"Phase '{phase}' took {elapsed:.2f}s")
+
     def compileExtension(self, extPath):
         npm_cmd = "npm.cmd" if os.name == "nt" else "npm"
 
         if not os.path.isdir(extPath):
             raise FileNotFoundError(f"compileExtension: extPath not found: {extPath}")
 
-        logging.info(f"Running '{npm_cmd} install' in {extPath}")
-        subprocess.run([npm_cmd, "install", "--legacy-peer-deps"], cwd=extPath, check=True)
-
-        logging.info(f"Running '{npm_cmd} run compile' in {extPath}")
+        start = time.perf_counter()
+        linked = False
+        if self.depStore is not None:
+            try:
+                self.depStore.link(self.depStore.ensure(self.rootPath), extPath)
+                linked = True
+            except (subprocess.CalledProcessError, OSError) as e:
+                logging.warning(f"Shared dependency store unavailable ({e}); installing into the fuzz copy instead.")
+
+        if not linked:
+            logging.info(f"Running '{npm_cmd} install' in {extPath}")
+            subprocess.run([npm_cmd, "install", "--legacy-peer-deps"], cwd=extPath, check=True)
+        self._timePhase("install", start)
+
+        start = time.perf_counter()
+        tsconfig_path = os.path.join(extPath, "tsconfig.json")
+        _, out_dir = self._load_tsconfig(tsconfig_path) if os.path.isfile(tsconfig_path) else ({}, "dist")
+        strategy = detectCompileStrategy(extPath, self.buildStateDir, out_dir)
+        compiled = True
         try:
-            result = subprocess.run([npm_cmd, "run"], cwd=extPath, capture_output=True, text=True)
-
-            if "compile" in result.stdout:
-                subprocess.run([npm_cmd, "run", "compile"], cwd=extPath, check=True)
-            elif "build" in result.stdout:
-                subprocess.run([npm_cmd, "run", "build"], cwd=extPath, check=True)
-            else:
-                subprocess.run(["npx", "tsc", "--noEmit"], cwd=extPath, check=True)
+            strategy.compile(extPath)
         except subprocess.CalledProcessError as e:
             logging.warning(f"Compile completed with TypeScript errors: {e}. Proceeding anyway.")
-
-    def startFuzzSession(self, initialTSFilePath):
-        self.workdir, self.fuzzCopy = self.prepareFuzzCopy(initialTSFilePath)
-        self.compileExtension(self.fuzzCopy)
+            compiled = False
+        self._timePhase("compile", start)
+        return compiled
+
+    def startFuzzSession(self, initialTSFilePath=None):
+        """
+        Prepares, compiles and launches the fuzz copy.
+        In sidecar mode no target file is needed because the harness is told which module to fuzz per batch.
+        """
+        self.phaseTimes = {}
+        start = time.perf_counter()
+        self.releaseBuild()
+        cacheKey = None
+        self.buildKey = None
+        cached = None
+        if self.buildCache is not None:
+            target = "<sidecar>" if self.harnessMode == "sidecar" else self.modulePathFor(initialTSFilePath)
+            cacheKey = self.buildCache.computeKey(
+                self.rootPath,
+                self.harnessSource,
+                target,
+                CUSTOM_HOOKS.get(self.repoRoot, ""),
+            )
+            cached = self.buildCache.lookup(cacheKey, os.path.basename(self.rootPath))
+            self.buildKey = cacheKey
+            if cached is not None:
+                self.pinnedKey = cacheKey
+
+        if cached is not None:
+            # Only the extensions dir lives in the session workdir; the compiled copy is shared
+            self.workdir = tempfile.mkdtemp(prefix="ext-fuzz-", dir=self.tmpDir)
+            self.fuzzCopy = cached
+            self._timePhase("prepare", start)
+        else:
+            self.workdir, self.fuzzCopy = self.prepareFuzzCopy(initialTSFilePath)
+            self._timePhase("prepare", start)
+            compiled = self.compileExtension(self.fuzzCopy)
+            if self.buildCache is not None and compiled:
+                self.fuzzCopy = self.buildCache.store(cacheKey, self.fuzzCopy)
+                self.pinnedKey = cacheKey
+            elif self.buildCache is not None:
+                logging.info("Not caching a build that failed to compile")
+        self.launchHarness()
+
+    def releaseBuild(self):
+        """
+        Unpins the cached build this session ran from, so the cache may evict it again.
+        """
+        if self.pinnedKey is not None and self.buildCache is not None:
+            self.buildCache.release(self.pinnedKey)
+        self.pinnedKey = None
+
+    def launchHarness(self):
+        """
+        Starts VS Code (or node) on the prepared fuzz copy. Also used by the watchdog to restart a hung harness.
+        """
+        start = time.perf_counter()
+        self.communicator.resetLiveness()
+
+        # The extension host inherits this environment, which is how the harness finds its communicator
+        env = dict(os.environ)
+        env["FUZZ_PORT"] = str(self.communicator.port)
+        env["FUZZ_SESSION"] = self.communicator.sessionId
+        env["FUZZ_WIRE"] = self.wireFormat
+        env["FUZZ_COVERAGE"] = self.coverageMode
+        env["FUZZ_CASE_TIMEOUT_MS"] = str(int(self.caseTimeout * 1000))
+        env["FUZZ_HEARTBEAT_MS"] = str(int(min(1000, self.heartbeatTimeout * 250)))
+        env["FUZZ_REPORT_BATCH"] = str(self.reportBatch)
+        if self.communicator.transport == "asyncio" and self.communicator.socketPath:
+            env["FUZZ_SOCKET"] = self.communicator.socketPath
+        else:
+            env.pop("FUZZ_SOCKET", None)
+
+        if self.backend == "node":
+            # Headless: plain node with a stub vscode module instead of a full Electron window.
+            # vscodeProc then holds the node process so the rest of the session logic is unchanged.
+            node_cmd = "node.exe" if os.name == "nt" else "node"
+            self.vscodeProc = subprocess.Popen([node_cmd, self.nodeRunner, self.fuzzCopy], cwd=self.fuzzCopy, env=env)
+            logging.info("Launched harness under the headless node backend")
+            self._timePhase("launch", start)
+            return
 
         # Install any needed extensions once
         if self.repoRoot == "vscode-bentoml-main":
@@ -209,74 +458,306 @@ class TsExtensionFuzzer:
             self.install_extensions(ext_dir, extensions_json)
 
         # Launch VS Code once
-        self.vscodeProc = subprocess.Popen([
+        cmd = [
             self.vscodePath,
             "--new-window",
             "--extensionDevelopmentPath", self.fuzzCopy,
             "--extensions-dir", os.path.join(self.workdir, "extensions"),
-            self.fuzzCopy
-        ])
+        ]
+        if self.isolated:
+            # Separate user-data dir forces a separate VS Code instance instead of a window in a shared one
+            cmd += ["--user-data-dir", os.path.join(self.workdir, "user-data")]
+        cmd.append(self.fuzzCopy)
+
+        self.vscodeProc = subprocess.Popen(cmd, env=env)
+        self._timePhase("launch", start)
 
-    def runSingleFile(self, cleanCSV, errorCSV, crashCSV):
+    def setCaseObserver(self, observer):
+        self.caseObserver = observer
+
+    def ensureHeader(self, path_: str):
+        if not os.path.exists(path_) or os.path.getsize(path_) == 0:
+            with open(path_, "w", newline="", encoding="utf-8") as fh:
+                csv.writer(fh).writerow(["funcName", "args", "coverage", "error"])
+
+    def writeRows(self, path_: str, items: list[dict]):
+        if not items:
+            return
+        rows = []
+        target = self.buckets.targetOf(path_) if self.buckets is not None else None
+        for it in items:
+            if self.buckets is not None:
+                self.buckets.observe(it["funcName"], it["args"], it.get("error") or None, target)
+            if self.coverageStore is not None:
+                bits = self.coverageStore.encode(it["coverage"])
+                newFuncs = self.coverageStore.add(bits)
+                if newFuncs:
+                    logging.debug(f"{it['funcName']} reached {newFuncs} new functions")
+                coverage = self.coverageStore.toField(bits)
+            else:
+                coverage = json.dumps(it["coverage"])
+            rows.append([
+                it["funcName"],
+                json.dumps(it["args"]),
+                coverage,
+                it.get("error", "")
+            ])
+
+        if self.resultStore is not None:
+            self.resultStore.addRows(path_, rows)
+            return
+        self.ensureHeader(path_)
+        with open(path_, "a", newline="", encoding="utf-8") as fh:
+            csv.writer(fh).writerows(rows)
+
+    def stripHarnessFuncs(self, item: dict):
+        slim = {}
+        for file_url, fn_list in item.get("coverage", {}).items():
+            kept = [f for f in fn_list if f not in HARNESS_FUNCS]
+            if kept:
+                slim[file_url] = kept
+        item = dict(item)
+        item["coverage"] = slim
+        return item
+
+    def runSingleFile(self, cleanCSV, errorCSV, crashCSV, idleTimeout=120):
         logging.info(f"Wating for fuzzing results")
-        result = None
-        for _ in range(120):
-            time.sleep(1)
-            resp = self.communicator.getLatestResult()
-            if resp is not None:
-                result = resp
-                break
-
-        def ensure_header(path_: str):
-            if not os.path.exists(path_) or os.path.getsize(path_) == 0:
-                with open(path_, "w", newline="", encoding="utf-8") as fh:
-                    csv.writer(fh).writerow(["funcName", "args", "coverage", "error"])
-
-        def write_rows(path_: str, items: list[dict]):
-            if not items:
-                return
-            ensure_header(path_)
-            with open(path_, "a", newline="", encoding="utf-8") as fh:
-                w = csv.writer(fh)
-                for it in items:
-                    w.writerow([
-                        it["funcName"],
-                        json.dumps(it["args"]),
-                        json.dumps(it["coverage"]),
-                        it.get("error", "")
-                    ])
-        
-        resp = self.communicator.resetLatestResult()
 
-        def _prune_coverage(cov: dict):
-            slim = {}
-            for file_url, fn_list in cov.items():
-                kept = [f for f in fn_list if f not in HARNESS_FUNCS]
-                if kept:
-                    slim[file_url] = kept
-            return slim
+        before = self.edges.stats()
+        runStart = time.monotonic()
+
+        # Streamed cases go straight to the CSVs as the harness finishes them
+        def sink(cases: list[dict]):
+            for case in cases:
+                case["newEdges"] = self.edges.observe(case)
+                if self.caseObserver is not None:
+                    self.caseObserver(case)
+            self.writeRows(cleanCSV, [self.stripHarnessFuncs(c) for c in cases if c.get("outcome") == "clean"])
+            self.writeRows(errorCSV, [self.stripHarnessFuncs(c) for c in cases if c.get("outcome") == "error"])
+            self.writeRows(crashCSV, [self.stripHarnessFuncs(c) for c in cases if c.get("outcome") == "timeout"])
 
-        def _strip(item: dict):
-            item = dict(item)
-            item["coverage"] = _prune_coverage(item.get("coverage", {}))
-            return item
+        self.communicator.setCaseSink(sink)
+        try:
+            result = self.watchQueue(lambda silence: self.recordHang(crashCSV, silence), idleTimeout)
+        finally:
+            self.communicator.setCaseSink(None)
+
+        self.communicator.resetLatestResult()
+        if self.buckets is not None:
+            self.buckets.save()
+
+        after = self.edges.stats()
+        ran = after["cases"] - before["cases"]
+        elapsed = time.monotonic() - runStart
+        logging.info(
+            f"{ran} cases in {elapsed:.1f}s ({ran / elapsed if elapsed > 0 else 0:.1f} execs/s), "
+            f"{after['edges'] - before['edges']} new edges from {after['casesWithNewEdges'] - before['casesWithNewEdges']} cases "
+            f"({self.coverageMode} coverage)"
+        )
+
+        # The crash row below replaces whatever the cursor still holds, so nothing is left to recover later
+        index, case = self.communicator.runningCase()
+        self.communicator.finishQueue()
 
         if result is not None:
-            write_rows(cleanCSV, [_strip(x) for x in result.get("clean", [])])
-            write_rows(errorCSV, [_strip(x) for x in result.get("errors", [])])
+            self.recordSourceCoverage(result.get("rawCoverage"), os.path.join(os.path.dirname(cleanCSV), TS_COVERAGE_FILE))
+            # Older harnesses put everything in the final report
+            self.writeRows(cleanCSV, [self.stripHarnessFuncs(x) for x in result.get("clean", [])])
+            self.writeRows(errorCSV, [self.stripHarnessFuncs(x) for x in result.get("errors", [])])
             if result.get("crash"):
-                write_rows(crashCSV, [_strip(result["crash"])])
+                self.writeRows(crashCSV, [self.stripHarnessFuncs(result["crash"])])
+            return
+
+        # The harness died during the case its last heartbeat announced
+        if case is None:
+            self.writeRows(crashCSV, [{"funcName": "<process-crash>", "args": [], "coverage": {}, "error": ""}])
         else:
-            write_rows(crashCSV, [{"funcName": "<process-crash>", "args": [], "coverage": {}, "error": ""}])
-    
-    def closeFuzzSession(self):
-        if hasattr(self, "vscodeProc") and self.vscodeProc:
+            logging.warning(f"Harness stopped reporting; attributing crash to case {index} ({case['funcName']})")
+            self.writeRows(crashCSV, [{
+                "funcName": case["funcName"],
+                "args": case["args"],
+                "coverage": {},
+                "error": f"<process-crash> case {index} started but never reported"
+            }])
+
+    def watchQueue(self, onStuck, idleTimeout=120):
+        """
+        Waits for the harness to report the end of the queue and returns that report, or None if it never came.
+        When the harness goes silent or exits, onStuck(silence) handles the in-flight case (False if there is none)
+        and the harness is restarted, at most maxRestarts times.
+        """
+        restarts = 0
+        # Until the first heartbeat the harness is still launching, so only idleTimeout applies.
+        # After that, heartbeatTimeout seconds of silence means it is stuck in a synchronous call.
+        started = time.monotonic()
+        while True:
+            result = self.communicator.waitForResult(timeout=1)
+            if result is not None:
+                return result
+            now = time.monotonic()
+            alive = self.communicator.lastSignOfLife()
+            # A node harness that exited is handled at once instead of waiting out the heartbeat timeout
+            exited = self.backend == "node" and self.vscodeProc is not None and self.vscodeProc.poll() is not None
+            if alive is None and not exited:
+                if now - started > idleTimeout:
+                    return None
+                continue
+            if not exited and now - alive <= self.heartbeatTimeout:
+                continue
+            alive = alive if alive is not None else started
+            if restarts >= self.maxRestarts or not onStuck(now - alive):
+                return None
+            restarts += 1
+            self.restartHarness()
+            started = time.monotonic()
+
+    def replayCases(self, cases, module=None, idleTimeout=120):
+        """
+        Runs cases ({"funcName", "args"}) as one queue without recording anything and returns their results in
+        order. A case the harness hung or died on gets outcome "timeout" with the <hang>/<process-crash> error the
+        CSVs would have; a case it never reached gets None.
+        Sidecar harnesses get the cases as a new batch; otherwise the harness is relaunched on the compiled copy.
+        """
+        cases = list(cases)
+        results: list[dict | None] = [None] * len(cases)
+
+        def sink(batch: list[dict]):
+            for case in batch:
+                index = case.get("index")
+                if isinstance(index, int) and 0 <= index < len(results):
+                    results[index] = case
+
+        def onStuck(silence):
+            index, case, error = self.stuckCase(silence)
+            if case is None:
+                return False
+            results[index] = dict(case, outcome="timeout", error=error)
+            self.communicator.skipCase(index)
+            return True
+
+        sidecar = self.harnessMode == "sidecar"
+        self.communicator.resetLatestResult()
+        self.communicator.setTestQueue(cases, module=module if sidecar else None)
+        if not sidecar:
+            self.restartHarness()
+        self.communicator.setCaseSink(sink)
+        try:
+            result = self.watchQueue(onStuck, idleTimeout)
+        finally:
+            self.communicator.setCaseSink(None)
+        self.communicator.resetLatestResult()
+
+        if result is None:
+            # The harness died during the case its last heartbeat announced
+            index, case = self.communicator.runningCase()
+            if case is not None:
+                results[index] = dict(case, outcome="timeout", error=f"<process-crash> case {index} started but never reported")
+        self.communicator.finishQueue()
+        return results
+
+    def recordSourceCoverage(self, rawCoverage, path_):
+        """
+        Maps the session's V8 coverage to TypeScript lines and functions and merges it into path_.
+        """
+        if self.sourceMaps is None or not rawCoverage or self.fuzzCopy is None:
+            return
+        start = time.perf_counter()
+        report = self.sourceMaps.attribute(rawCoverage, self.fuzzCopy, self.buildKey)
+        try:
+            with open(path_, "r", encoding="utf-8") as fh:
+                report = SourceMapIndex.merge(json.load(fh), report)
+        except (OSError, ValueError):
+            pass
+        with open(path_, "w", encoding="utf-8") as fh:
+            json.dump(report, fh)
+        self._timePhase("source-coverage", start)
+
+        for source, summary in SourceMapIndex.summarize(report).items():
+            if source.startswith("src/"):
+                (lineHit, lineTotal), (fnHit, fnTotal) = summary["lines"], summary["functions"]
+                logging.info(f"{source}: {lineHit}/{lineTotal} lines, {fnHit}/{fnTotal} functions")
+
+    def recoverStaleCursor(self, cursorPath, crashCSV):
+        """
+        If a previous run died while the harness was running a case, records that case as the crash.
+        Only the case the last heartbeat announced counts: other unacknowledged cases may have finished and been
+        waiting in the harness's report batch.
+        """
+        state = QueueCursor.loadStale(cursorPath)
+        if state is None:
+            return
+        index = state.get("heartbeat")
+        case = state["unacked"].get(str(index)) if index is not None else None
+        if case is None:
+            logging.info(f"Previous run ended between cases; discarding {cursorPath}")
+            os.remove(cursorPath)
+            return
+        logging.warning(f"Previous run ended during case {index} ({case['funcName']}); recording it as a crash")
+        self.writeRows(crashCSV, [{
+            "funcName": case["funcName"],
+            "args": case["args"],
+            "coverage": {},
+            "error": f"<process-crash> previous run ended during case {index}"
+        }])
+        os.remove(cursorPath)
+
+    def stuckCase(self, silence):
+        """
+        (index, case, error) of the case in flight when the harness went silent or exited, or (None, None, None).
+        The harness announces every case in a heartbeat before running it, so this is the case it is stuck in even
+        while results of earlier cases are still buffered.
+        """
+        index, case = self.communicator.runningCase()
+        if case is None:
+            return None, None, None
+        # The node backend is the harness process itself, so an exit there is a real crash rather than a hang
+        exitCode = self.vscodeProc.poll() if self.backend == "node" and self.vscodeProc else None
+        if exitCode is not None:
+            return index, case, f"<process-crash> harness exited with code {exitCode} during case {index}"
+        return index, case, f"<hang> no heartbeat for {silence:.1f}s during case {index}"
+
+    def recordHang(self, crashCSV, silence):
+        """
+        Writes the in-flight case as a hang (or crash, if the node harness exited) and moves the queue past it.
+        Returns False if no case is in flight.
+        """
+        index, case, error = self.stuckCase(silence)
+        if case is None:
+            return False
+        logging.warning(f"{error} ({case['funcName']})")
+        self.writeRows(crashCSV, [{
+            "funcName": case["funcName"],
+            "args": case["args"],
+            "coverage": {},
+            "error": error
+        }])
+        self.communicator.skipCase(index)
+        return True
+
+    def restartHarness(self):
+        """
+        Kills the hung harness and launches a fresh one on the same compiled copy. It resumes from the queue cursor.
+        """
+        logging.info("Restarting harness")
+        self.stopHarness()
+        self.launchHarness()
+
+    def stopHarness(self):
+        if self.vscodeProc:
             self.vscodeProc.terminate()
             try:
                 self.vscodeProc.wait(timeout=10)
             except subprocess.TimeoutExpired:
                 self.vscodeProc.kill()
-            logging.info("VS Code closed.")
+            logging.info("Node harness closed." if self.backend == "node" else "VS Code closed.")
+        self.vscodeProc = None
+    
+    def closeFuzzSession(self):
+        if self.harnessMode == "sidecar" and self.vscodeProc:
+            # Let the harness leave its batch loop before VS Code goes away
+            self.communicator.closeBatches()
+        self.stopHarness()
+        self.releaseBuild()
         if self.cleanup and hasattr(self, "workdir") and os.path.exists(self.workdir):
             shutil.rmtree(self.workdir)
             logging.info("Fuzz workdir cleaned up.")
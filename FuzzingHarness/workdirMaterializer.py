@@ -0,0 +1,157 @@
+# ./FuzzingHarness/workdirMaterializer.py
+import os
+import shutil
+import json
+import fnmatch
+import logging
+
+# Never worth copying into a fuzz copy; build outputs are regenerated by the compile step
+DEFAULT_EXCLUDE: list[str] = [
+    ".git",
+    ".vscode-server",
+    ".vscode-test",
+    "node_modules",
+    "__pycache__",
+    "vsix",
+    "*.vsix",
+    "out",
+    "dist",
+]
+
+# Files prepareFuzzCopy or npm rewrite in place, so they always get a private copy
+PATCHED_FILES: set[str] = {"package.json", "package-lock.json", "tsconfig.json"}
+
+# linux/fs.h FICLONE
+FICLONE = 0x40049409
+
+class WorkdirMaterializer:
+    """
+    Builds a fuzz copy of an extension by linking unchanged files and only copying what gets patched.
+    Reflinks are used where the filesystem supports them, then hardlinks, then plain copies.
+    """
+    def __init__(self, manifestPath=None, linkMode="auto"):
+        if linkMode not in ("auto", "reflink", "hardlink", "copy"):
+            raise ValueError(f"Unknown link mode: {linkMode}")
+        self.linkMode = linkMode
+        self.include = ["*"]
+        self.exclude = list(DEFAULT_EXCLUDE)
+        if manifestPath:
+            self.loadManifest(manifestPath)
+        self._reflinkOk = linkMode in ("auto", "reflink")
+        self.stats = {"reflink": 0, "hardlink": 0, "copy": 0, "skipped": 0}
+
+    def loadManifest(self, manifestPath):
+        """
+        Reads a JSON manifest of the form {"include": [...], "exclude": [...]} with fnmatch patterns.
+        Patterns are matched against the relative path and against every path component.
+        """
+        with open(manifestPath, "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        if "include" in manifest:
+            self.include = list(manifest["include"])
+        if "exclude" in manifest:
+            self.exclude = list(manifest["exclude"])
+        logging.info(f"Loaded workdir manifest {manifestPath}")
+
+    def _matches(self, rel, patterns):
+        parts = rel.split("/")
+        for pat in patterns:
+            if fnmatch.fnmatch(rel, pat):
+                return True
+            if any(fnmatch.fnmatch(p, pat) for p in parts):
+                return True
+        return False
+
+    def isExcluded(self, rel):
+        return self._matches(rel, self.exclude)
+
+    def isIncluded(self, rel):
+        return not self.isExcluded(rel) and self._matches(rel, self.include)
+
+    def materialize(self, srcRoot, dstRoot, patched=()):
+        """
+        Recreates srcRoot at dstRoot. Files in patched (relative paths) and PATCHED_FILES are real copies.
+        """
+        patched = set(PATCHED_FILES) | {p.replace(os.sep, "/") for p in patched}
+        self.stats = {"reflink": 0, "hardlink": 0, "copy": 0, "skipped": 0}
+        os.makedirs(dstRoot, exist_ok=True)
+
+        for dirPath, dirs, files in os.walk(srcRoot):
+            relDir = os.path.relpath(dirPath, srcRoot).replace(os.sep, "/")
+            relDir = "" if relDir == "." else relDir + "/"
+
+            kept = []
+            for d in dirs:
+                if self.isExcluded(relDir + d):
+                    self.stats["skipped"] += 1
+                    continue
+                src = os.path.join(dirPath, d)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), os.path.join(dstRoot, relDir, d))
+                    continue
+                os.makedirs(os.path.join(dstRoot, relDir, d), exist_ok=True)
+                kept.append(d)
+            dirs[:] = kept
+
+            for f in files:
+                rel = relDir + f
+                if not self.isIncluded(rel):
+                    self.stats["skipped"] += 1
+                    continue
+                src = os.path.join(dirPath, f)
+                dst = os.path.join(dstRoot, rel)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                elif rel in patched:
+                    shutil.copy2(src, dst)
+                    self.stats["copy"] += 1
+                else:
+                    self._link(src, dst)
+
+        logging.debug(f"Materialized {dstRoot}: {self.stats}")
+        return dstRoot
+
+    def detach(self, path):
+        """
+        Replaces a linked file with a private copy so it can be rewritten without touching the original.
+        """
+        if not os.path.isfile(path) or os.path.islink(path):
+            return
+        if os.stat(path).st_nlink <= 1:
+            # Already private (plain copy or reflink clone)
+            return
+        tmp = path + ".fuzz-detach"
+        shutil.copy2(path, tmp)
+        os.replace(tmp, path)
+
+    def _link(self, src, dst):
+        if self._reflinkOk and self._reflink(src, dst):
+            self.stats["reflink"] += 1
+            return
+        if self.linkMode in ("auto", "hardlink"):
+            try:
+                os.link(src, dst)
+                self.stats["hardlink"] += 1
+                return
+            except OSError:
+                pass
+        shutil.copy2(src, dst)
+        self.stats["copy"] += 1
+
+    def _reflink(self, src, dst):
+        try:
+            import fcntl
+        except ImportError:
+            self._reflinkOk = False
+            return False
+        try:
+            with open(src, "rb") as fs, open(dst, "wb") as fd:
+                fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+            shutil.copystat(src, dst)
+            return True
+        except OSError:
+            # Filesystem does not support cloning; don't try again for this run
+            if os.path.exists(dst):
+                os.unlink(dst)
+            self._reflinkOk = False
+            return False
@@ -0,0 +1,127 @@
+# ./FuzzingHarness/workerPool.py
+import logging
+import os
+import queue
+import threading
+from ExtensionFuzzerCommunication.extensionFuzzerCommunicator import ExtensionFuzzerCommunicator
+
+class WorkerPool:
+    """
+    Runs several isolated TsExtensionFuzzer sessions side by side.
+    Every worker owns a communicator port, or a session on a shared communicator when one is passed in,
+    and its fuzzers get their own workdir, extensions dir and user-data dir.
+    code-gui starts each VS Code under its own Xvfb display (xvfb-run -a), so workers never share a window.
+    """
+    def __init__(self, numWorkers, fuzzerFactory, host='127.0.0.1', basePort=5001, transport="flask", socketDir=None, sharedCommunicator=None):
+        self.numWorkers = numWorkers
+        self.fuzzerFactory = fuzzerFactory
+        self.communicators: list = []
+        self.sidecarFuzzers: dict[int, object] = {}
+        self.activeFuzzers: list = []
+        self.sharedCommunicator = sharedCommunicator
+        self._lock = threading.Lock()
+
+        if sharedCommunicator is not None:
+            # One server, one session per worker; the harness picks its session with FUZZ_SESSION
+            self.communicators = [sharedCommunicator.session(f"worker-{workerId}") for workerId in range(numWorkers)]
+            logging.info(f"Worker pool started with {numWorkers} workers sharing {sharedCommunicator.address()}")
+            return
+
+        for workerId in range(numWorkers):
+            port = basePort + workerId
+            socketPath = os.path.join(socketDir, f"fuzz-{port}.sock") if socketDir else None
+            communicator = ExtensionFuzzerCommunicator(host=host, port=port, transport=transport, socketPath=socketPath)
+            communicator.run()
+            self.communicators.append(communicator)
+        logging.info(f"Worker pool started with {numWorkers} workers on ports {basePort}-{basePort + numWorkers - 1}")
+
+    def run(self, typeScriptFilePaths, task):
+        """
+        Hands TypeScript files to idle workers until every file has been fuzzed.
+        task(fuzzer, communicator, path) runs once per file. Sidecar fuzzers are started here; a static fuzzer is
+        started by the task, after it set the file's queue.
+        """
+        pending = queue.Queue()
+        for path in typeScriptFilePaths:
+            pending.put(path)
+
+        threads = []
+        for workerId in range(self.numWorkers):
+            t = threading.Thread(target=self._work, args=(workerId, pending, task), daemon=True)
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+
+    def _work(self, workerId, pending, task):
+        communicator = self.communicators[workerId]
+        while True:
+            try:
+                path = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            logging.info(f"Worker {workerId} picked up {path}")
+            try:
+                fuzzer = self.sidecarFuzzers.get(workerId)
+                if fuzzer is not None:
+                    task(fuzzer, communicator, path)
+                    continue
+
+                fuzzer = self.fuzzerFactory(workerId, communicator)
+                if fuzzer.harnessMode == "sidecar":
+                    # Sidecar sessions stay up for every later file this worker picks up. Only a started one is kept;
+                    # after a failed start the next file gets a fresh fuzzer.
+                    self._track(fuzzer)
+                    try:
+                        fuzzer.startFuzzSession()
+                    except Exception:
+                        self._untrack(fuzzer)
+                        fuzzer.closeFuzzSession()
+                        raise
+                    self.sidecarFuzzers[workerId] = fuzzer
+                    task(fuzzer, communicator, path)
+                    continue
+
+                with fuzzer:
+                    self._track(fuzzer)
+                    try:
+                        task(fuzzer, communicator, path)
+                    finally:
+                        self._untrack(fuzzer)
+            except Exception as e:
+                logging.error(f"Worker {workerId} failed on {path}: {e}")
+
+    def _track(self, fuzzer):
+        with self._lock:
+            self.activeFuzzers.append(fuzzer)
+
+    def _untrack(self, fuzzer):
+        with self._lock:
+            if fuzzer in self.activeFuzzers:
+                self.activeFuzzers.remove(fuzzer)
+
+    def close(self):
+        """
+        Closes every open fuzz session and stops the worker communicators.
+        """
+        with self._lock:
+            fuzzers = list(self.activeFuzzers)
+            self.activeFuzzers.clear()
+        for fuzzer in fuzzers:
+            try:
+                fuzzer.closeFuzzSession()
+            except Exception:
+                pass
+        self.sidecarFuzzers.clear()
+        if self.sharedCommunicator is not None:
+            for session in self.communicators:
+                self.sharedCommunicator.closeSession(session.sessionId)
+            self.communicators.clear()
+            return
+        for communicator in self.communicators:
+            try:
+                communicator.stop()
+            except Exception:
+                pass
+        self.communicators.clear()
@@ -0,0 +1,207 @@
+# ./Logging/coverageStore.py
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import threading
+
+# file:///tmp/.../ext-fuzz-xxxx/<extension>/dist/extension.js -> dist/extension.js
+FUZZ_COPY_RE = re.compile(r"^.*?/ext-fuzz-[^/]+/[^/]+/(.*)$")
+BITS_PREFIX = "bits:"
+ID_TABLE_FILE = "coverage.ids"
+
+class CoverageStore:
+    """
+    Coverage of the input CSVs of one extension as bitsets over a persistent function ID table.
+    Script URLs are made relative to the fuzz copy, so the same function gets the same ID in every session, and
+    the table only ever grows (one JSON [path, function] pair per line, ID = line number).
+    Each row stores "bits:<hex>"; rows written before the store existed still hold a JSON dict and are read as-is.
+    Without an inputDir the ID table only lives in memory, which is enough for reading and novelty queries.
+    """
+    def __init__(self, inputDir=None):
+        self.path = os.path.join(inputDir, ID_TABLE_FILE) if inputDir else None
+        self.ids: dict[tuple[str, str], int] = {}
+        self.symbols: list[tuple[str, str]] = []
+        # Union of every bitset passed to add(), for novelty queries
+        self.seen = 0
+        self.absorbed: set[str] = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def normalizeUrl(url):
+        match = FUZZ_COPY_RE.match(url.replace("\\", "/"))
+        return match.group(1) if match else url
+
+    def encode(self, coverage):
+        """
+        Bitset of a {url: [functionName, ...]} coverage dict, interning functions not seen before.
+        """
+        bits = 0
+        new = []
+        with self._lock:
+            for url, funcs in (coverage or {}).items():
+                path = self.normalizeUrl(url)
+                for func in funcs:
+                    key = (path, func)
+                    sid = self.ids.get(key)
+                    if sid is None:
+                        sid = len(self.symbols)
+                        self.ids[key] = sid
+                        self.symbols.append(key)
+                        new.append(key)
+                    bits |= 1 << sid
+            if new:
+                self._append(new)
+        return bits
+
+    def decode(self, bits):
+        """
+        {path: [functionName, ...]} of a bitset, with paths relative to the fuzz copy.
+        """
+        coverage = {}
+        for sid in self.bitIds(bits):
+            path, func = self.symbols[sid]
+            coverage.setdefault(path, []).append(func)
+        return coverage
+
+    def toField(self, bits):
+        return f"{BITS_PREFIX}{bits:x}"
+
+    def fromField(self, field):
+        """
+        Bitset of a CSV coverage field in either the bitset or the legacy JSON format.
+        """
+        field = (field or "").strip()
+        if field.startswith(BITS_PREFIX):
+            return int(field[len(BITS_PREFIX):] or "0", 16)
+        if not field:
+            return 0
+        try:
+            return self.encode(json.loads(field))
+        except (ValueError, AttributeError):
+            logging.warning(f"Unreadable coverage field: {field[:80]}")
+            return 0
+
+    def bitIds(self, bits):
+        ids = []
+        while bits:
+            low = bits & -bits
+            ids.append(low.bit_length() - 1)
+            bits ^= low
+        return ids
+
+    def union(self, bitsets):
+        total = 0
+        for bits in bitsets:
+            total |= bits
+        return total
+
+    def novel(self, bits):
+        """
+        Bits of functions not reached by anything added so far.
+        """
+        with self._lock:
+            return bits & ~self.seen
+
+    def add(self, bits):
+        """
+        Folds bits into the seen set and returns how many functions were new.
+        """
+        with self._lock:
+            new = bits & ~self.seen
+            self.seen |= bits
+        return new.bit_count()
+
+    def absorbCsv(self, path, rows=None):
+        """
+        Adds the coverage of every row of an input CSV to the seen set, once per path. Returns the number of rows.
+        rows replaces reading the file, e.g. with ResultStore.readRows(path). Rows written later are added as they
+        are written.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self.absorbed:
+                return 0
+            self.absorbed.add(path)
+        count = 0
+        for row in self.readCsv(path) if rows is None else self.decodeRows(rows):
+            self.add(row["coverage"])
+            count += 1
+        return count
+
+    def readCsv(self, path):
+        """
+        Rows of an input CSV with coverage as a bitset.
+        """
+        if not os.path.isfile(path):
+            return
+        with open(path, "r", newline="", encoding="utf-8") as fh:
+            yield from self.decodeRows(csv.DictReader(fh))
+
+    def decodeRows(self, rows):
+        for row in rows:
+            row["coverage"] = self.fromField(row.get("coverage"))
+            yield row
+
+    def compactCsv(self, path):
+        """
+        Rewrites the coverage column of an input CSV as bitsets. Returns (bytes before, bytes after), or None for a
+        CSV without a coverage column (e.g. snippet results), which is left untouched.
+        """
+        with open(path, "r", newline="", encoding="utf-8") as fh:
+            header = next(csv.reader(fh), [])
+        if "coverage" not in header:
+            return None
+        before = os.path.getsize(path)
+        rows = list(self.readCsv(path))
+        if not rows:
+            return before, before
+        fields = list(rows[0].keys())
+        tmp = path + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as fh:
+            w = csv.DictWriter(fh, fieldnames=fields)
+            w.writeheader()
+            for row in rows:
+                w.writerow(dict(row, coverage=self.toField(row["coverage"])))
+        os.replace(tmp, path)
+        return before, os.path.getsize(path)
+
+    def _load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                path, func = json.loads(line)
+                self.ids[(path, func)] = len(self.symbols)
+                self.symbols.append((path, func))
+        logging.debug(f"Loaded {len(self.symbols)} coverage IDs from {self.path}")
+
+    def _append(self, keys):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            for key in keys:
+                fh.write(json.dumps(list(key)) + "\n")
+
+
+if __name__ == "__main__":
+    # python -m Logging.coverageStore "Logging/Inputs/<ext>" rewrites every input CSV below it in the bitset format
+    logging.basicConfig(level=logging.INFO)
+    for inputDir in sys.argv[1:]:
+        store = CoverageStore(inputDir)
+        for dirPath, _, files in os.walk(inputDir):
+            for name in files:
+                if name.endswith(".csv"):
+                    csvPath = os.path.join(dirPath, name)
+                    sizes = store.compactCsv(csvPath)
+                    if sizes is None:
+                        logging.info(f"{csvPath}: no coverage column, skipped")
+                        continue
+                    logging.info(f"{csvPath}: {sizes[0]} -> {sizes[1]} bytes")
@@ -0,0 +1,284 @@
+# ./Logging/crashBuckets.py
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from Logging.coverageStore import CoverageStore
+from Logging.resultStore import LEGACY_CSVS
+
+BUCKETS_FILE = "buckets.json"
+# "    at name (location:line:col)" or "    at location:line:col"
+FRAME_RE = re.compile(r"^\s*at (?:(?P<name>.*?) \()?(?P<loc>.*?)(?::\d+)?(?::\d+)?\)?\s*$")
+DIGITS_RE = re.compile(r"\d+")
+
+class CrashBuckets:
+    """
+    Groups error and crash traces of one extension into buckets, so triage reads one entry per distinct failure.
+    A trace is normalized to its first message line plus the top frames inside the extension: temp ext-fuzz paths
+    become paths relative to the fuzz copy, line/column suffixes and numbers in the message are dropped, and node
+    internals and harness frames (ignoreFrames) are skipped. Each bucket keeps its run count, the functions that hit
+    it and the shortest input that did as representative.
+    Per function and argument shape it also counts how many runs landed in a bucket that was already saturated
+    (seen saturation times), which weight() turns into a down-weight for the input scheduler.
+    """
+    def __init__(self, inputDir=None, saturation=20, topFrames=5, ignoreFrames=None, saveInterval=5.0):
+        self.inputDir = inputDir
+        self.path = os.path.join(inputDir, BUCKETS_FILE) if inputDir else None
+        self.saturation = saturation
+        self.topFrames = topFrames
+        self.ignoreFrames = set(ignoreFrames or ())
+        self.saveInterval = saveInterval
+        self.buckets: dict[str, dict] = {}
+        # "funcName(shape)" -> [runs, runs that landed in a saturated bucket]
+        self.shapes: dict[str, list[int]] = {}
+        self.dirty = False
+        self.lastSave = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def targetOf(self, csvPath):
+        """
+        Target a result CSV belongs to, e.g. "src/api" for Inputs/<ext>/src/api/errors.csv.
+        """
+        directory = os.path.dirname(os.path.abspath(csvPath))
+        return os.path.relpath(directory, self.inputDir).replace(os.sep, "/") if self.inputDir else directory
+
+    def normalize(self, trace):
+        lines = [line for line in (trace or "").splitlines() if line.strip()]
+        if not lines:
+            return ""
+        message = DIGITS_RE.sub("N", lines[0].strip())
+        frames = []
+        for line in lines[1:]:
+            match = FRAME_RE.match(line)
+            if match is None:
+                continue
+            name, loc = match.group("name") or "<anon>", match.group("loc")
+            if loc.startswith("node:") or name in self.ignoreFrames:
+                continue
+            frames.append(f"{name} ({CoverageStore.normalizeUrl(loc)})")
+            if len(frames) >= self.topFrames:
+                break
+        return "\n".join([message] + frames)
+
+    def bucketOf(self, trace):
+        """
+        (bucket ID, normalized signature) of a trace.
+        """
+        signature = self.normalize(trace)
+        return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:12], signature
+
+    @staticmethod
+    def argShape(args):
+        """
+        JavaScript type of each argument literal, e.g. ["string", "undefined"].
+        """
+        shape = []
+        for arg in args or []:
+            try:
+                value = json.loads(arg) if isinstance(arg, str) else arg
+            except ValueError:
+                shape.append("undefined" if arg == "undefined" else "number" if arg in ("NaN", "Infinity", "-Infinity") else "expr")
+                continue
+            if value is None:
+                shape.append("null")
+            elif isinstance(value, bool):
+                shape.append("boolean")
+            elif isinstance(value, (int, float)):
+                shape.append("number")
+            elif isinstance(value, str):
+                shape.append("string")
+            elif isinstance(value, list):
+                shape.append("array")
+            else:
+                shape.append("object")
+        return shape
+
+    def shapeKey(self, funcName, args):
+        return f"{funcName}({','.join(self.argShape(args))})"
+
+    def observe(self, funcName, args, trace=None, target=None):
+        """
+        Records one run. trace is the error text, or None for a clean run. Returns the bucket ID, or None if clean.
+        """
+        key = self.shapeKey(funcName, args)
+        with self._lock:
+            shape = self.shapes.setdefault(key, [0, 0])
+            shape[0] += 1
+            self.dirty = True
+            if not trace:
+                return None
+            bucketId, signature = self.bucketOf(trace)
+            bucket = self.buckets.get(bucketId)
+            if bucket is None:
+                bucket = self.buckets[bucketId] = {"signature": signature, "count": 0, "funcs": {}, "representative": None}
+                logging.info(f"New crash bucket {bucketId}: {signature.splitlines()[0]}")
+            if bucket["count"] >= self.saturation:
+                shape[1] += 1
+            bucket["count"] += 1
+            bucket["funcs"][funcName] = bucket["funcs"].get(funcName, 0) + 1
+            representative = {"target": target, "funcName": funcName, "args": list(args or []), "error": trace}
+            current = bucket["representative"]
+            if current is None or len(json.dumps(representative["args"])) < len(json.dumps(current["args"])):
+                bucket["representative"] = representative
+        if time.monotonic() - self.lastSave >= self.saveInterval:
+            self.save()
+        return bucketId
+
+    def weight(self, funcName, args, floor=0.05, minRuns=10):
+        """
+        Scheduling weight in [floor, 1] of an input: 1 until its function and argument shape ran minRuns times,
+        then the share of those runs that did not land in a saturated bucket.
+        """
+        with self._lock:
+            runs, saturated = self.shapes.get(self.shapeKey(funcName, args), (0, 0))
+        if runs < minRuns:
+            return 1.0
+        return max(floor, 1 - saturated / runs)
+
+    def unminimized(self, target):
+        """
+        (bucket ID, representative) of the buckets whose representative came from target and was not minimized yet.
+        Process crashes without an input to replay are left out.
+        """
+        with self._lock:
+            return [
+                (bucketId, dict(bucket["representative"])) for bucketId, bucket in self.buckets.items()
+                if bucket["representative"] and bucket["representative"]["target"] == target
+                and "minimized" not in bucket and not bucket["representative"]["funcName"].startswith("<")
+            ]
+
+    def markMinimized(self, bucketId, args):
+        """
+        Records the minimized arguments of a bucket's representative, or None if it did not reproduce.
+        """
+        with self._lock:
+            self.buckets[bucketId]["minimized"] = args
+            self.dirty = True
+
+    def isSaturated(self, bucketId):
+        bucket = self.buckets.get(bucketId)
+        return bucket is not None and bucket["count"] >= self.saturation
+
+    def summary(self, limit=None):
+        """
+        Buckets ordered by run count, each as {"id", "count", "signature", "funcs", "representative"}.
+        """
+        with self._lock:
+            ordered = sorted(self.buckets.items(), key=lambda item: -item[1]["count"])
+        return [dict(bucket, id=bucketId) for bucketId, bucket in ordered[:limit]]
+
+    def rebuild(self, resultStore=None):
+        """
+        Buckets every recorded TypeScript result from scratch, from the ResultStore or the CSV tree under inputDir.
+        Buckets that come back keep their minimized reproducer.
+        """
+        with self._lock:
+            minimized = {bucketId: b["minimized"] for bucketId, b in self.buckets.items() if "minimized" in b}
+            self.buckets.clear()
+            self.shapes.clear()
+            self.dirty = True
+        runs = 0
+        for target, rows in self._recordedRows(resultStore):
+            for row in rows:
+                try:
+                    args = json.loads(row.get("args") or "[]")
+                except ValueError:
+                    continue
+                self.observe(row.get("funcName"), args, row.get("error") or None, target)
+                runs += 1
+        with self._lock:
+            for bucketId, args in minimized.items():
+                if bucketId in self.buckets:
+                    self.buckets[bucketId]["minimized"] = args
+        self.save()
+        logging.info(f"Bucketed {runs} recorded runs into {len(self.buckets)} crash buckets")
+        return runs
+
+    def save(self):
+        with self._lock:
+            self.lastSave = time.monotonic()
+            if not self.path or not self.dirty:
+                return
+            self.dirty = False
+            state = {"saturation": self.saturation, "buckets": self.buckets, "shapes": self.shapes}
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(state, fh)
+            os.replace(tmp, self.path)
+
+    def _recordedRows(self, resultStore):
+        """
+        Yields (target, dict rows) of every TypeScript result CSV, or of its rows in the store.
+        """
+        if resultStore is not None:
+            for target, outcomes in resultStore.summary().items():
+                for outcome in outcomes:
+                    legacy = LEGACY_CSVS.get(("ts", outcome))
+                    if legacy:
+                        yield target, resultStore.readRows(os.path.join(resultStore.inputDir, *target.split("/"), legacy))
+            return
+        if not self.inputDir:
+            return
+        names = {LEGACY_CSVS[("ts", outcome)] for outcome in ("clean", "error", "crash")}
+        for dirPath, _, files in os.walk(self.inputDir):
+            for name in files:
+                if name in names:
+                    target = os.path.relpath(dirPath, self.inputDir).replace(os.sep, "/")
+                    with open(os.path.join(dirPath, name), newline="", encoding="utf-8") as fh:
+                        reader = csv.DictReader(fh)
+                        # Snippet results use the same file names (Clean/clean.csv) with their own columns
+                        if not {"funcName", "args"} <= set(reader.fieldnames or ()):
+                            continue
+                        yield target, list(reader)
+
+    def _load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            logging.warning(f"Unreadable {self.path}; crash buckets start empty")
+            return
+        self.buckets = state.get("buckets", {})
+        self.shapes = state.get("shapes", {})
+        logging.debug(f"Loaded {len(self.buckets)} crash buckets from {self.path}")
+
+
+if __name__ == "__main__":
+    # python -m Logging.crashBuckets "Logging/Inputs/<ext>" [limit] lists the saved buckets;
+    # --rebuild first re-buckets every recorded result from the extension's result store (or CSVs with --csv)
+    import argparse
+    from FuzzingHarness.tsExtensionFuzzer import HARNESS_FUNCS
+    from Logging.resultStore import ResultStore, STORE_FILE
+    parser = argparse.ArgumentParser()
+    parser.add_argument("inputDir")
+    parser.add_argument("limit", type=int, nargs="?", default=20)
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--csv", action="store_true")
+    cli = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    buckets = CrashBuckets(cli.inputDir, ignoreFrames=HARNESS_FUNCS)
+    if cli.rebuild:
+        store = None
+        if not cli.csv:
+            if not os.path.isfile(os.path.join(cli.inputDir, STORE_FILE)):
+                sys.exit(f"No {STORE_FILE} in {cli.inputDir}; pass --csv to rebuild from the CSV tree")
+            store = ResultStore(cli.inputDir)
+        try:
+            buckets.rebuild(store)
+        finally:
+            if store is not None:
+                store.close()
+    if not buckets.buckets:
+        logging.info(f"No crash buckets saved in {cli.inputDir}; pass --rebuild to bucket the recorded results")
+    for bucket in buckets.summary(cli.limit):
+        rep = bucket["representative"] or {}
+        print(f"{bucket['id']}  {bucket['count']:>6}  {bucket['signature'].splitlines()[0]}")
+        print(f"    {rep.get('target')}: {rep.get('funcName')}({', '.join(map(str, rep.get('args', [])))})")
@@ -16,11 +16,14 @@ class DocumentCreator():
         self.logDir = None
         self.backupDir = None
         self.inputDir = None
+        self.cacheDir = None
         self.rootPath = None
         self.activeExtension = None
         self.singleCrashesPath = None
         self.multiCrashesPath = None
         self.cleanPath = None
+        # When set, snippet results go to the extension's ResultStore instead of the CSVs
+        self.resultStore = None
 
     def getRootPath(self):
         """
@@ -75,6 +78,8 @@ class DocumentCreator():
         self.backupDir = backupsPath
         inputPath = os.path.join(scriptRoot, "Inputs", folderName)
         self.inputDir = inputPath
+        cachePath = os.path.join(scriptRoot, "Cache", folderName)
+        self.cacheDir = cachePath
 
         try:
             os.makedirs(logsPath, exist_ok=True)
@@ -85,6 +90,9 @@ class DocumentCreator():
 
             os.makedirs(inputPath, exist_ok=True)
             print(f"Created/Verified inputs directory: {inputPath}")
+
+            os.makedirs(cachePath, exist_ok=True)
+            print(f"Created/Verified cache directory: {cachePath}")
             
         except Exception as e:
             print(f"Failed to create log/backup directories: {e}")
@@ -152,6 +160,15 @@ class DocumentCreator():
         Self-explanatory
         """
         return self.logDir, self.backupDir
+
+    def setResultStore(self, resultStore):
+        self.resultStore = resultStore
+
+    def getCacheDir(self):
+        """
+        Directory holding compiled fuzz copies and other build artifacts reused across sessions.
+        """
+        return self.cacheDir
     
     def getExtensionPathInfo(self):
         '''
@@ -277,6 +294,9 @@ class DocumentCreator():
         Writes to singular snippet crash CSV.
         """
         crashFile = os.path.join(self.singleCrashesPath, "crashes.csv")
+        if self.resultStore is not None:
+            self.resultStore.addRows(crashFile, [muts[x]])
+            return
         fileExists = os.path.isfile(crashFile)
 
         with open(crashFile, mode='a', newline='', encoding='utf-8') as csvfile:
@@ -292,6 +312,9 @@ class DocumentCreator():
         Writes to clean CSV.
         """
         cleanFile = os.path.join(self.cleanPath, "clean.csv")
+        if self.resultStore is not None:
+            self.resultStore.addRows(cleanFile, [muts[x]])
+            return
         fileExists = os.path.isfile(cleanFile)
 
         with open(cleanFile, mode='a', newline='', encoding='utf-8') as csvfile:
@@ -305,6 +328,9 @@ class DocumentCreator():
         Writes to multiple snippet crash CSV.
         """
         multiFile = os.path.join(self.multiCrashesPath, "multiCrashes.csv")
+        if self.resultStore is not None:
+            self.resultStore.addRows(multiFile, [muts[x]])
+            return
         fileExists = os.path.isfile(multiFile)
 
         with open(multiFile, mode='a', newline='', encoding='utf-8') as csvfile:
@@ -0,0 +1,414 @@
+# ./Logging/resultStore.py
+import csv
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+
+STORE_FILE = "results.sqlite3"
+# Queued by flush() to make the writer commit at once
+FLUSH = "flush"
+
+# Where each (kind, outcome) lived in the CSV tree, relative to the target's input directory
+LEGACY_CSVS: dict[tuple[str, str], str] = {
+    ("ts", "clean"): "clean.csv",
+    ("ts", "error"): "errors.csv",
+    ("ts", "crash"): "crashes.csv",
+    ("snippet", "single"): os.path.join("Crashes", "Single", "crashes.csv"),
+    ("snippet", "multi"): os.path.join("Crashes", "Multi", "multiCrashes.csv"),
+    ("snippet", "clean"): os.path.join("Clean", "clean.csv"),
+}
+HEADERS: dict[str, list[str]] = {
+    "ts": ["funcName", "args", "coverage", "error"],
+    "snippet": ["Line Num", "Original Line", "Mutated Line"],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS targets(
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    UNIQUE(path, kind)
+);
+CREATE TABLE IF NOT EXISTS cases(
+    id INTEGER PRIMARY KEY,
+    target_id INTEGER NOT NULL REFERENCES targets(id),
+    func TEXT NOT NULL,
+    args TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    UNIQUE(target_id, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS cases_func ON cases(target_id, func);
+CREATE TABLE IF NOT EXISTS coverage(id INTEGER PRIMARY KEY, field TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS traces(id INTEGER PRIMARY KEY, hash TEXT NOT NULL UNIQUE, text TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS outcomes(
+    id INTEGER PRIMARY KEY,
+    case_id INTEGER NOT NULL REFERENCES cases(id),
+    outcome TEXT NOT NULL,
+    coverage_id INTEGER REFERENCES coverage(id),
+    trace_id INTEGER REFERENCES traces(id),
+    recorded REAL NOT NULL,
+    source TEXT,
+    source_row INTEGER
+);
+CREATE INDEX IF NOT EXISTS outcomes_case ON outcomes(case_id);
+CREATE INDEX IF NOT EXISTS outcomes_outcome ON outcomes(outcome, case_id);
+"""
+
+class ResultStore:
+    """
+    All results of one extension in a single SQLite database (WAL mode) under its Inputs directory.
+    Writers keep addressing results by the CSV they used to append to, e.g. Inputs/<ext>/src/api/errors.csv;
+    the store turns that into a target ("src/api"), a kind and an outcome. Distinct inputs live in cases, indexed by
+    target, function and fingerprint; every run of one is a row in outcomes, with coverage and stack traces interned.
+    Rows are queued and written by one thread that commits a whole batch per transaction (group commit).
+    Queries flush the queue first, so they always see every row added before them.
+    exportCsv rebuilds the old CSV tree; CSVs found when the store is first created are imported. A target is a
+    path and a kind, so a snippet and a TS file at the same path never share cases. An imported row is skipped when
+    the store already holds as many runs of that case with the same outcome, coverage and trace as the CSV has up to
+    that row, so importing the same tree again, or one exportCsv wrote, adds nothing.
+    """
+    def __init__(self, inputDir, flushInterval=0.25, batchSize=512):
+        self.inputDir = os.path.abspath(inputDir)
+        self.path = os.path.join(self.inputDir, STORE_FILE)
+        self.flushInterval = flushInterval
+        self.batchSize = batchSize
+        os.makedirs(self.inputDir, exist_ok=True)
+        self._local = threading.local()
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        # Every queued batch gets the next sequence number; the writer advances _committed once it is written,
+        # so queries only wait for the writer when rows they must see are still queued
+        self._seqCondition = threading.Condition()
+        self._queued = 0
+        self._committed = 0
+
+        conn = self._connect()
+        self._migrateTargets(conn)
+        conn.executescript(SCHEMA)
+        # Stores created before imports were tracked per row get the columns added
+        columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(outcomes)")}
+        if "source" not in columns:
+            conn.execute("ALTER TABLE outcomes ADD COLUMN source TEXT")
+            conn.execute("ALTER TABLE outcomes ADD COLUMN source_row INTEGER")
+        # Live results have no source and never collide; an imported CSV row is only stored once
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS outcomes_source ON outcomes(case_id, source, source_row)")
+        imported = conn.execute("SELECT value FROM meta WHERE key = 'imported'").fetchone()
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._writeLoop, name="result-store", daemon=True)
+        self._writer.start()
+        if imported is None:
+            self.importCsv()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('imported', '1')")
+
+    @staticmethod
+    def _migrateTargets(conn):
+        """
+        Stores created before targets were keyed on (path, kind) had path alone unique; the table is rebuilt in place.
+        """
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'targets'").fetchone()
+        if row is None or "UNIQUE(path, kind)" in row[0]:
+            return
+        # Ids are kept, so cases still point at their targets. Foreign keys only switch off outside a transaction.
+        conn.execute("PRAGMA foreign_keys=OFF")
+        with conn:
+            conn.execute(
+                "CREATE TABLE targets_new("
+                "id INTEGER PRIMARY KEY, path TEXT NOT NULL, kind TEXT NOT NULL, UNIQUE(path, kind))"
+            )
+            conn.execute("INSERT INTO targets_new(id, path, kind) SELECT id, path, kind FROM targets")
+            conn.execute("DROP TABLE targets")
+            conn.execute("ALTER TABLE targets_new RENAME TO targets")
+        conn.execute("PRAGMA foreign_keys=ON")
+        logging.info("Migrated result store targets to (path, kind) keys")
+
+    @staticmethod
+    def fingerprint(func, args):
+        """
+        Stable hash of an input: function name (or snippet line) plus its arguments in canonical JSON.
+        """
+        canonical = json.dumps([func, args], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    def locate(self, csvPath):
+        """
+        (target, kind, outcome) of a legacy CSV path under inputDir.
+        """
+        rel = os.path.relpath(os.path.abspath(csvPath), self.inputDir)
+        # Longest first, so Clean/clean.csv of a snippet is not taken for a TS file's clean.csv
+        for (kind, outcome), legacy in sorted(LEGACY_CSVS.items(), key=lambda item: -len(item[1])):
+            if rel == legacy or rel.endswith(os.sep + legacy):
+                target = rel[:-len(legacy)].rstrip(os.sep)
+                return target.replace(os.sep, "/"), kind, outcome
+        raise ValueError(f"{csvPath} is not a result CSV under {self.inputDir}")
+
+    def addRows(self, csvPath, rows, sourceRows=None):
+        """
+        Queues rows shaped like the legacy CSV's (without header). Returns at once; see flush().
+        sourceRows gives each row's number in csvPath when the rows are imported from it; a row already imported from
+        the same place is skipped.
+        """
+        if not rows:
+            return
+        target, kind, outcome = self.locate(csvPath)
+        source = os.path.relpath(os.path.abspath(csvPath), self.inputDir).replace(os.sep, "/") if sourceRows else None
+        batch = (target, kind, outcome, [list(row) for row in rows], time.time(), source, sourceRows)
+        with self._seqCondition:
+            # Queued under the lock, so batches reach the writer in sequence order
+            self._queued += 1
+            self._queue.put((self._queued, batch))
+
+    def flush(self, timeout=None):
+        """
+        Blocks until everything queued so far is committed.
+        """
+        with self._seqCondition:
+            target = self._queued
+            if self._committed >= target:
+                return
+            # Wakes the writer so it commits now instead of after flushInterval
+            self._queue.put(FLUSH)
+            self._seqCondition.wait_for(lambda: self._committed >= target, timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+
+    def hasTested(self, csvPath, func, args):
+        """
+        Whether the input was already run for the target csvPath belongs to, whatever its outcome.
+        """
+        target, kind, _ = self.locate(csvPath)
+        self.flush()
+        row = self._connect().execute(
+            "SELECT 1 FROM cases c JOIN targets t ON t.id = c.target_id "
+            "WHERE t.path = ? AND t.kind = ? AND c.fingerprint = ?",
+            (target, kind, self.fingerprint(func, args)),
+        ).fetchone()
+        return row is not None
+
+    def testedFingerprints(self, csvPath):
+        target, kind, _ = self.locate(csvPath)
+        self.flush()
+        rows = self._connect().execute(
+            "SELECT c.fingerprint FROM cases c JOIN targets t ON t.id = c.target_id WHERE t.path = ? AND t.kind = ?",
+            (target, kind),
+        )
+        return {fp for (fp,) in rows}
+
+    def readRows(self, csvPath, func=None):
+        """
+        Dict rows with the legacy CSV's header, in the order they were recorded, optionally for one function only.
+        """
+        target, kind, outcome = self.locate(csvPath)
+        sql = (
+            "SELECT c.func, c.args, cov.field, tr.text FROM outcomes o "
+            "JOIN cases c ON c.id = o.case_id JOIN targets t ON t.id = c.target_id "
+            "LEFT JOIN coverage cov ON cov.id = o.coverage_id LEFT JOIN traces tr ON tr.id = o.trace_id "
+            "WHERE t.path = ? AND t.kind = ? AND o.outcome = ?"
+        )
+        # A snippet target and a TS target can share a path and outcome name ("clean"), but never a kind
+        params = [target, kind, outcome]
+        if func is not None:
+            sql += " AND c.func = ?"
+            params.append(func)
+        header = HEADERS[kind]
+        self.flush()
+        for func_, args, coverage, trace in self._connect().execute(sql + " ORDER BY o.id", params):
+            yield dict(zip(header, self._legacyRow(kind, func_, args, coverage, trace)))
+
+    def summary(self):
+        """
+        {target: {outcome: runs}} over the whole store.
+        """
+        self.flush()
+        rows = self._connect().execute(
+            "SELECT t.path, o.outcome, COUNT(*) FROM outcomes o JOIN cases c ON c.id = o.case_id "
+            "JOIN targets t ON t.id = c.target_id GROUP BY t.path, o.outcome"
+        )
+        summary: dict[str, dict[str, int]] = {}
+        for target, outcome, count in rows:
+            summary.setdefault(target, {})[outcome] = count
+        return summary
+
+    def exportCsv(self, outDir=None):
+        """
+        Writes the legacy CSV tree under outDir (default: inputDir). Returns the number of rows written.
+        """
+        self.flush()
+        outDir = outDir or self.inputDir
+        conn = self._connect()
+        written = 0
+        for (kind, outcome), legacy in LEGACY_CSVS.items():
+            targets = conn.execute(
+                "SELECT DISTINCT t.path FROM targets t JOIN cases c ON c.target_id = t.id "
+                "JOIN outcomes o ON o.case_id = c.id WHERE t.kind = ? AND o.outcome = ?", (kind, outcome)
+            ).fetchall()
+            for (target,) in targets:
+                path = os.path.join(outDir, *target.split("/"), legacy)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", newline="", encoding="utf-8") as fh:
+                    w = csv.writer(fh)
+                    w.writerow(HEADERS[kind])
+                    for row in self.readRows(os.path.join(self.inputDir, *target.split("/"), legacy)):
+                        w.writerow(row.values())
+                        written += 1
+        return written
+
+    def importCsv(self):
+        """
+        Loads every legacy CSV under inputDir into the store.
+        """
+        imported = 0
+        csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+        for dirPath, _, files in os.walk(self.inputDir):
+            for name in files:
+                if not name.endswith(".csv"):
+                    continue
+                path = os.path.join(dirPath, name)
+                try:
+                    self.locate(path)
+                except ValueError:
+                    continue
+                with open(path, newline="", encoding="utf-8") as fh:
+                    reader = csv.reader(fh)
+                    next(reader, None)
+                    numbered = [(number, row) for number, row in enumerate(reader, 1) if row]
+                if numbered:
+                    self.addRows(path, [row for _, row in numbered], sourceRows=[number for number, _ in numbered])
+                imported += len(numbered)
+        self.flush()
+        if imported:
+            logging.info(f"Imported {imported} CSV rows into {self.path}")
+        return imported
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL keeps the database consistent on a crash; only the last commits may be lost
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _writeLoop(self):
+        conn = self._connect()
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            if isinstance(item, tuple):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flushInterval
+
+            rows = sum(len(batch[3]) for _, batch in pending)
+            if item is None or item is False or item is FLUSH or rows >= self.batchSize:
+                if pending:
+                    try:
+                        with conn:
+                            for _, batch in pending:
+                                self._insert(conn, *batch)
+                    except sqlite3.Error as e:
+                        logging.error(f"Could not write {rows} results to {self.path}: {e}")
+                    # Failed batches are logged and dropped; either way nobody waits for them any longer
+                    with self._seqCondition:
+                        self._committed = max(self._committed, pending[-1][0])
+                        self._seqCondition.notify_all()
+                pending = []
+                deadline = None
+            if item is None:
+                conn.close()
+                return
+
+    def _insert(self, conn, target, kind, outcome, rows, recorded, source=None, sourceRows=None):
+        conn.execute("INSERT OR IGNORE INTO targets(path, kind) VALUES (?, ?)", (target, kind))
+        (targetId,) = conn.execute("SELECT id FROM targets WHERE path = ? AND kind = ?", (target, kind)).fetchone()
+        # Occurrences of each (case, coverage, trace) in an imported CSV so far
+        seen = Counter()
+        for i, row in enumerate(rows):
+            func, args, coverage, trace = self._splitRow(kind, row)
+            fp = self.fingerprint(func, args)
+            conn.execute(
+                "INSERT OR IGNORE INTO cases(target_id, func, args, fingerprint) VALUES (?, ?, ?, ?)",
+                (targetId, func, json.dumps(args, ensure_ascii=False), fp),
+            )
+            (caseId,) = conn.execute(
+                "SELECT id FROM cases WHERE target_id = ? AND fingerprint = ?", (targetId, fp)
+            ).fetchone()
+            coverageId = traceId = None
+            if coverage:
+                conn.execute("INSERT OR IGNORE INTO coverage(field) VALUES (?)", (coverage,))
+                (coverageId,) = conn.execute("SELECT id FROM coverage WHERE field = ?", (coverage,)).fetchone()
+            if trace:
+                traceHash = hashlib.sha1(trace.encode("utf-8")).hexdigest()
+                conn.execute("INSERT OR IGNORE INTO traces(hash, text) VALUES (?, ?)", (traceHash, trace))
+                (traceId,) = conn.execute("SELECT id FROM traces WHERE hash = ?", (traceHash,)).fetchone()
+            if source is not None:
+                # Live runs have no source, so an exported tree would otherwise come back as a second copy of them
+                key = (caseId, coverageId, traceId)
+                seen[key] += 1
+                (stored,) = conn.execute(
+                    "SELECT COUNT(*) FROM outcomes "
+                    "WHERE case_id = ? AND outcome = ? AND coverage_id IS ? AND trace_id IS ?",
+                    (caseId, outcome, coverageId, traceId),
+                ).fetchone()
+                if stored >= seen[key]:
+                    continue
+            conn.execute(
+                "INSERT OR IGNORE INTO outcomes(case_id, outcome, coverage_id, trace_id, recorded, source, source_row) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (caseId, outcome, coverageId, traceId, recorded, source, sourceRows[i] if sourceRows else None),
+            )
+
+    def _splitRow(self, kind, row):
+        """
+        (func, args, coverage field, trace) of a legacy CSV row. Snippet mutants keep their line number as func.
+        """
+        row = list(row) + [""] * (len(HEADERS[kind]) - len(row))
+        if kind == "snippet":
+            return str(row[0]), [row[1], row[2]], None, None
+        try:
+            args = json.loads(row[1]) if isinstance(row[1], str) else row[1]
+        except ValueError:
+            args = row[1]
+        return row[0], args, row[2] or None, row[3] or None
+
+    def _legacyRow(self, kind, func, args, coverage, trace):
+        args = json.loads(args)
+        if kind == "snippet":
+            return [func, args[0], args[1]]
+        return [func, json.dumps(args), coverage or "", trace or ""]
+
+
+if __name__ == "__main__":
+    # python -m Logging.resultStore export "Logging/Inputs/<ext>" [outDir] writes the CSV tree back out
+    logging.basicConfig(level=logging.INFO)
+    command, inputDir = sys.argv[1], sys.argv[2]
+    store = ResultStore(inputDir)
+    if command == "export":
+        logging.info(f"Exported {store.exportCsv(sys.argv[3] if len(sys.argv) > 3 else None)} rows")
+    elif command == "import":
+        logging.info(f"Imported {store.importCsv()} rows")
+    elif command == "summary":
+        print(json.dumps(store.summary(), indent=2))
+    store.close()
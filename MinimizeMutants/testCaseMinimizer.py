@@ -0,0 +1,160 @@
+# ./MinimizeMutants/testCaseMinimizer.py
+import difflib
+import json
+import logging
+import math
+import os
+
+MINIMIZED_FILE = "minimized.jsonl"
+# Replacements tried for a whole argument before shrinking it, simplest first
+SIMPLE_LITERALS = ["undefined", "null", "0", '""', "[]", "{}", "false"]
+
+class TestCaseMinimizer:
+    """
+    Delta-debugging minimizer for crashing TypeScript inputs and snippet mutations.
+    replay(candidates) runs a list of candidates (argument lists, or mutated snippet lines) and returns one result per
+    candidate; signature(result) says which failure a result is (e.g. its crash bucket), or None if it did not fail.
+    A candidate is kept only if it is smaller and reproduces the original's signature. Candidates of one step are
+    replayed together, batchSize per call, so a batch costs one harness run instead of one launch per candidate.
+    """
+    def __init__(self, replay, signature, batchSize=32, maxReplays=2000):
+        self.replay = replay
+        self.signature = signature
+        self.batchSize = batchSize
+        self.maxReplays = maxReplays
+        self.replays = 0
+        self.batches = 0
+
+    def reproduces(self, candidate):
+        """
+        Signature of candidate when replayed on its own, or None.
+        """
+        results = self._run([candidate])
+        return self.signature(results[0]) if results and results[0] is not None else None
+
+    def firstReproducing(self, candidates, target):
+        """
+        First candidate, in the given order, whose replay reproduces target, or None.
+        Stops after the first batch with a hit, so later batches are only run when earlier ones all passed.
+        """
+        for start in range(0, len(candidates), self.batchSize):
+            if self.replays >= self.maxReplays:
+                return None
+            batch = candidates[start:start + self.batchSize]
+            for candidate, result in zip(batch, self._run(batch)):
+                if result is not None and self.signature(result) == target:
+                    return candidate
+        return None
+
+    def ddmin(self, items, build, target):
+        """
+        Smallest sub-list of items (as found by ddmin) whose build(subList) still reproduces target.
+        """
+        items = list(items)
+        if items and self.firstReproducing([build([])], target) is not None:
+            return []
+        n = 2
+        while len(items) >= 2 and self.replays < self.maxReplays:
+            chunk = math.ceil(len(items) / n)
+            subsets = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+            complements = [items[:i] + items[i + chunk:] for i in range(0, len(items), chunk)]
+            candidates = [c for c in subsets + complements if 0 < len(c) < len(items)]
+            built = [build(c) for c in candidates]
+            found = self.firstReproducing(built, target)
+            if found is not None:
+                reduced = candidates[built.index(found)]
+                n = 2 if reduced in subsets else max(n - 1, 2)
+                items = reduced
+            elif n >= len(items):
+                break
+            else:
+                n = min(len(items), n * 2)
+        return items
+
+    def minimizeArgs(self, args, target):
+        """
+        Shrinks a list of argument literals that fails with target: whole arguments are replaced by simple literals,
+        then arrays, objects and strings lose elements, keys and characters, and numbers move towards zero.
+        """
+        args = list(args)
+        progress = True
+        while progress and self.replays < self.maxReplays:
+            progress = False
+            candidates = [
+                args[:i] + [literal] + args[i + 1:]
+                for i in range(len(args)) for literal in SIMPLE_LITERALS
+                if len(literal) < len(args[i])
+            ]
+            candidates.sort(key=self.size)
+            found = self.firstReproducing(candidates, target)
+            if found is not None:
+                args, progress = found, True
+                continue
+            for i in range(len(args)):
+                shrunk = self.shrinkArg(args, i, target)
+                if shrunk is not None and self.size(shrunk) < self.size(args):
+                    args, progress = shrunk, True
+        return args
+
+    def shrinkArg(self, args, i, target):
+        try:
+            value = json.loads(args[i])
+        except (ValueError, TypeError):
+            return None
+
+        def withValue(v):
+            return args[:i] + [json.dumps(v)] + args[i + 1:]
+
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, list):
+            return withValue(self.ddmin(value, withValue, target))
+        if isinstance(value, dict):
+            keys = self.ddmin(list(value), lambda ks: withValue({k: value[k] for k in ks}), target)
+            return withValue({k: value[k] for k in keys})
+        if isinstance(value, str):
+            return withValue("".join(self.ddmin(list(value), lambda cs: withValue("".join(cs)), target)))
+        if isinstance(value, (int, float)) and math.isfinite(value) and value not in (0, 1):
+            candidates = [withValue(v) for v in (0, 1, int(value / 2), int(value)) if v != value]
+            return self.firstReproducing(sorted(candidates, key=self.size), target)
+        return None
+
+    def minimizeLine(self, original, mutated, target):
+        """
+        Smallest set of the edits that turned original into mutated that still fails with target, applied to original.
+        """
+        edits = [op for op in difflib.SequenceMatcher(None, original, mutated, autojunk=False).get_opcodes() if op[0] != "equal"]
+        keep = self.ddmin(list(range(len(edits))), lambda subset: self.applyEdits(original, mutated, edits, subset), target)
+        return self.applyEdits(original, mutated, edits, keep)
+
+    @staticmethod
+    def applyEdits(original, mutated, edits, subset):
+        out = []
+        pos = 0
+        for k in sorted(subset):
+            _, i1, i2, j1, j2 = edits[k]
+            out.append(original[pos:i1])
+            out.append(mutated[j1:j2])
+            pos = i2
+        out.append(original[pos:])
+        return "".join(out)
+
+    @staticmethod
+    def size(candidate):
+        return len(json.dumps(candidate))
+
+    @staticmethod
+    def saveReproducer(directory, entry):
+        """
+        Appends a minimized reproducer to minimized.jsonl next to the CSV its original was recorded in.
+        """
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, MINIMIZED_FILE), "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+
+    def _run(self, batch):
+        self.replays += len(batch)
+        self.batches += 1
+        results = self.replay(batch)
+        logging.debug(f"Replayed batch {self.batches} of {len(batch)} candidates")
+        return results
@@ -11,11 +11,13 @@ class SnippetFuzzer():
     """
     Program that fuzzes desired snippet file via VS Code Extension.
     """
-    def __init__(self, filteredMuts, snippetPath, backupDir, logDirPath):
+    def __init__(self, filteredMuts, snippetPath, backupDir, logDirPath, communicator=None):
         self.filteredMuts = filteredMuts
         self.snippetPath = snippetPath
         self.backupDir = backupDir
         self.logDirPath = logDirPath
+        # Results are read from this communicator's server; without one the default port 5000 is polled
+        self.communicator = communicator
         self.outputFile = None
         logging.info("Snippet Fuzzer Initialized")
 
@@ -158,6 +160,27 @@ class SnippetFuzzer():
             logging.info("VS Code process terminated after testing snippets.")
         return status
     
+    def replayMutants(self, mutants, communicator, restore):
+        """
+        Applies and tests each (line, original, mutated) mutant on its own, restoring the snippet file with restore()
+        after each. Returns the sorted unmatched snippet keys per mutant, or None where the extension did not answer.
+        """
+        saved = self.filteredMuts
+        self.filteredMuts = list(mutants)
+        unmatched = []
+        try:
+            for idx in range(len(self.filteredMuts)):
+                self.applyMutations(idx)
+                communicator.resetLatestResult()
+                status = self.testSnippets(self.convertSnippets())
+                results = self.compareResults(status) if status is not None else None
+                unmatched.append(sorted(results["unmatched"]) if results else None)
+                communicator.resetLatestResult()
+                restore()
+        finally:
+            self.filteredMuts = saved
+        return unmatched
+
     def launch_vs_code(self):
         """
         Launches VS Code on working directory with snippets.csv and checks to see status of snippets.
@@ -175,13 +198,23 @@ class SnippetFuzzer():
             logging.info("VS Code launched successfully.")
 
             timeout = 300
-            interval = 15
-            waited = 0
+            # Server holds each request open until the extension reports, so results arrive without polling delay
+            interval = 30
+            deadline = time.monotonic() + timeout
             snippetStatus = None
             
-            while waited < timeout:
+            address = self.communicator.address() if self.communicator is not None else "http://127.0.0.1:5000"
+            while time.monotonic() < deadline:
+                wait = min(interval, deadline - time.monotonic())
+                if address.startswith("unix:"):
+                    # requests can't reach a Unix socket; the communicator runs in this process, so wait on it directly
+                    snippetStatus = self.communicator.waitForResult(timeout=wait)
+                    if snippetStatus is not None:
+                        logging.info("Received response from extension.")
+                        break
+                    continue
                 try:
-                    response = requests.get("http://127.0.0.1:5000/latest")
+                    response = requests.get(f"{address}/latest", params={"wait": wait}, timeout=wait + 5)
                     if response.status_code == 200:
                         data = response.json()
                         if data.get("result") is not None:
@@ -189,9 +222,8 @@ class SnippetFuzzer():
                             logging.info("Received response from extension via HTTP.")
                             break
                 except Exception as e:
-                    logging.error(f"Error while polling for extension result: {e}")
-                time.sleep(interval)
-                waited += interval
+                    logging.error(f"Error while waiting for extension result: {e}")
+                    time.sleep(1)
 
             if snippetStatus is None:
                 logging.error("No response received from extension within timeout period.")
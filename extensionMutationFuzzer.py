@@ -8,6 +8,7 @@ import os
 import sys
 import signal
 import atexit
+import itertools
 from Guidance.guidanceEngine import GuidanceEngine
 from Logging.createLogsAndBackups import DocumentCreator
 from CreateMutants.randomMutantCreator import RandomMutantCreator
@@ -15,7 +16,16 @@ from FilterMutants.mutantFilter import MutantFilter
 from SnippetFuzzer.snippetFuzzer import SnippetFuzzer
 from ExtensionFuzzerCommunication.extensionFuzzerCommunicator import ExtensionFuzzerCommunicator
 from CreateMutants.guidedMutantCreator import GuidedMutantCreator
-from FuzzingHarness.tsExtensionFuzzer import TsExtensionFuzzer
+from FuzzingHarness.tsExtensionFuzzer import TsExtensionFuzzer, HARNESS_FUNCS
+from MinimizeMutants.testCaseMinimizer import TestCaseMinimizer
+from FuzzingHarness.buildCache import BuildCache
+from FuzzingHarness.dependencyStore import DependencyStore
+from FuzzingHarness.workdirMaterializer import WorkdirMaterializer
+from FuzzingHarness.workerPool import WorkerPool
+from Logging.coverageStore import CoverageStore
+from Logging.resultStore import ResultStore
+from Logging.crashBuckets import CrashBuckets
+from FuzzingHarness.sourceMapIndex import SourceMapIndex
 
 def setupLogging(logMode, logDir, logFileName):
     """
@@ -50,6 +60,8 @@ def setupLogging(logMode, logDir, logFileName):
 
 activeFuzzers: list["TsExtensionFuzzer"] = []
 activeCommunicators: list[ExtensionFuzzerCommunicator] = []
+activePools: list[WorkerPool] = []
+activeStores: list[ResultStore] = []
 
 def globalCleanup():
     for f in activeFuzzers:
@@ -57,13 +69,26 @@ def globalCleanup():
             f.closeFuzzSession()
         except Exception:
             pass
+    for p in activePools:
+        try:
+            p.close()
+        except Exception:
+            pass
     for c in activeCommunicators:
         try:
             c.stop()
         except Exception:
             pass
+    # Stores close last, after every writer of results is gone
+    for s in activeStores:
+        try:
+            s.close()
+        except Exception:
+            pass
     activeFuzzers.clear()
+    activePools.clear()
     activeCommunicators.clear()
+    activeStores.clear()
 
 # run on normal interpreter exit
 atexit.register(globalCleanup)
@@ -75,6 +100,154 @@ def sigHandler(signum, frame):
 for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGQUIT):
     signal.signal(sig, sigHandler)
 
+def fuzzTypeScriptFile(fuzzer, communicator, documentCreator, typeScriptFilePath, args):
+    """
+    Creates, filters and queues inputs for one TypeScript file and records the harness results.
+    A static fuzzer is launched here, once the file's queue is set; sidecar fuzzers must already be running.
+    """
+    # Create inputs directories
+    inputTSDir, cleanCSV, errorCSV, crashCSV = documentCreator.createTypeScriptInputPath(typeScriptFilePath)
+
+    logging.info(f"Fuzzing TypeScript file at: {typeScriptFilePath}")
+
+    # Coverage of earlier sessions counts as seen, so only genuinely new functions are reported as new
+    if fuzzer.coverageStore is not None:
+        for path in (cleanCSV, errorCSV, crashCSV):
+            rows = fuzzer.resultStore.readRows(path) if fuzzer.resultStore is not None else None
+            fuzzer.coverageStore.absorbCsv(path, rows=rows)
+
+    # Initialize Mutant Creator
+    mutantCreator = None
+    if args.fuzz_type == 'random':
+        mutantCreator = RandomMutantCreator(filePath=typeScriptFilePath)
+    else:
+        # The corpus is seeded from the file's CSVs and grows from the results of this run
+        mutantCreator = GuidedMutantCreator(filePath=typeScriptFilePath,
+                                            cleanCSV=cleanCSV,
+                                            errorCSV=errorCSV,
+                                            coverageStore=fuzzer.coverageStore,
+                                            resultStore=fuzzer.resultStore,
+                                            buckets=fuzzer.buckets
+                                            )
+
+    # Initialize Mutant Filter
+    mutantFilter = MutantFilter(inputDir=inputTSDir,
+                                cleanCSV=cleanCSV,
+                                errorCSV=errorCSV,
+                                crashCSV=crashCSV,
+                                resultStore=fuzzer.resultStore,
+                                bloomBits=args.dedup_bloom_bits or None
+                                )
+
+    # Decide what files/methods to fuzz and create inputs(Can make this more robust through building out guidance engine)
+    # Inputs are generated lazily, as the harness pages through the queue
+    maxCases = args.max_tests if args.max_tests > 0 else None
+    inputs = None
+    if args.fuzz_type == 'random':
+        inputs = mutantCreator.iterInputs(maxCases)
+    else:
+        inputs = mutantCreator.guidedCreateInputs(maxCases)
+
+    # Peek at the first input so an empty source is still caught without generating the rest
+    inputs = iter(inputs)
+    first = next(inputs, None)
+    if first is None:
+        logging.warning(f"Input creator could not find inputs to create. Skipping this TS file...")
+        return
+
+    # Filter mutations
+    inputs = ((fn, args) for _, fn, args in itertools.chain([first], inputs))
+    filteredInputs = mutantFilter.iterFilterTypeScriptMutants(inputs)
+
+    # A cursor left behind means the last run died mid-queue; its in-flight case is the crash
+    cursorPath = os.path.join(inputTSDir, "queue.cursor.json")
+    fuzzer.recoverStaleCursor(cursorPath, crashCSV)
+
+    # Put test cases in queue for harness to use. Sidecar harnesses also need to know which module to load.
+    module = fuzzer.modulePathFor(typeScriptFilePath) if fuzzer.harnessMode == "sidecar" else None
+    communicator.setTestQueue(
+        ({"funcName": fn, "args": args} for fn, args in filteredInputs),
+        module=module,
+        timeBudget=args.time_budget,
+        plateau=args.plateau,
+        cursorPath=cursorPath
+    )
+
+    # A harness launched before its queue was set would page the previous file's finished queue and stop at once
+    if fuzzer.harnessMode != "sidecar":
+        fuzzer.startFuzzSession(typeScriptFilePath)
+
+    # Fuzz the TypeScript File. Guided inputs learn from every result while the queue runs.
+    if args.fuzz_type == 'guided':
+        fuzzer.setCaseObserver(mutantCreator.observe)
+    try:
+        fuzzer.runSingleFile(cleanCSV, errorCSV, crashCSV)
+    finally:
+        fuzzer.setCaseObserver(None)
+        if fuzzer.resultStore is not None:
+            fuzzer.resultStore.flush()
+
+    if args.minimize and fuzzer.buckets is not None:
+        minimizeTypeScriptCrashes(fuzzer, module, inputTSDir, cleanCSV, args)
+
+def minimizeTypeScriptCrashes(fuzzer, module, inputTSDir, cleanCSV, args):
+    """
+    Shrinks the representative input of every crash bucket this file's results opened, replaying candidates in
+    batches through the harness. Reproducers go to minimized.jsonl next to the file's CSVs.
+    """
+    buckets = fuzzer.buckets
+    for bucketId, representative in buckets.unminimized(buckets.targetOf(cleanCSV)):
+        funcName = representative["funcName"]
+        minimizer = TestCaseMinimizer(
+            replay=lambda batch: fuzzer.replayCases([{"funcName": funcName, "args": c} for c in batch], module=module),
+            signature=lambda result: buckets.bucketOf(result.get("error"))[0] if result.get("outcome") in ("error", "timeout") else None,
+            batchSize=args.minimize_batch,
+            maxReplays=args.minimize_budget
+        )
+        # Only a representative that still fails the same way is worth shrinking
+        if minimizer.reproduces(representative["args"]) != bucketId:
+            logging.info(f"Bucket {bucketId} did not reproduce from {funcName}; not minimized")
+            buckets.markMinimized(bucketId, None)
+            continue
+        minimized = minimizer.minimizeArgs(representative["args"], bucketId)
+        logging.info(f"Minimized bucket {bucketId}: {funcName}({', '.join(minimized)}) "
+                     f"after {minimizer.replays} replays in {minimizer.batches} batches")
+        buckets.markMinimized(bucketId, minimized)
+        TestCaseMinimizer.saveReproducer(inputTSDir, {
+            "bucket": bucketId,
+            "funcName": funcName,
+            "args": minimized,
+            "original": representative["args"],
+            "error": representative["error"],
+            "replays": minimizer.replays,
+            "batches": minimizer.batches
+        })
+    buckets.save()
+
+def minimizeSnippetMutant(snippetFuzz, communicator, restore, mutant, unmatched, crashDir, args):
+    """
+    Shrinks a crashing snippet mutation to the fewest of its edits that still break the same snippets.
+    Every candidate needs its own extension launch, since the snippet file holds one variant of the line at a time.
+    """
+    lineNo, originalLine, mutatedLine = mutant
+    minimizer = TestCaseMinimizer(
+        replay=lambda batch: snippetFuzz.replayMutants([(lineNo, originalLine, line) for line in batch], communicator, restore),
+        signature=lambda result: tuple(result) if result else None,
+        batchSize=1,
+        maxReplays=args.minimize_budget
+    )
+    target = tuple(sorted(unmatched))
+    minimized = minimizer.minimizeLine(originalLine, mutatedLine, target)
+    logging.info(f"Minimized snippet mutation on line {lineNo} after {minimizer.replays} launches: {minimized!r}")
+    TestCaseMinimizer.saveReproducer(crashDir, {
+        "line": lineNo,
+        "original": originalLine,
+        "mutated": minimized,
+        "unmatched": list(target),
+        "fullMutation": mutatedLine,
+        "replays": minimizer.replays
+    })
+
 def main():
     """
     Main function for main program of this fuzzer.
@@ -94,7 +267,21 @@ def main():
         type=int,
         required=False,
         default=128,
-        help='Max number of mutations performed per iteration.'
+        help='Max number of mutations performed per iteration. 0 generates inputs until --time_budget or --plateau stops the file.'
+    )
+    parser.add_argument(
+        '--time_budget',
+        type=float,
+        required=False,
+        default=None,
+        help='Seconds to keep generating inputs for each TypeScript file.'
+    )
+    parser.add_argument(
+        '--plateau',
+        type=int,
+        required=False,
+        default=None,
+        help='Stop a TypeScript file after this many consecutive inputs reach no new function.'
     )
     parser.add_argument(
         '--logging', 
@@ -137,11 +324,219 @@ def main():
         help='Keep the temporary work-dir for inspection.'
     )
     parser.set_defaults(cleanup=True)
+    parser.add_argument(
+        '--harness_mode',
+        type=str,
+        choices=['static', 'sidecar'],
+        default='static',
+        help='static compiles and launches VS Code per TypeScript file; sidecar compiles every module once and switches targets per batch.'
+    )
+    parser.add_argument(
+        '--backend',
+        type=str,
+        choices=['vscode', 'node'],
+        default='vscode',
+        help='vscode runs the harness in a VS Code window under Xvfb; node runs it headless against a stub vscode module.'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        required=False,
+        default=1,
+        help='Number of isolated VS Code instances fuzzing TypeScript files in parallel.'
+    )
+    parser.add_argument(
+        '--base_port',
+        type=int,
+        required=False,
+        default=5000,
+        help='Communicator port. Parallel workers use the ports directly after it.'
+    )
+    parser.add_argument(
+        '--transport',
+        type=str,
+        choices=['flask', 'asyncio'],
+        default='flask',
+        help='Communicator server. asyncio keeps harness connections alive and can listen on a Unix socket.'
+    )
+    parser.add_argument(
+        '--socket_dir',
+        type=str,
+        required=False,
+        default=None,
+        help='With --transport asyncio and --file_options ts, listen on Unix sockets in this directory instead of TCP ports.'
+    )
+    parser.add_argument(
+        '--shared_communicator',
+        action='store_true',
+        help='Serve every worker from the main communicator, one session each, instead of a port per worker.'
+    )
+    parser.add_argument(
+        '--wire_format',
+        type=str,
+        choices=['json', 'compact'],
+        default='json',
+        help='compact interns coverage URLs and function names once per session and sends integer IDs per case.'
+    )
+    parser.add_argument(
+        '--case_timeout',
+        type=float,
+        required=False,
+        default=10,
+        help='Seconds an async target call may take before the harness records it as a timeout.'
+    )
+    parser.add_argument(
+        '--heartbeat_timeout',
+        type=float,
+        required=False,
+        default=5,
+        help='Seconds without a harness heartbeat before the in-flight case is recorded as a hang and the harness restarted.'
+    )
+    parser.add_argument(
+        '--report_batch',
+        type=int,
+        required=False,
+        default=8,
+        help='Case results the harness buffers before streaming them to the fuzzer; smaller batches report sooner.'
+    )
+    parser.add_argument(
+        '--max_restarts',
+        type=int,
+        required=False,
+        default=3,
+        help='Harness restarts allowed per TypeScript file before the rest of its queue is abandoned.'
+    )
+    parser.add_argument(
+        '--coverage_mode',
+        choices=['off', 'function', 'block'],
+        required=False,
+        default='function',
+        help='Coverage the harness collects per case: off for raw executions per second, function for called functions, block for block ranges with counts.'
+    )
+    parser.add_argument(
+        '--coverage_store',
+        choices=['bits', 'json'],
+        required=False,
+        default='bits',
+        help='bits stores CSV coverage as bitsets over a persistent function ID table (Inputs/<ext>/coverage.ids); json keeps the raw coverage dict.'
+    )
+    parser.add_argument(
+        '--result_store',
+        choices=['sqlite', 'csv'],
+        required=False,
+        default='sqlite',
+        help='sqlite records results in one indexed database per extension (Inputs/<ext>/results.sqlite3, export with python -m Logging.resultStore export); csv appends to the per-file CSVs.'
+    )
+    parser.add_argument(
+        '--bucket_saturation',
+        type=int,
+        required=False,
+        default=20,
+        help='Runs after which a crash bucket counts as saturated; guided inputs whose function and argument shape keep landing in saturated buckets are scheduled less. List buckets with python -m Logging.crashBuckets <inputDir>.'
+    )
+    parser.add_argument(
+        '--minimize',
+        action='store_true',
+        help='Delta-debug new crashes to the smallest input that still lands in the same crash bucket (snippets: the same broken snippets). Reproducers are written to minimized.jsonl next to the CSVs.'
+    )
+    parser.add_argument(
+        '--minimize_batch',
+        type=int,
+        required=False,
+        default=32,
+        help='Minimization candidates replayed per harness run.'
+    )
+    parser.add_argument(
+        '--minimize_budget',
+        type=int,
+        required=False,
+        default=500,
+        help='Most candidates replayed while minimizing one crash.'
+    )
+    parser.add_argument(
+        '--dedup_bloom_bits',
+        type=int,
+        required=False,
+        default=0,
+        help='With --result_store csv, keep tested-input fingerprints in a Bloom filter of this many bits instead of an exact set (bounded memory, rare false skips). 0 keeps the exact set.'
+    )
+    parser.add_argument(
+        '--build_cache',
+        dest='build_cache',
+        action='store_true',
+        help='Reuse compiled fuzz copies across sessions when sources are unchanged (default).'
+    )
+    parser.add_argument(
+        '--no-build_cache',
+        dest='build_cache',
+        action='store_false',
+        help='Always copy, install and compile the extension for every session.'
+    )
+    parser.set_defaults(build_cache=True)
+    parser.add_argument(
+        '--dep_store',
+        dest='dep_store',
+        action='store_true',
+        help='Install node_modules once per lockfile and link it into every fuzz copy (default).'
+    )
+    parser.add_argument(
+        '--no-dep_store',
+        dest='dep_store',
+        action='store_false',
+        help='Run npm install inside every fuzz copy.'
+    )
+    parser.set_defaults(dep_store=True)
+    parser.add_argument(
+        '--dep_link',
+        type=str,
+        choices=['symlink', 'hardlink'],
+        default='symlink',
+        help='How the shared node_modules store is linked into fuzz copies.'
+    )
+    parser.add_argument(
+        '--workdir_link',
+        type=str,
+        choices=['auto', 'reflink', 'hardlink', 'copy'],
+        default='auto',
+        help='How unchanged files are placed in fuzz copies. auto tries reflink, then hardlink, then copy.'
+    )
+    parser.add_argument(
+        '--workdir_manifest',
+        type=str,
+        required=False,
+        default=None,
+        help='JSON file with "include"/"exclude" glob lists controlling what is placed in fuzz copies.'
+    )
+    parser.add_argument(
+        '--cache_max_size',
+        type=int,
+        required=False,
+        default=2048,
+        help='Maximum size of the build cache in MB before old entries are evicted.'
+    )
+    parser.add_argument(
+        '--cache_max_age',
+        type=float,
+        required=False,
+        default=72,
+        help='Hours an unused build cache entry is kept before being evicted.'
+    )
     
     args = parser.parse_args()
 
+    if args.max_tests <= 0 and args.time_budget is None and args.plateau is None:
+        parser.error("--max_tests 0 needs --time_budget or --plateau to end each file")
+    if args.plateau is not None and args.coverage_mode == 'off':
+        parser.error("--plateau needs coverage; use --coverage_mode function or block")
+
     # Instantiate HTTP Server for Extension to be able to communicate with everything else
-    communicator = ExtensionFuzzerCommunicator(host='127.0.0.1', port=5000)
+    # The snippet extension always reports over TCP, so only TypeScript-only runs can use a Unix socket
+    socketPath = None
+    if args.transport == 'asyncio' and args.socket_dir:
+        os.makedirs(args.socket_dir, exist_ok=True)
+    if args.transport == 'asyncio' and args.socket_dir and args.file_options == 'ts':
+        socketPath = os.path.join(args.socket_dir, f"fuzz-{args.base_port}.sock")
+    communicator = ExtensionFuzzerCommunicator(host='127.0.0.1', port=args.base_port, transport=args.transport, socketPath=socketPath)
     communicator.run()
     activeCommunicators.append(communicator)
 
@@ -157,6 +552,95 @@ def main():
     # Get name and version for finding extension path in active VS Code extensions
     name, version, publisher = documentCreator.getExtensionPathInfo()
 
+    # Compiled fuzz copies are shared across files and iterations when nothing changed
+    buildCache = None
+    if args.build_cache:
+        buildCache = BuildCache(
+            documentCreator.getCacheDir(),
+            maxBytes=args.cache_max_size * 1024 ** 2,
+            maxAge=args.cache_max_age * 3600
+        )
+
+    # One node_modules tree per lockfile, shared by every fuzz copy
+    depStore = None
+    if args.dep_store:
+        depStore = DependencyStore(
+            os.path.join(documentCreator.getCacheDir(), "node_modules"),
+            linkMode=args.dep_link
+        )
+
+    # Input CSVs store coverage as bitsets over one function ID table per extension
+    coverageStore = CoverageStore(documentCreator.inputDir) if args.coverage_store == 'bits' else None
+
+    # Results of every file go to one database per extension; existing CSVs are imported on first open
+    resultStore = None
+    if args.result_store == 'sqlite':
+        resultStore = ResultStore(documentCreator.inputDir)
+        activeStores.append(resultStore)
+    documentCreator.setResultStore(resultStore)
+
+    # Errors and crashes are grouped by normalized stack; a new buckets file starts from the recorded results
+    buckets = CrashBuckets(documentCreator.inputDir, saturation=args.bucket_saturation, ignoreFrames=HARNESS_FUNCS)
+    if not os.path.isfile(buckets.path):
+        buckets.rebuild(resultStore)
+
+    # Decoded source maps, reused for every report from the same build
+    sourceMaps = SourceMapIndex(os.path.join(documentCreator.getCacheDir(), "sourcemaps"))
+
+    # Incremental compiler state (tsbuildinfo and emitted output) carried between fuzz copies
+    buildStateDir = os.path.join(documentCreator.getCacheDir(), "build-state")
+
+    # Fuzz copies link unchanged files and skip large artifacts like vsix/
+    materializer = WorkdirMaterializer(manifestPath=args.workdir_manifest, linkMode=args.workdir_link)
+
+    # Every TsExtensionFuzzer of this run shares the caches and stores above; only the communicator and mode differ
+    def createTsFuzzer(args, fuzzerCommunicator, harnessMode='static', isolated=False):
+        return TsExtensionFuzzer(
+            rootPath = rootPath,
+            communicator = fuzzerCommunicator,
+            tmpDir = backupDirPath,
+            repoRoot = args.repo_root,
+            cleanup = args.cleanup,
+            buildCache = buildCache,
+            harnessMode = harnessMode,
+            depStore = depStore,
+            materializer = materializer,
+            isolated = isolated,
+            backend = args.backend,
+            buildStateDir = buildStateDir,
+            wireFormat = args.wire_format,
+            caseTimeout = args.case_timeout,
+            heartbeatTimeout = args.heartbeat_timeout,
+            maxRestarts = args.max_restarts,
+            coverageStore = coverageStore,
+            sourceMaps = sourceMaps,
+            coverageMode = args.coverage_mode,
+            resultStore = resultStore,
+            buckets = buckets,
+            reportBatch = args.report_batch)
+
+    # In sidecar mode a single fuzzer session outlives every file and iteration
+    sidecarFuzzer = None
+    if args.harness_mode == 'sidecar' and args.workers <= 1:
+        sidecarFuzzer = createTsFuzzer(args, communicator, 'sidecar')
+        activeFuzzers.append(sidecarFuzzer)
+
+    # Parallel workers each get their own communicator port and isolated VS Code instance
+    workerPool = None
+    if args.workers > 1:
+        def fuzzerFactory(workerId, workerCommunicator):
+            return createTsFuzzer(args, workerCommunicator, args.harness_mode, isolated=True)
+
+        workerPool = WorkerPool(
+            args.workers,
+            fuzzerFactory,
+            basePort=args.base_port + 1,
+            transport=args.transport,
+            socketDir=args.socket_dir if args.transport == 'asyncio' else None,
+            sharedCommunicator=communicator if args.shared_communicator else None
+        )
+        activePools.append(workerPool)
+
     # Get max iterations
     maxIters = args.max_iters
 
@@ -199,13 +683,16 @@ def main():
                     if args.fuzz_type == 'random':
                         mutantCreator = RandomMutantCreator(filePath=snippetPath)
                     else:
-                        mutantCreator = GuidedMutantCreator(singularSnippetCrashes, multiSnippetCrashes)
+                        mutantCreator = GuidedMutantCreator(singularCrashesDir=singularSnippetCrashes, multiCrashesDir=multiSnippetCrashes,
+                                                            resultStore=resultStore)
 
                     # Initialize filter
                     mutantFilter = MutantFilter(inputDir=inputSnippetDir,
                                                 singularSnippetCrashes=singularSnippetCrashes,
                                                 multiSnippetCrashes=multiSnippetCrashes, 
-                                                snippetClean=snippetClean
+                                                snippetClean=snippetClean,
+                                                resultStore=resultStore,
+                                                bloomBits=args.dedup_bloom_bits or None
                                                 )
 
                     # Create args.max_test Mutants
@@ -219,7 +706,7 @@ def main():
                     filteredMuts = mutantFilter.filterSnippetMutants(mutants)
                     
                     # Initialize Snippet Fuzzer
-                    snippetFuzz = SnippetFuzzer(filteredMuts, snippetPath, backupDirPath, logDirPath)
+                    snippetFuzz = SnippetFuzzer(filteredMuts, snippetPath, backupDirPath, logDirPath, communicator=communicator)
 
                     # For every mutation created in filteredMuts, get snippet pairs,
                     # test to make sure the file is not corrupted, apply mutations to the snippet file,
@@ -264,12 +751,15 @@ def main():
                         # See what snippets crashed if any
                         mutatedResults = snippetFuzz.compareResults(mutatedResults)
     
+                        crashDir = None
                         if len(mutatedResults["unmatched"]) > 1:
                             logging.debug(f"Snippet file does not work.")
                             documentCreator.writeMulti(x, filteredMuts)
+                            crashDir = multiSnippetCrashes
                         elif len(mutatedResults["unmatched"]) == 1:
                             logging.debug(f"One snippet crashed.")
                             documentCreator.writeSingle(x, filteredMuts)
+                            crashDir = singularSnippetCrashes
                         else:
                             logging.debug(f"Mutation did not crash snippets.")
                             documentCreator.writeClean(x, filteredMuts)
@@ -279,6 +769,11 @@ def main():
 
                         # Restore snippets in active VS Code extensions with backup
                         documentCreator.restoreSnippets(snippetPath, snippetBackupPath)
+
+                        if args.minimize and crashDir is not None:
+                            minimizeSnippetMutant(snippetFuzz, communicator,
+                                                  lambda: documentCreator.restoreSnippets(snippetPath, snippetBackupPath),
+                                                  filteredMuts[x], mutatedResults["unmatched"], crashDir, args)
         
         if not args.file_options or args.file_options == "ts":
             # Fuzz TypeScript files logic
@@ -291,65 +786,49 @@ def main():
             elif len(typeScriptFilePaths) > 0:
                 # Currently, just start from the first path in the csv file. (WILL CHANGE LATER. MAYBE GIVE USER AN OPTION?!?!)
 
+                if workerPool is not None:
+                    workerPool.run(
+                        typeScriptFilePaths,
+                        lambda fuzzer, workerCommunicator, path: fuzzTypeScriptFile(fuzzer, workerCommunicator, documentCreator, path, args)
+                    )
+                    typeScriptFilePaths = []
+
                 for typeScriptFilePath in typeScriptFilePaths:
+                    if sidecarFuzzer is not None:
+                        # One compiled copy and one VS Code window serve every file and iteration
+                        if sidecarFuzzer.vscodeProc is None:
+                            sidecarFuzzer.startFuzzSession()
+                        fuzzTypeScriptFile(sidecarFuzzer, communicator, documentCreator, typeScriptFilePath, args)
+                        continue
+
                     # Init fuzzer
-                    with TsExtensionFuzzer(
-                        rootPath = rootPath,
-                        communicator = communicator,
-                        tmpDir = backupDirPath,
-                        repoRoot = args.repo_root,
-                        cleanup = args.cleanup) as fuzzer:
+                    with createTsFuzzer(args, communicator) as fuzzer:
 
                         activeFuzzers.append(fuzzer)
                         try:
-                            fuzzer.startFuzzSession(typeScriptFilePath)
                             # Currently don't need to create backups
 
-                            # Create inputs directories
-                            inputTSDir, cleanCSV, errorCSV, crashCSV = documentCreator.createTypeScriptInputPath(typeScriptFilePath)
-
-                            logging.info(f"Fuzzing TypeScript file at: {typeScriptFilePath}")
-
-                            # Initialize Mutant Creator
-                            mutantCreator = None
-                            if args.fuzz_type == 'random':
-                                mutantCreator = RandomMutantCreator(filePath=typeScriptFilePath)
-                            else:
-                                mutantCreator = GuidedMutantCreator(filePath=typeScriptFilePath)
-
-                            # Initialize Mutant Filter
-                            mutantFilter = MutantFilter(inputDir=inputTSDir,
-                                                        cleanCSV=cleanCSV,
-                                                        errorCSV=errorCSV,
-                                                        crashCSV=crashCSV
-                                                        )
-
-                            # Decide what files/methods to fuzz and create inputs(Can make this more robust through building out guidance engine)
-                            inputs = None
-                            if args.fuzz_type == 'random':
-                                inputs = mutantCreator.randomlyCreateInputs(args.max_tests)
-                            else:
-                                inputs = mutantCreator.guidedCreateInputs
-
-                            if len(inputs) == 0:
-                                logging.warning(f"Input creator could not find inputs to create. Skipping this TS file...")
-                                continue
-
-                            # Filter mutations
-                            inputs = [(fn, args) for _, fn, args in inputs]
-                            filteredInputs = mutantFilter.filterTypeScriptMutants(inputs)
-
-                            # Put test cases in queue for harness to use
-                            communicator.setTestQueue([{"funcName": fn, "args": args} for fn, args in filteredInputs])
-
-                            # Fuzz the TypeScript File
-                            fuzzer.runSingleFile(cleanCSV, errorCSV, crashCSV)
+                            fuzzTypeScriptFile(fuzzer, communicator, documentCreator, typeScriptFilePath, args)
                 
                         finally:
                             activeFuzzers.remove(fuzzer)
 
         logging.info(f"Iteration {iters} completed\n")
 
+    if sidecarFuzzer is not None:
+        sidecarFuzzer.closeFuzzSession()
+        activeFuzzers.remove(sidecarFuzzer)
+
+    if workerPool is not None:
+        workerPool.close()
+        activePools.remove(workerPool)
+
+    buckets.save()
+
+    if resultStore is not None:
+        resultStore.close()
+        activeStores.remove(resultStore)
+
     # Create a script that performs calculations on logs and output information (Potentially)
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+# ./tests/test_buildCache.py
+import os
+import tempfile
+import unittest
+from FuzzingHarness.buildCache import BuildCache
+
+class BuildCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "ext")
+        self.harness = os.path.join(self.tmp.name, "harness.ts")
+        self.write(os.path.join(self.root, "src", "extension.ts"), "export {}")
+        self.write(os.path.join(self.root, "package.json"), "{}")
+        self.write(self.harness, "// harness")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def build(self, name, size):
+        """
+        A compiled fuzz copy of about size bytes.
+        """
+        copy = os.path.join(self.tmp.name, "work", name, "ext")
+        self.write(os.path.join(copy, "dist", "extension.js"), "x" * size)
+        return copy
+
+    def testKeyFollowsSourcesAndTarget(self):
+        cache = BuildCache(os.path.join(self.tmp.name, "cache"))
+        key = cache.computeKey(self.root, self.harness, "./extension")
+        self.assertEqual(cache.computeKey(self.root, self.harness, "./extension"), key)
+        self.assertNotEqual(cache.computeKey(self.root, self.harness, "./other"), key)
+        self.write(os.path.join(self.root, "src", "extension.ts"), "export const a = 1")
+        self.assertNotEqual(cache.computeKey(self.root, self.harness, "./extension"), key)
+
+    def testStoredCopyIsFoundAgain(self):
+        cache = BuildCache(os.path.join(self.tmp.name, "cache"))
+        self.assertIsNone(cache.lookup("k1", "ext"))
+        stored = cache.store("k1", self.build("a", 10))
+        self.assertEqual(cache.lookup("k1", "ext"), stored)
+        self.assertTrue(os.path.isfile(os.path.join(stored, "dist", "extension.js")))
+
+    def testPinnedEntriesSurviveEviction(self):
+        cache = BuildCache(os.path.join(self.tmp.name, "cache"), maxBytes=150)
+        first = cache.store("k1", self.build("a", 100))
+        # Another worker stores a second copy while the first is still running
+        second = cache.store("k2", self.build("b", 100))
+        self.assertTrue(os.path.isdir(first))
+        self.assertTrue(os.path.isdir(second))
+        cache.release("k1")
+        cache.evict()
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.isdir(second))
+
+    def testOversizedEntryIsStillReturned(self):
+        cache = BuildCache(os.path.join(self.tmp.name, "cache"), maxBytes=10)
+        stored = cache.store("k1", self.build("a", 100))
+        self.assertTrue(os.path.isdir(stored))
+        cache.release("k1")
+        cache.evict()
+        self.assertFalse(os.path.exists(stored))
+
+
+if __name__ == "__main__":
+    unittest.main()
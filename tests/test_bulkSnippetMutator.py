@@ -0,0 +1,105 @@
+# ./tests/test_bulkSnippetMutator.py
+import os
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+from CreateMutants import bulkSnippetMutator
+from CreateMutants.bulkSnippetMutator import BulkSnippetMutator, INSERT, DELETE, REPLACE
+
+SOURCE = b"const a = 1;\n\nfunction f(x) {\n  return x + a;\n}\n"
+
+def edits(mutants):
+    """
+    Hand-built edit records from [(line, [(offset, op, byte), ...]), ...].
+    """
+    records = {"starts": array("I", [0]), "line": array("I"), "offset": array("I"), "op": array("B"), "byte": array("B")}
+    for line, ops in mutants:
+        for offset, op, byte in ops:
+            records["line"].append(line)
+            records["offset"].append(offset)
+            records["op"].append(op)
+            records["byte"].append(byte)
+        records["starts"].append(len(records["op"]))
+    return records
+
+class BulkSnippetMutatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def mutator(self, content=SOURCE, seed=1):
+        path = os.path.join(self.tmp.name, "snippet.ts")
+        with open(path, "wb") as fh:
+            fh.write(content)
+        return BulkSnippetMutator(path, seed)
+
+    def checkMutants(self, mutator, records):
+        # Deleting and inserting one byte per edit on ASCII source changes the length by exactly that much
+        for i in range(mutator.count(records)):
+            first, last = int(records["starts"][i]), int(records["starts"][i + 1])
+            ops = [int(op) for op in records["op"][first:last]]
+            offsets = [int(offset) for offset in records["offset"][first:last]]
+            line, original, mutated = mutator.materialize(records, i)
+            self.assertTrue(ops)
+            self.assertEqual(offsets, sorted(set(offsets)))
+            self.assertLess(max(offsets), len(original))
+            self.assertEqual(original, mutator.originalLine(line))
+            self.assertEqual(len(mutated), len(original) + ops.count(INSERT) - ops.count(DELETE))
+
+    def testMaterializeAppliesEachOp(self):
+        mutator = self.mutator()
+        records = edits([
+            (0, [(0, INSERT, ord("x"))]),
+            (0, [(5, DELETE, 0), (11, REPLACE, ord(","))]),
+            (3, [(2, REPLACE, ord("R")), (13, INSERT, ord("-"))]),
+        ])
+        self.assertEqual(list(mutator.iterMutants(records)), [
+            (0, "const a = 1;", "xconst a = 1;"),
+            (0, "const a = 1;", "consta = 1,"),
+            (3, "  return x + a;", "  Return x + -a;"),
+        ])
+
+    def testEmptyLinesAreNeverMutated(self):
+        mutator = self.mutator()
+        self.assertEqual(list(mutator.candidates), [0, 2, 3, 4])
+        records = mutator.generate(200)
+        self.assertEqual(mutator.count(records), 200)
+        self.assertNotIn(1, {int(line) for line in records["line"]})
+        self.checkMutants(mutator, records)
+
+    def testCrlfIsNotPartOfTheLine(self):
+        mutator = self.mutator(SOURCE.replace(b"\n", b"\r\n"))
+        self.assertEqual(mutator.originalLine(3), "  return x + a;")
+        records = edits([(4, [(0, DELETE, 0)])])
+        self.assertEqual(mutator.materialize(records, 0), (4, "}", ""))
+        self.checkMutants(mutator, mutator.generate(50))
+
+    def testSameSeedSameMutants(self):
+        first, second = self.mutator(seed=7), self.mutator(seed=7)
+        self.assertEqual(list(first.iterMutants(first.generate(50))), list(second.iterMutants(second.generate(50))))
+
+    def testArrayFallbackWithoutNumpy(self):
+        with mock.patch.object(bulkSnippetMutator, "np", None):
+            mutator = self.mutator()
+            records = mutator.generate(100)
+        self.assertIsInstance(records["starts"], array)
+        self.checkMutants(mutator, records)
+
+    @unittest.skipIf(bulkSnippetMutator.np is None, "NumPy not installed")
+    def testNumpyChunksAreJoined(self):
+        mutator = self.mutator()
+        with mock.patch.object(bulkSnippetMutator, "CHUNK_MUTANTS", 16):
+            records = mutator.generate(50)
+        self.assertEqual(mutator.count(records), 50)
+        self.checkMutants(mutator, records)
+
+    def testNothingToMutate(self):
+        mutator = self.mutator(b"\n\n")
+        self.assertEqual(mutator.count(mutator.generate(10)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
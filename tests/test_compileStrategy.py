@@ -0,0 +1,121 @@
+# ./tests/test_compileStrategy.py
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from FuzzingHarness import compileStrategy
+from FuzzingHarness.compileStrategy import detectCompileStrategy, plainTscProject, isPlainWebpack, BUILD_STATE_DIR
+
+class CompileStrategyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ext = os.path.join(self.tmp.name, "ext")
+        self.state = os.path.join(self.tmp.name, "state")
+        os.makedirs(self.ext)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel, text=""):
+        path = os.path.join(self.ext, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        return path
+
+    def detect(self, scripts=None, main=None, tsconfig=True, stateDir=True):
+        pkg = {"scripts": scripts or {}}
+        if main:
+            pkg["main"] = main
+        self.write("package.json", json.dumps(pkg))
+        if tsconfig:
+            self.write("tsconfig.json", "{}")
+        return detectCompileStrategy(self.ext, self.state if stateDir else None, "out")
+
+    def testPlainTscProject(self):
+        self.assertEqual(plainTscProject("tsc"), ".")
+        self.assertEqual(plainTscProject("tsc -p ./"), "./")
+        self.assertEqual(plainTscProject("tsc --project src"), "src")
+        self.assertIsNone(plainTscProject("tsc && cp a b"))
+        self.assertIsNone(plainTscProject("webpack"))
+
+    def testPlainWebpack(self):
+        self.assertTrue(isPlainWebpack("webpack"))
+        self.assertTrue(isPlainWebpack("webpack --mode development"))
+        self.assertFalse(isPlainWebpack("npm run lint && webpack"))
+        self.assertFalse(isPlainWebpack("webpack && cp a b"))
+
+    def testStrategyChoice(self):
+        self.assertEqual(self.detect({"compile": "tsc -p ./"}).name, "tsc")
+        webpack = self.detect({"compile": "webpack"}, main="./dist/extension.js")
+        self.assertEqual((webpack.name, webpack.bundleDir), ("webpack", "dist"))
+        self.assertEqual(self.detect({"compile": "webpack"}, stateDir=False).name, "npm-script")
+        self.assertEqual(self.detect({"build": "esbuild src/extension.ts"}).name, "npm-script")
+        # Without a script the project is still compiled to JS, not just type-checked
+        fallback = self.detect()
+        self.assertEqual((fallback.name, fallback.project), ("tsc", "."))
+        os.remove(os.path.join(self.ext, "tsconfig.json"))
+        self.assertEqual(self.detect(tsconfig=False).name, "none")
+
+    def testWebpackBuildsEveryCopyInOneStableDirectory(self):
+        runs = []
+
+        def fakeRun(cmd, cwd, check):
+            runs.append((cwd, cmd[-1]))
+            os.makedirs(os.path.join(cwd, "dist"), exist_ok=True)
+            with open(os.path.join(cwd, "dist", "extension.js"), "w", encoding="utf-8") as fh:
+                fh.write(f"bundle {len(runs)}")
+
+        copies = []
+        for name in ("ext-fuzz-1", "ext-fuzz-2"):
+            self.ext = os.path.join(self.tmp.name, name, "airflow")
+            self.write("src/extension.ts", "export {}")
+            strategy = self.detect({"compile": "webpack"}, main="./dist/extension.js")
+            with mock.patch.object(compileStrategy.subprocess, "run", fakeRun):
+                strategy.compile(self.ext)
+            copies.append(self.ext)
+        self.assertEqual({cwd for cwd, _ in runs}, {os.path.join(self.state, "webpack", "workspace")})
+        self.assertTrue(all(arg.startswith("--cache-cache-directory=") for _, arg in runs))
+        with open(os.path.join(copies[1], "dist", "extension.js"), encoding="utf-8") as fh:
+            self.assertEqual(fh.read(), "bundle 2")
+
+    def testSyncCopiesOnlyChangedFiles(self):
+        self.write("src/a.ts", "a")
+        self.write("src/b.ts", "b")
+        self.write("dist/extension.js", "old bundle")
+        self.write(f"{BUILD_STATE_DIR}/x", "state")
+        dst = os.path.join(self.tmp.name, "mirror")
+        skip = (BUILD_STATE_DIR, "dist")
+        self.assertEqual(compileStrategy._syncTree(self.ext, dst, skip), 2)
+        self.assertFalse(os.path.exists(os.path.join(dst, "dist")))
+        self.assertFalse(os.path.exists(os.path.join(dst, BUILD_STATE_DIR)))
+        # Copies keep their timestamps, so a second sync has nothing to do
+        self.assertEqual(compileStrategy._syncTree(self.ext, dst, skip), 0)
+
+    def testSyncMirrorsChangesDeletionsAndLinks(self):
+        self.write("src/a.ts", "a")
+        gone = self.write("src/gone.ts", "x")
+        modules = os.path.join(self.tmp.name, "shared_modules")
+        os.makedirs(modules)
+        os.symlink(modules, os.path.join(self.ext, "node_modules"))
+        dst = os.path.join(self.tmp.name, "mirror")
+        compileStrategy._syncTree(self.ext, dst)
+        keep = os.path.join(dst, "dist")
+        os.makedirs(keep)
+
+        os.remove(gone)
+        changed = self.write("src/a.ts", "changed")
+        os.utime(changed, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(compileStrategy._syncTree(self.ext, dst, skip=("dist",)), 1)
+        with open(os.path.join(dst, "src", "a.ts"), encoding="utf-8") as fh:
+            self.assertEqual(fh.read(), "changed")
+        self.assertFalse(os.path.exists(os.path.join(dst, "src", "gone.ts")))
+        self.assertEqual(os.readlink(os.path.join(dst, "node_modules")), modules)
+        # Build output in the mirror survives the sync
+        self.assertTrue(os.path.isdir(keep))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# ./tests/test_coverageAggregator.py
+import unittest
+from FuzzingHarness.coverageAggregator import CoverageAggregator
+
+class CoverageAggregatorTest(unittest.TestCase):
+    def testBucketBoundaries(self):
+        expected = {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 7: 4, 8: 8, 15: 8, 16: 16, 1000: 512}
+        self.assertEqual({count: CoverageAggregator.bucket(count) for count in expected}, expected)
+
+    def testFunctionModeCountsNewFunctions(self):
+        aggregator = CoverageAggregator("function")
+        self.assertEqual(aggregator.observe({"coverage": {"out/a.js": ["f", "g"]}}), 2)
+        self.assertEqual(aggregator.observe({"coverage": {"out/a.js": ["g", "h"]}}), 1)
+        self.assertEqual(aggregator.observe({"coverage": {"out/a.js": ["f"]}}), 0)
+        # Blocks are not edges in function mode
+        self.assertEqual(aggregator.observe({"blocks": {"out/a.js": [[0, 10, 1]]}}), 0)
+        self.assertEqual(aggregator.stats(), {"mode": "function", "edges": 3, "cases": 4, "casesWithNewEdges": 2})
+
+    def testBlockModeCountsNewBlocksAndBuckets(self):
+        aggregator = CoverageAggregator("block")
+        self.assertEqual(aggregator.observe({"blocks": {"out/a.js": [[0, 10, 1], [10, 20, 0]]}}), 1)
+        # Same bucket (4-7) as an earlier run is nothing new; a higher bucket is
+        self.assertEqual(aggregator.observe({"blocks": {"out/a.js": [[0, 10, 5]]}}), 1)
+        self.assertEqual(aggregator.observe({"blocks": {"out/a.js": [[0, 10, 7]]}}), 0)
+        self.assertEqual(aggregator.observe({"blocks": {"out/a.js": [[0, 10, 8]]}}), 1)
+        self.assertEqual(aggregator.observe({"coverage": {"out/a.js": ["f"]}}), 0)
+        self.assertEqual(aggregator.stats()["edges"], 3)
+
+    def testOffModeNeverFindsAnything(self):
+        aggregator = CoverageAggregator("off")
+        self.assertEqual(aggregator.observe({"coverage": {"out/a.js": ["f"]}, "blocks": {"out/a.js": [[0, 1, 1]]}}), 0)
+        self.assertEqual(aggregator.stats()["casesWithNewEdges"], 0)
+
+    def testUnknownMode(self):
+        with self.assertRaises(ValueError):
+            CoverageAggregator("edges")
+
+
+if __name__ == "__main__":
+    unittest.main()
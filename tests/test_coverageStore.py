@@ -0,0 +1,74 @@
+# ./tests/test_coverageStore.py
+import csv
+import json
+import os
+import tempfile
+import unittest
+from Logging.coverageStore import CoverageStore
+
+URL = "file:///tmp/ext-fuzz-abc123/my-ext/dist/extension.js"
+
+class CoverageStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def writeCsv(self, name, rows):
+        path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            csv.writer(fh).writerows(rows)
+        return path
+
+    def testUrlsAreRelativeToTheFuzzCopy(self):
+        self.assertEqual(CoverageStore.normalizeUrl(URL), "dist/extension.js")
+        self.assertEqual(CoverageStore.normalizeUrl("node:internal/x"), "node:internal/x")
+
+    def testEncodeDecodeRoundTrip(self):
+        store = CoverageStore()
+        bits = store.encode({URL: ["f", "g"]})
+        self.assertEqual(store.decode(bits), {"dist/extension.js": ["f", "g"]})
+        self.assertEqual(store.fromField(store.toField(bits)), bits)
+
+    def testIdsPersistAcrossSessions(self):
+        first = CoverageStore(self.dir)
+        bits = first.encode({URL: ["f", "g"]})
+        second = CoverageStore(self.dir)
+        self.assertEqual(second.encode({URL.replace("abc123", "zzz"): ["g", "f"]}), bits)
+
+    def testLegacyJsonFieldIsRead(self):
+        store = CoverageStore()
+        self.assertEqual(store.decode(store.fromField(json.dumps({URL: ["f"]}))), {"dist/extension.js": ["f"]})
+        self.assertEqual(store.fromField(""), 0)
+
+    def testAddCountsNewFunctions(self):
+        store = CoverageStore()
+        self.assertEqual(store.add(store.encode({URL: ["f", "g"]})), 2)
+        self.assertEqual(store.add(store.encode({URL: ["g", "h"]})), 1)
+
+    def testCompactRewritesCoverageColumn(self):
+        path = self.writeCsv("src/api/clean.csv", [
+            ["funcName", "args", "coverage", "error"],
+            ["f", "[]", json.dumps({URL: ["f"]}), ""],
+        ])
+        store = CoverageStore(self.dir)
+        self.assertIsNotNone(store.compactCsv(path))
+        [row] = list(store.readCsv(path))
+        self.assertEqual(store.decode(row["coverage"]), {"dist/extension.js": ["f"]})
+        with open(path, encoding="utf-8") as fh:
+            self.assertIn("bits:", fh.read())
+
+    def testCompactLeavesSnippetCsvUntouched(self):
+        path = self.writeCsv("Clean/clean.csv", [["Line Num", "Original Line", "Mutated Line"], ["3", "a", "b"]])
+        with open(path, "rb") as fh:
+            before = fh.read()
+        self.assertIsNone(CoverageStore(self.dir).compactCsv(path))
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
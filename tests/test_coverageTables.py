@@ -0,0 +1,110 @@
+# ./tests/test_coverageTables.py
+import base64
+import unittest
+from ExtensionFuzzerCommunication.coverageTables import CoverageTables
+
+URL_A = "file:///tmp/ext-fuzz-1/ext/dist/a.js"
+URL_B = "file:///tmp/ext-fuzz-1/ext/dist/b.js"
+
+def tables(session="s1", urlBase=0, urls=(), symBase=0, symbols=()):
+    return {"session": session, "urlBase": urlBase, "urls": list(urls), "symBase": symBase, "symbols": [list(s) for s in symbols]}
+
+def bitmap(ids):
+    value = 0
+    for sid in ids:
+        value |= 1 << sid
+    return base64.b64encode(value.to_bytes((value.bit_length() + 7) // 8 or 1, "little")).decode()
+
+def receive(decoder, batch, cases):
+    """
+    Decodes a batch the server accepted, as handleReportCases does.
+    """
+    cases = decoder.decode(batch, cases)
+    decoder.commit(batch)
+    return cases
+
+class CoverageTablesTest(unittest.TestCase):
+    def testSymbolIdsDecodeToCoverageDict(self):
+        decoder = CoverageTables()
+        cases = decoder.decode(
+            tables(urls=[URL_A, URL_B], symbols=[(0, "f"), (1, "g"), (0, "h")]),
+            [{"index": 0, "cov": [0, 2]}, {"index": 1, "cov": [1]}],
+        )
+        self.assertEqual(cases[0]["coverage"], {URL_A: ["f", "h"]})
+        self.assertEqual(cases[1]["coverage"], {URL_B: ["g"]})
+        self.assertNotIn("cov", cases[0])
+
+    def testBitmapMatchesIdList(self):
+        decoder = CoverageTables()
+        symbols = [(0, f"f{i}") for i in range(20)]
+        [case] = decoder.decode(tables(urls=[URL_A], symbols=symbols), [{"bits": bitmap([1, 9, 17])}])
+        self.assertEqual(case["coverage"], {URL_A: ["f1", "f9", "f17"]})
+
+    def testLaterBatchesOnlyCarryNewEntries(self):
+        decoder = CoverageTables()
+        receive(decoder, tables(urls=[URL_A], symbols=[(0, "f")]), [])
+        [case] = receive(decoder, tables(urlBase=1, urls=[URL_B], symBase=1, symbols=[(1, "g")]), [{"cov": [0, 1]}])
+        self.assertEqual(case["coverage"], {URL_A: ["f"], URL_B: ["g"]})
+
+    def testSessionsHaveSeparateTables(self):
+        decoder = CoverageTables()
+        receive(decoder, tables("s1", urls=[URL_A], symbols=[(0, "f")]), [])
+        [case] = receive(decoder, tables("s2", urls=[URL_B], symbols=[(0, "g")]), [{"cov": [0]}])
+        self.assertEqual(case["coverage"], {URL_B: ["g"]})
+
+    def testOutOfSyncBasesDropCoverage(self):
+        decoder = CoverageTables()
+        receive(decoder, tables(urls=[URL_A], symbols=[(0, "f")]), [])
+        # A lost batch: the harness thinks the server already has two URLs
+        [case] = decoder.decode(tables(urlBase=2, symBase=1), [{"cov": [0], "blk": {"0": [[0, 5, 1]]}}])
+        self.assertEqual(case["coverage"], {})
+        self.assertNotIn("cov", case)
+        self.assertNotIn("blk", case)
+
+    def testRejectedBatchCanBeSentAgain(self):
+        decoder = CoverageTables()
+        first = tables(urls=[URL_A], symbols=[(0, "f")])
+        decoder.decode(first, [{"cov": [0]}])
+        # The sink failed, so the harness keeps its bases and re-sends the entries with its next batch
+        [case] = receive(decoder, tables(urls=[URL_A], symbols=[(0, "f"), (0, "g")]), [{"cov": [0, 1]}])
+        self.assertEqual(case["coverage"], {URL_A: ["f", "g"]})
+
+    def testBatchRepeatedAfterLostResponseStaysInSync(self):
+        decoder = CoverageTables()
+        receive(decoder, tables(urls=[URL_A], symbols=[(0, "f")]), [])
+        # The harness never saw the 200, so it sends the same entries again from base 0
+        [case] = receive(decoder, tables(urls=[URL_A, URL_B], symbols=[(0, "f"), (1, "g")]), [{"cov": [1]}])
+        self.assertEqual(case["coverage"], {URL_B: ["g"]})
+        [case] = receive(decoder, tables(urlBase=2, symBase=2), [{"cov": [0, 1]}])
+        self.assertEqual(case["coverage"], {URL_A: ["f"], URL_B: ["g"]})
+
+    def testFailingSinkDoesNotAdvanceServerTables(self):
+        from ExtensionFuzzerCommunication.extensionFuzzerCommunicator import ExtensionFuzzerCommunicator
+        communicator = ExtensionFuzzerCommunicator()
+        received = []
+
+        def sink(cases):
+            if not received:
+                received.append(None)
+                raise OSError("disk full")
+            received.extend(cases)
+
+        communicator.setCaseSink(sink)
+
+        def batch():
+            return {"cases": [{"index": 0, "cov": [0]}], "tables": tables(urls=[URL_A], symbols=[(0, "f")])}
+
+        with self.assertRaises(OSError):
+            communicator.dispatch("POST", "/report/cases", {}, batch())
+        body, status = communicator.dispatch("POST", "/report/cases", {}, batch())
+        self.assertEqual(status, 200)
+        self.assertEqual(received[1]["coverage"], {URL_A: ["f"]})
+
+    def testBlocksAreKeyedByUrl(self):
+        decoder = CoverageTables()
+        [case] = decoder.decode(tables(urls=[URL_A]), [{"blk": {"0": [[0, 10, 1]], "7": [[0, 1, 1]]}}])
+        self.assertEqual(case["blocks"], {URL_A: [[0, 10, 1]]})
+
+
+if __name__ == "__main__":
+    unittest.main()
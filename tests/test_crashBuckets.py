@@ -0,0 +1,100 @@
+# ./tests/test_crashBuckets.py
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from Logging.crashBuckets import CrashBuckets, BUCKETS_FILE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TRACE = """TypeError: Cannot read properties of undefined (reading 'length') at index 12
+    at parse (file:///tmp/ext-fuzz-abc123/my-ext/dist/extension.js:10:5)
+    at runCases (/tmp/harness/fuzzerHarness.ts:40:3)
+    at process.processTicksAndRejections (node:internal/process/task_queues:95:5)
+    at activate (file:///tmp/ext-fuzz-abc123/my-ext/dist/extension.js:99:1)"""
+
+class CrashBucketsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def writeCsv(self, rel, rows):
+        path = os.path.join(self.dir, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            csv.writer(fh).writerows(rows)
+
+    def testNormalizeKeepsOnlyExtensionFrames(self):
+        buckets = CrashBuckets(ignoreFrames={"runCases"})
+        self.assertEqual(buckets.normalize(TRACE), "\n".join([
+            "TypeError: Cannot read properties of undefined (reading 'length') at index N",
+            "parse (dist/extension.js)",
+            "activate (dist/extension.js)",
+        ]))
+        self.assertEqual(buckets.normalize(""), "")
+
+    def testSameFailureFromAnotherCopySharesABucket(self):
+        buckets = CrashBuckets()
+        moved = TRACE.replace("ext-fuzz-abc123", "ext-fuzz-zzz").replace(":10:5", ":11:7").replace("12", "3")
+        self.assertEqual(buckets.bucketOf(TRACE)[0], buckets.bucketOf(moved)[0])
+
+    def testArgShape(self):
+        self.assertEqual(
+            CrashBuckets.argShape(['"a"', "1", "null", "true", "[1]", '{"a": 1}', "undefined", "NaN", "new Map()"]),
+            ["string", "number", "null", "boolean", "array", "object", "undefined", "number", "expr"],
+        )
+        self.assertEqual(CrashBuckets.argShape([1, "x"]), ["number", "expr"])
+
+    def testWeightDropsOnceBucketSaturates(self):
+        buckets = CrashBuckets(saturation=2)
+        for i in range(10):
+            buckets.observe("f", ["1"], TRACE)
+        self.assertTrue(buckets.isSaturated(buckets.bucketOf(TRACE)[0]))
+        self.assertAlmostEqual(buckets.weight("f", ["1"]), 0.2)
+        self.assertEqual(buckets.weight("f", ['"s"']), 1.0)
+        self.assertEqual(buckets.weight("f", ["1"], floor=0.5), 0.5)
+
+    def testShortestInputIsRepresentative(self):
+        buckets = CrashBuckets()
+        buckets.observe("f", ['"long argument"'], TRACE, "src")
+        bucketId = buckets.observe("f", ["1"], TRACE, "src")
+        self.assertEqual(buckets.summary()[0]["representative"]["args"], ["1"])
+        self.assertEqual(buckets.unminimized("src"), [(bucketId, buckets.summary()[0]["representative"])])
+
+    def testRebuildSkipsSnippetCsvsAndKeepsMinimized(self):
+        self.writeCsv("src/errors.csv", [["funcName", "args", "coverage", "error"], ["f", '["1"]', "", TRACE]])
+        self.writeCsv("Clean/clean.csv", [["Line Num", "Original Line", "Mutated Line"], ["3", "a", "b"]])
+        buckets = CrashBuckets(self.dir)
+        self.assertEqual(buckets.rebuild(), 1)
+        [bucket] = buckets.summary()
+        buckets.markMinimized(bucket["id"], ["0"])
+        buckets.save()
+        self.assertEqual(list(buckets.shapes), ["f(number)"])
+        reloaded = CrashBuckets(self.dir)
+        reloaded.rebuild()
+        self.assertEqual(reloaded.summary()[0]["minimized"], ["0"])
+
+    def testCliListingDoesNotOverwriteBuckets(self):
+        buckets = CrashBuckets(self.dir)
+        buckets.observe("f", ["1"], TRACE, "src")
+        buckets.save()
+        path = os.path.join(self.dir, BUCKETS_FILE)
+        with open(path, "rb") as fh:
+            before = fh.read()
+        result = subprocess.run([sys.executable, "-m", "Logging.crashBuckets", self.dir],
+                                cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn(buckets.summary()[0]["id"], result.stdout)
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), before)
+        self.assertEqual(json.loads(before)["buckets"], buckets.buckets)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# ./tests/test_dependencyStore.py
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+from FuzzingHarness import dependencyStore
+from FuzzingHarness.dependencyStore import DependencyStore
+
+class DependencyStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ext = os.path.join(self.tmp.name, "ext")
+        self.store = DependencyStore(os.path.join(self.tmp.name, "store"))
+        self.writePackage({"name": "ext", "dependencies": {"left-pad": "1.0.0"}})
+        self.write("package-lock.json", '{"lockfileVersion": 3}')
+        self.installs = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text, root=None):
+        path = os.path.join(root or self.ext, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        return path
+
+    def writePackage(self, pkg):
+        self.write("package.json", json.dumps(pkg))
+
+    def fakeInstall(self, cmd, cwd, check):
+        self.installs.append(sorted(os.listdir(cwd)))
+        self.write(os.path.join("node_modules", "left-pad", "index.js"), "module.exports = 1", root=cwd)
+
+    def testKeyIgnoresPatchedFields(self):
+        key = self.store.computeKey(self.ext)
+        self.writePackage({"name": "ext-fuzz-1", "scripts": {"compile": "tsc"}, "dependencies": {"left-pad": "1.0.0"}})
+        self.assertEqual(self.store.computeKey(self.ext), key)
+        self.write("package-lock.json", '{"lockfileVersion": 2}')
+        self.assertNotEqual(self.store.computeKey(self.ext), key)
+
+    def testInstallsOnceFromStagedManifests(self):
+        self.write("src/extension.ts", "export {}")
+        with mock.patch.object(dependencyStore.subprocess, "run", self.fakeInstall):
+            modules = self.store.ensure(self.ext)
+            self.assertEqual(self.store.ensure(self.ext), modules)
+        # Only the manifests are staged, never the extension's sources
+        self.assertEqual(self.installs, [["package-lock.json", "package.json"]])
+        self.assertTrue(os.path.isfile(os.path.join(modules, "left-pad", "index.js")))
+        self.assertEqual(os.listdir(self.store.storeDir), [os.path.basename(os.path.dirname(modules))])
+
+    def testFailedInstallLeavesNothingBehind(self):
+        def failingInstall(cmd, cwd, check):
+            raise subprocess.CalledProcessError(1, cmd)
+
+        with mock.patch.object(dependencyStore.subprocess, "run", failingInstall):
+            with self.assertRaises(subprocess.CalledProcessError):
+                self.store.ensure(self.ext)
+        self.assertEqual(os.listdir(self.store.storeDir), [])
+
+    def testLinkReplacesExistingModules(self):
+        with mock.patch.object(dependencyStore.subprocess, "run", self.fakeInstall):
+            modules = self.store.ensure(self.ext)
+        copy = os.path.join(self.tmp.name, "copy")
+        self.write(os.path.join("node_modules", "stale.js"), "", root=copy)
+        self.store.link(modules, copy)
+        self.assertEqual(os.readlink(os.path.join(copy, "node_modules")), modules)
+
+        hardlinks = DependencyStore(self.store.storeDir, linkMode="hardlink")
+        hardlinks.link(modules, copy)
+        linked = os.path.join(copy, "node_modules", "left-pad", "index.js")
+        self.assertFalse(os.path.islink(os.path.join(copy, "node_modules")))
+        self.assertTrue(os.path.samefile(linked, os.path.join(modules, "left-pad", "index.js")))
+
+    def testUnknownLinkMode(self):
+        with self.assertRaises(ValueError):
+            DependencyStore(self.store.storeDir, linkMode="copy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# ./tests/test_fingerprintIndex.py
+import json
+import os
+import tempfile
+import unittest
+from FilterMutants.fingerprintIndex import FingerprintIndex, INDEX_FILE, RECORD_SIZE
+
+def rowKey(row):
+    if row[0] == "funcName":
+        return None
+    return row[0], json.loads(row[1])
+
+class FingerprintIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.csv = os.path.join(self.dir, "clean.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def append(self, text):
+        with open(self.csv, "a", newline="", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def testAddReportsDuplicates(self):
+        index = FingerprintIndex(self.dir)
+        self.assertTrue(index.add("f", [1]))
+        self.assertFalse(index.add("f", [1]))
+        self.assertTrue(index.contains("f", [1]))
+        self.assertFalse(index.contains("f", [2]))
+        self.assertEqual(len(index), 1)
+
+    def testFingerprintsPersistAcrossReopen(self):
+        index = FingerprintIndex(self.dir)
+        index.add("f", [1])
+        index.add("g", ["x"])
+        index.sync()
+        reopened = FingerprintIndex(self.dir)
+        self.assertEqual(len(reopened), 2)
+        self.assertTrue(reopened.contains("g", ["x"]))
+
+    def testTornLastRecordIsDropped(self):
+        index = FingerprintIndex(self.dir)
+        index.add("f", [1])
+        index.sync()
+        path = os.path.join(self.dir, INDEX_FILE)
+        with open(path, "ab") as fh:
+            fh.write(b"\x01\x02\x03")
+        reopened = FingerprintIndex(self.dir)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(os.path.getsize(path), RECORD_SIZE)
+
+    def testAbsorbOnlyReadsAppendedRows(self):
+        self.append('funcName,args\nf,[1]\nf,[2]\n')
+        index = FingerprintIndex(self.dir)
+        self.assertEqual(index.absorbCsv(self.csv, rowKey), 2)
+        self.assertEqual(index.absorbCsv(self.csv, rowKey), 0)
+        self.append('f,[3]\n')
+        self.assertEqual(index.absorbCsv(self.csv, rowKey), 1)
+        # Offsets survive a reopen, so nothing is re-read
+        self.assertEqual(FingerprintIndex(self.dir).absorbCsv(self.csv, rowKey), 0)
+
+    def testPartialTrailingRowWaitsForItsNewline(self):
+        self.append('funcName,args\nf,[1]\nf,[')
+        index = FingerprintIndex(self.dir)
+        self.assertEqual(index.absorbCsv(self.csv, rowKey), 1)
+        self.append('2]\n')
+        self.assertEqual(index.absorbCsv(self.csv, rowKey), 1)
+        self.assertTrue(index.contains("f", [2]))
+
+    def testBloomModeHasNoFalseNegatives(self):
+        index = FingerprintIndex(self.dir, bloomBits=1 << 16)
+        for i in range(200):
+            index.add("f", [i])
+        self.assertTrue(all(index.contains("f", [i]) for i in range(200)))
+        self.assertFalse(index.add("f", [0]))
+        index.sync()
+        self.assertTrue(FingerprintIndex(self.dir, bloomBits=1 << 16).contains("f", [199]))
+
+
+if __name__ == "__main__":
+    unittest.main()
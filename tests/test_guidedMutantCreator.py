@@ -0,0 +1,86 @@
+# ./tests/test_guidedMutantCreator.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+from CreateMutants.guidedMutantCreator import GuidedMutantCreator
+
+PARAMS = [("a", "number", False), ("b", "string", False)]
+
+class GuidedMutantCreatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "api.ts")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("export function f(a: number, b: string) {}\n")
+        self.creator = GuidedMutantCreator(filePath=path, explore=0)
+        self.creator.rng.seed(1)
+        self.creator.bySignature = {"f": ([], PARAMS)}
+        self.signatures = [([], "f", PARAMS)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def entry(self, args, found=1):
+        return self.creator.admit("f", args, 0, newEdges=found)
+
+    def testEnergyRewardsFindsAndDecaysWithPicks(self):
+        energy = self.creator.energy
+        base = {"found": 1, "finds": 0, "picks": 0}
+        self.assertGreater(energy(dict(base, found=5)), energy(base))
+        self.assertGreater(energy(dict(base, finds=2)), energy(base))
+        self.assertLess(energy(dict(base, picks=8)), energy(base))
+        self.assertAlmostEqual(energy(dict(base, picks=3)), energy(base) / 2)
+
+    def testSpliceTakesEachArgumentFromEitherParent(self):
+        for _ in range(50):
+            child = self.creator.splice(["1", "2", "3"], ["a", "b", "c"])
+            self.assertEqual(len(child), 3)
+            self.assertTrue(all(x in pair for x, pair in zip(child, [("1", "a"), ("2", "b"), ("3", "c")])))
+
+    def testHavocStacksOneTwoOrFourMutations(self):
+        parent = self.entry(["1", '"x"'])
+        stacked = set()
+        with mock.patch.object(self.creator, "mutateValue", side_effect=lambda value, typ, opt: value + "!"):
+            for _ in range(200):
+                picked, fn, args = self.creator.nextInput(self.signatures, self.creator.bySignature)
+                self.assertIs(picked, parent)
+                self.assertEqual(fn, "f")
+                stacked.add(sum(arg.count("!") for arg in args))
+        self.assertEqual(stacked, {1, 2, 4})
+        self.assertEqual(parent["picks"], 200)
+        self.assertEqual(parent["args"], ["1", '"x"'])
+
+    def testChildrenSpliceWithMatesOfTheSameFunction(self):
+        self.entry(["1", '"x"'])
+        self.entry(["2", '"y"'])
+        with mock.patch.object(self.creator, "mutateValue", side_effect=lambda value, typ, opt: value):
+            children = {tuple(self.creator.nextInput(self.signatures, self.creator.bySignature)[2]) for _ in range(200)}
+        self.assertTrue({("1", '"y"'), ("2", '"x"')} & children)
+
+    def testObserveAdmitsNewCoverageAndCreditsParent(self):
+        parent = self.entry(["1", '"x"'])
+        self.creator.parents[self.creator.inputKey("f", ["2", '"x"'])] = parent
+        self.creator.parents[self.creator.inputKey("f", ["3", '"x"'])] = parent
+        self.creator.observe({"funcName": "f", "args": ["2", '"x"'], "coverage": {"out/api.js": ["f"]}})
+        self.assertEqual((len(self.creator.corpus), parent["finds"]), (2, 1))
+        # The same coverage again is nothing new, so neither the input nor its parent gain anything
+        self.creator.observe({"funcName": "f", "args": ["3", '"x"'], "coverage": {"out/api.js": ["f"]}})
+        self.assertEqual((len(self.creator.corpus), parent["finds"]), (2, 1))
+        self.assertEqual(self.creator.parents, {})
+        # Inputs of functions this file does not declare are never admitted
+        self.creator.observe({"funcName": "g", "args": [], "coverage": {"out/api.js": ["g"]}})
+        self.assertEqual(len(self.creator.corpus), 2)
+
+    def testNonFiniteNumbersStayJavaScript(self):
+        self.assertEqual(GuidedMutantCreator.numberLiteral(float("nan")), "NaN")
+        self.assertEqual(GuidedMutantCreator.numberLiteral(float("inf")), "Infinity")
+        self.assertEqual(GuidedMutantCreator.numberLiteral(float("-inf")), "-Infinity")
+        self.assertEqual(GuidedMutantCreator.numberLiteral(-3), "-3")
+        for value in ("NaN", "1e999", "-1e999", "1.7e308"):
+            for _ in range(100):
+                self.assertNotIn(self.creator.mutateValue(value, "number", False), ("nan", "inf", "-inf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
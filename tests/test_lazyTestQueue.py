@@ -0,0 +1,165 @@
+# ./tests/test_lazyTestQueue.py
+import os
+import tempfile
+import threading
+import unittest
+from ExtensionFuzzerCommunication.fuzzSession import FuzzSession
+from ExtensionFuzzerCommunication.lazyTestQueue import LazyTestQueue
+from ExtensionFuzzerCommunication.queueCursor import QueueCursor
+
+def cases(n):
+    return ({"funcName": "f", "args": [i]} for i in range(n))
+
+def indices(page):
+    return [case["index"] for case in page["cases"]]
+
+class LazyTestQueueTest(unittest.TestCase):
+    def testPagesAreGeneratedOnDemand(self):
+        queue = LazyTestQueue(cases(10))
+        self.assertEqual(indices(queue.page(0, 4)), [0, 1, 2, 3])
+        self.assertEqual(queue.produced, 4)
+        self.assertEqual(indices(queue.page(4, 4)), [4, 5, 6, 7])
+        self.assertEqual(indices(queue.page(8, 4)), [8, 9])
+        self.assertTrue(queue.page(10, 4)["done"])
+
+    def testRetriedCursorServesTheSameCases(self):
+        queue = LazyTestQueue(cases(10))
+        first = queue.page(0, 4)
+        self.assertEqual(queue.page(0, 4)["cases"], first["cases"])
+        self.assertEqual(queue.produced, 4)
+
+    def testSkipPastSendsRestartedHarnessAfterTheCase(self):
+        queue = LazyTestQueue(cases(10))
+        queue.page(0, 4)
+        queue.skipPast(2)
+        self.assertEqual(queue.resumeFrom, 3)
+        # A restarted harness asks from 0 again
+        self.assertEqual(indices(queue.page(0, 4)), [3, 4, 5, 6])
+        self.assertIsNone(queue.caseAt(2))
+
+    def testSkipPastNeverMovesBack(self):
+        queue = LazyTestQueue(cases(10))
+        queue.page(0, 8)
+        queue.skipPast(5)
+        queue.skipPast(1)
+        self.assertEqual(queue.resumeFrom, 6)
+
+    def testMaxCasesEndsQueue(self):
+        queue = LazyTestQueue(cases(100), maxCases=5)
+        self.assertEqual(indices(queue.page(0, 64)), [0, 1, 2, 3, 4])
+        self.assertTrue(queue.page(5, 64)["done"])
+        self.assertIn("5 cases", queue.stopReason)
+
+class QueueCursorTest(unittest.TestCase):
+    def testStaleCursorKeepsUnacknowledgedCases(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cursor.json")
+            cursor = QueueCursor(path)
+            cursor.dispatched([{"index": i, "funcName": "f", "args": [i]} for i in range(4)])
+            cursor.acknowledge([0, 2])
+            cursor._flush(force=True)
+            state = QueueCursor.loadStale(path)
+            self.assertEqual(state["acked"], 1)
+            self.assertEqual(sorted(state["unacked"], key=int), ["1", "3"])
+            cursor.close()
+            self.assertFalse(os.path.exists(path))
+
+    def testLatestHeartbeatIsPersisted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cursor.json")
+            session = FuzzSession("test", None)
+            session.setTestQueue(cases(10), cursorPath=path)
+            session.page(0, 8)
+            session.heartbeat(5)
+            session.heartbeat(3)
+            self.assertEqual(QueueCursor.loadStale(path)["heartbeat"], 5)
+            session.finishQueue()
+            self.assertIsNone(QueueCursor.loadStale(path))
+
+    def testStoppingTheServerEndsEveryQueue(self):
+        from ExtensionFuzzerCommunication.extensionFuzzerCommunicator import ExtensionFuzzerCommunicator
+        with tempfile.TemporaryDirectory() as tmp:
+            communicator = ExtensionFuzzerCommunicator()
+            paths = [os.path.join(tmp, f"{name}.json") for name in ("default", "worker")]
+            for session, path in zip([communicator.defaultSession, communicator.session("worker-0")], paths):
+                session.setTestQueue(cases(4), cursorPath=path)
+                session.page(0, 4)
+            self.assertTrue(all(os.path.exists(path) for path in paths))
+            communicator.stop()
+            self.assertFalse(any(os.path.exists(path) for path in paths))
+
+class RunningCaseTest(unittest.TestCase):
+    def setUp(self):
+        self.session = FuzzSession("test", None)
+        self.session.setTestQueue(cases(20))
+        self.session.page(0, 10)
+
+    def testWithoutHeartbeatNoCaseIsBlamed(self):
+        # Unreported cases may only be waiting in the harness's report batch
+        self.session.receiveCases([{"index": 0, "outcome": "clean"}])
+        self.assertEqual(self.session.runningCase(), (None, None))
+
+    def testHeartbeatIndexWinsOverBufferedResults(self):
+        # Cases 0-5 ran, only 0-2 were reported, case 6 hangs
+        for index in range(7):
+            self.session.heartbeat(index)
+        self.session.receiveCases([{"index": i, "outcome": "clean"} for i in range(3)])
+        index, case = self.session.runningCase()
+        self.assertEqual(index, 6)
+        self.assertEqual(case["args"], [6])
+
+    def testLateHeartbeatDoesNotMoveIndexBack(self):
+        self.session.heartbeat(5)
+        self.session.heartbeat(4)
+        self.assertEqual(self.session.runningCase()[0], 5)
+
+    def testReportedHeartbeatCaseMeansNothingInFlight(self):
+        self.session.heartbeat(3)
+        self.session.receiveCases([{"index": i, "outcome": "clean"} for i in range(4)])
+        self.assertEqual(self.session.runningCase(), (None, None))
+
+    def testFinishedQueueIsNotServedToTheNextHarness(self):
+        self.session.finishQueue()
+        self.assertIsNone(self.session.testQueue)
+        self.session.setTestQueue(cases(3))
+        self.assertEqual(indices(self.session.page(0, 10)), [0, 1, 2])
+
+    def testSlowSinkDoesNotBlockHeartbeats(self):
+        entered, release = threading.Event(), threading.Event()
+
+        def sink(cases):
+            entered.set()
+            release.wait(5)
+
+        self.session.setCaseSink(sink)
+        writer = threading.Thread(target=self.session.receiveCases, args=([{"index": 0, "outcome": "clean"}],))
+        writer.start()
+        self.assertTrue(entered.wait(5))
+        try:
+            heartbeat = threading.Thread(target=self.session.heartbeat, args=(1,))
+            heartbeat.start()
+            heartbeat.join(1)
+            self.assertFalse(heartbeat.is_alive())
+            self.assertEqual(self.session.runningCase()[0], 1)
+            self.assertIsNotNone(self.session.lastSignOfLife())
+        finally:
+            release.set()
+            writer.join()
+
+    def testResultsBeforeSinkAreDeliveredInOrder(self):
+        received = []
+        self.session.receiveCases([{"index": 0, "outcome": "clean"}])
+        self.session.setCaseSink(received.extend)
+        self.session.receiveCases([{"index": 1, "outcome": "clean"}])
+        self.assertEqual([case["index"] for case in received], [0, 1])
+
+    def testSkippedCaseIsNotServedAfterRestart(self):
+        self.session.heartbeat(4)
+        index, _ = self.session.runningCase()
+        self.session.skipCase(index)
+        self.session.resetLiveness()
+        self.assertEqual(indices(self.session.page(0, 3)), [5, 6, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# ./tests/test_randomMutantCreator.py
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+from CreateMutants.randomMutantCreator import RandomMutantCreator
+
+SOURCE = """export function flags(a: boolean, b: boolean) {}
+export function ping() {}
+export function pick(n: number) {}
+"""
+
+class RandomMutantCreatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def creator(self, source=SOURCE):
+        path = os.path.join(self.tmp.name, "api.ts")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(source)
+        return RandomMutantCreator(path)
+
+    def testFiniteSpacesAreEnumeratedExhaustively(self):
+        creator = self.creator()
+        inputs = list(creator.iterInputs())
+        perFunction = Counter(fn for _, fn, _ in inputs)
+        self.assertEqual(perFunction, {"flags": 4, "ping": 1, "pick": creator.NUMBER_RANGE})
+        self.assertEqual(len({(fn, tuple(args)) for _, fn, args in inputs}), len(inputs))
+        self.assertEqual({tuple(args) for _, fn, args in inputs if fn == "flags"},
+                         {(a, b) for a in ("true", "false") for b in ("true", "false")})
+
+    def testMaxCasesStopsEarly(self):
+        self.assertEqual(len(list(self.creator().iterInputs(10))), 10)
+
+    def testSpacesAboveLimitAreSampledUntilTheyRepeat(self):
+        creator = self.creator("export function flags(a: boolean, b: boolean) {}\n")
+        creator.ENUMERATE_LIMIT = 3
+        creator.MAX_REPEATS = 200
+        with mock.patch.object(creator, "enumerateSpace") as enumerate_:
+            inputs = list(creator.iterInputs())
+        enumerate_.assert_not_called()
+        # Sampling still finds all four, then the repeats retire the signature and generation ends
+        self.assertEqual(len(inputs), 4)
+
+    def testOpenEndedSpaceIsDroppedAfterMaxRepeats(self):
+        creator = self.creator("export function greet(name: string) {}\nexport function ping() {}\n")
+        creator.MAX_REPEATS = 5
+        with mock.patch.object(creator, "valuesFor", return_value=['"same"']):
+            inputs = list(creator.iterInputs())
+        self.assertEqual(sorted((fn, args) for _, fn, args in inputs), [("greet", ['"same"']), ("ping", [])])
+
+
+if __name__ == "__main__":
+    unittest.main()
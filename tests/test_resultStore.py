@@ -0,0 +1,142 @@
+# ./tests/test_resultStore.py
+import csv
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from Logging.resultStore import ResultStore, STORE_FILE
+
+class ResultStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.tmp.cleanup()
+
+    def open(self, **kwargs):
+        store = ResultStore(self.dir, **kwargs)
+        self.stores.append(store)
+        return store
+
+    def path(self, *parts):
+        return os.path.join(self.dir, *parts)
+
+    def writeCsv(self, rel, rows):
+        path = self.path(*rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            csv.writer(fh).writerows(rows)
+
+    def testLocateMapsLegacyPaths(self):
+        store = self.open()
+        self.assertEqual(store.locate(self.path("src", "api", "errors.csv")), ("src/api", "ts", "error"))
+        self.assertEqual(store.locate(self.path("Clean", "clean.csv")), ("", "snippet", "clean"))
+        with self.assertRaises(ValueError):
+            store.locate(self.path("src", "notes.csv"))
+
+    def testRowsRoundTripInOrder(self):
+        store = self.open()
+        path = self.path("src", "api", "errors.csv")
+        store.addRows(path, [["f", "[1]", "bits:1", "boom"], ["g", '["x"]', "", "bang"]])
+        rows = list(store.readRows(path))
+        self.assertEqual([r["funcName"] for r in rows], ["f", "g"])
+        self.assertEqual(rows[0], {"funcName": "f", "args": "[1]", "coverage": "bits:1", "error": "boom"})
+        self.assertTrue(store.hasTested(path, "g", ["x"]))
+        self.assertFalse(store.hasTested(path, "g", ["y"]))
+
+    def testSnippetRowsStayOutOfTsQueries(self):
+        store = self.open()
+        store.addRows(self.path("Clean", "clean.csv"), [["3", "a", "b"]])
+        self.assertEqual(list(store.readRows(self.path("clean.csv"))), [])
+        self.assertEqual(list(store.readRows(self.path("Clean", "clean.csv"))),
+                         [{"Line Num": "3", "Original Line": "a", "Mutated Line": "b"}])
+
+    def testFlushMakesEveryThreadsRowsVisible(self):
+        store = self.open(flushInterval=5)
+        path = self.path("src", "x", "clean.csv")
+        missed = []
+
+        def worker(k):
+            for j in range(25):
+                store.addRows(path, [[f"h{k}", f"[{j}]", "", ""]])
+                store.flush()
+                if not store.hasTested(path, f"h{k}", [j]):
+                    missed.append((k, j))
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(missed, [])
+        self.assertEqual(store.summary()["src/x"]["clean"], 150)
+
+    def testImportIsIdempotent(self):
+        self.writeCsv("src/api/errors.csv", [["funcName", "args", "coverage", "error"], ["f", "[1]", "", "boom"]])
+        self.writeCsv("Clean/clean.csv", [["Line Num", "Original Line", "Mutated Line"], ["3", "a", "b"]])
+        store = self.open()
+        expected = {"src/api": {"error": 1}, "": {"clean": 1}}
+        self.assertEqual(store.summary(), expected)
+        store.importCsv()
+        store.importCsv()
+        self.assertEqual(store.summary(), expected)
+
+    def testRepeatedLiveRunsAreAllKept(self):
+        store = self.open()
+        path = self.path("src", "api", "errors.csv")
+        store.addRows(path, [["f", "[1]", "", "boom"]])
+        store.addRows(path, [["f", "[1]", "", "boom"]])
+        self.assertEqual(store.summary()["src/api"]["error"], 2)
+
+    def testExportRebuildsCsvTree(self):
+        store = self.open()
+        store.addRows(self.path("src", "api", "errors.csv"), [["f", "[1]", "", "boom"]])
+        out = self.path("export")
+        self.assertEqual(store.exportCsv(out), 1)
+        with open(os.path.join(out, "src", "api", "errors.csv"), newline="", encoding="utf-8") as fh:
+            self.assertEqual(list(csv.reader(fh)), [["funcName", "args", "coverage", "error"], ["f", "[1]", "", "boom"]])
+
+    def testExportThenImportAddsNothing(self):
+        store = self.open()
+        path = self.path("src", "api", "errors.csv")
+        store.addRows(path, [["f", "[1]", "bits:1", "boom"], ["f", "[1]", "bits:1", "boom"], ["g", "[2]", "", "x"]])
+        store.exportCsv()
+        store.importCsv()
+        self.assertEqual(store.summary(), {"src/api": {"error": 3}})
+        # A CSV with one more run than the store holds adds just that run
+        header = ["funcName", "args", "coverage", "error"]
+        self.writeCsv("src/api/errors.csv", [header] + [["f", "[1]", "bits:1", "boom"]] * 3)
+        store.importCsv()
+        self.assertEqual(store.summary(), {"src/api": {"error": 4}})
+
+    def testSnippetAndTsTargetsOnOnePathStaySeparate(self):
+        store = self.open()
+        store.addRows(self.path("clean.csv"), [["f", "[1]", "", ""]])
+        store.addRows(self.path("Clean", "clean.csv"), [["3", "a", "b"]])
+        self.assertEqual(len(list(store.readRows(self.path("clean.csv")))), 1)
+        self.assertEqual(len(list(store.readRows(self.path("Clean", "clean.csv")))), 1)
+        self.assertTrue(store.hasTested(self.path("Clean", "clean.csv"), "3", ["a", "b"]))
+        self.assertFalse(store.hasTested(self.path("clean.csv"), "3", ["a", "b"]))
+
+    def testOldTargetsTableIsMigrated(self):
+        conn = sqlite3.connect(self.path(STORE_FILE))
+        conn.executescript(
+            "CREATE TABLE targets(id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, kind TEXT NOT NULL);"
+            "INSERT INTO targets(id, path, kind) VALUES (7, '', 'ts');"
+        )
+        conn.close()
+        store = self.open()
+        store.addRows(self.path("clean.csv"), [["f", "[1]", "", ""]])
+        store.addRows(self.path("Clean", "clean.csv"), [["3", "a", "b"]])
+        self.assertEqual(store.summary(), {"": {"clean": 2}})
+        ids = store._connect().execute("SELECT id FROM targets WHERE kind = 'ts'").fetchall()
+        self.assertEqual(ids, [(7,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# ./tests/test_sourceMapIndex.py
+import json
+import os
+import tempfile
+import unittest
+from FuzzingHarness.sourceMapIndex import SourceMapIndex
+
+BASE64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+def vlq(*values):
+    """
+    Base64 VLQ segment of values, as a source map's mappings field holds them.
+    """
+    out = ""
+    for value in values:
+        value = (-value << 1) | 1 if value < 0 else value << 1
+        while True:
+            digit, value = value & 31, value >> 5
+            out += BASE64[digit | (32 if value else 0)]
+            if not value:
+                break
+    return out
+
+def span(start, end, count):
+    return {"startOffset": start, "endOffset": end, "count": count}
+
+class SourceMapIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.copy = os.path.join(self.tmp.name, "ext")
+        os.makedirs(os.path.join(self.copy, "out"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def writeScript(self, text, mappings, sources=("../src/extension.ts",)):
+        with open(os.path.join(self.copy, "out", "extension.js"), "w", encoding="utf-8", newline="") as fh:
+            fh.write(text)
+        with open(os.path.join(self.copy, "out", "extension.js.map"), "w", encoding="utf-8") as fh:
+            json.dump({"version": 3, "sources": list(sources), "mappings": mappings}, fh)
+
+    def testHitIntervalsFollowInnermostRange(self):
+        hits = SourceMapIndex.hitIntervals([span(0, 100, 1), span(10, 20, 0), span(30, 60, 2), span(40, 50, 0)])
+        self.assertEqual(hits, [[0, 10], [20, 40], [50, 100]])
+        self.assertEqual(SourceMapIndex.hitIntervals([span(0, 50, 0), span(5, 10, 3)]), [[5, 10]])
+        self.assertEqual(SourceMapIndex.hitIntervals([]), [])
+
+    def testDecodeMappingsAccumulatesDeltas(self):
+        mappings = ";".join([vlq(2, 0, 3, 0) + "," + vlq(4, 1, -1, 2), "", vlq(1) + "," + vlq(0, -1, 5, 0, 7)])
+        self.assertEqual(list(SourceMapIndex()._decodeMappings(mappings)), [
+            (0, 2, 0, 3),
+            (0, 6, 1, 2),
+            # One-field segments map to no source and are skipped, but still move the column
+            (2, 1, 0, 7),
+        ])
+
+    def testSourcePath(self):
+        mapDir = os.path.join(self.copy, "out")
+        self.assertEqual(SourceMapIndex._sourcePath("../src/a.ts", "", mapDir, self.copy), "src/a.ts")
+        self.assertEqual(SourceMapIndex._sourcePath("a.ts", "../src", mapDir, self.copy), "src/a.ts")
+        self.assertEqual(SourceMapIndex._sourcePath("webpack://ext/./src/a.ts", "", mapDir, self.copy), "src/a.ts")
+        self.assertIsNone(SourceMapIndex._sourcePath("webpack://ext/webpack/bootstrap", "", mapDir, self.copy))
+        self.assertIsNone(SourceMapIndex._sourcePath("webpack://ext/external \"vscode\"", "", mapDir, self.copy))
+        self.assertIsNone(SourceMapIndex._sourcePath("../../other/a.ts", "", mapDir, self.copy))
+
+    def testCrlfLinesKeepV8Offsets(self):
+        # Generated line 2 starts at offset 4 with \r\n endings; only line 1 ran
+        self.writeScript("a;\r\nb;\r\n", vlq(0, 0, 0, 0) + ";" + vlq(0, 0, 1, 0))
+        report = SourceMapIndex().attribute([{
+            "url": "out/extension.js",
+            "functions": [{"functionName": "", "ranges": [span(0, 8, 1), span(4, 7, 0)]}],
+        }], self.copy)
+        self.assertEqual(report["src/extension.ts"]["lines"], {1: True, 2: False})
+
+    def testMalformedMappingsAreIgnored(self):
+        self.writeScript("a;\n", vlq(0, 0, 0, 0) + "!")
+        index = SourceMapIndex()
+        self.assertIsNone(index.scriptIndex(self.copy, "out/extension.js"))
+        self.assertEqual(index.attribute([{"url": "out/extension.js", "functions": []}], self.copy), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# ./tests/test_testCaseMinimizer.py
+import json
+import unittest
+from MinimizeMutants import testCaseMinimizer
+
+class FakeHarness:
+    """
+    Replays candidates in memory: a candidate fails with "boom" when fails(candidate) is true.
+    """
+    def __init__(self, fails):
+        self.fails = fails
+        self.batchSizes = []
+
+    def replay(self, batch):
+        self.batchSizes.append(len(batch))
+        return [{"error": "boom" if self.fails(c) else None} for c in batch]
+
+    @staticmethod
+    def signature(result):
+        return result["error"]
+
+def parsed(literal):
+    try:
+        return json.loads(literal)
+    except ValueError:
+        return None
+
+def minimizer(fails, **kwargs):
+    harness = FakeHarness(fails)
+    return testCaseMinimizer.TestCaseMinimizer(harness.replay, harness.signature, **kwargs), harness
+
+class TestCaseMinimizerTest(unittest.TestCase):
+    def testDdminFindsSingleCulprit(self):
+        m, _ = minimizer(lambda items: 13 in items)
+        self.assertEqual(m.ddmin(range(40), list, "boom"), [13])
+
+    def testDdminKeepsInteractingPair(self):
+        m, _ = minimizer(lambda items: 3 in items and 29 in items)
+        self.assertEqual(sorted(m.ddmin(range(40), list, "boom")), [3, 29])
+
+    def testDdminReturnsEmptyWhenNothingIsNeeded(self):
+        m, _ = minimizer(lambda items: True)
+        self.assertEqual(m.ddmin(range(5), list, "boom"), [])
+
+    def testOtherFailuresDoNotCount(self):
+        m, _ = minimizer(lambda items: 13 in items)
+        self.assertEqual(m.ddmin(range(8), list, "other"), list(range(8)))
+
+    def testMinimizeArgsShrinksArrayToCulprit(self):
+        m, _ = minimizer(lambda args: isinstance(parsed(args[1]), list) and 7 in parsed(args[1]))
+        self.assertEqual(m.minimizeArgs(['"a long string"', "[1, 7, 3, 9, 12]"], "boom"), ["0", "[7]"])
+
+    def testMinimizeArgsMovesNumbersTowardsZero(self):
+        m, _ = minimizer(lambda args: isinstance(parsed(args[0]), int) and parsed(args[0]) != 0)
+        self.assertEqual(m.minimizeArgs(["1000"], "boom"), ["1"])
+
+    def testMinimizeLineKeepsOnlyTheFailingEdit(self):
+        m, _ = minimizer(lambda line: "z" in line)
+        self.assertEqual(m.minimizeLine("let x = 1;", "let y = 1 + z;", "boom"), "let x = 1 + z;")
+
+    def testReplaysStayWithinBudget(self):
+        m, harness = minimizer(lambda items: False, batchSize=4, maxReplays=10)
+        m.ddmin(range(64), list, "boom")
+        self.assertLessEqual(max(harness.batchSizes), 4)
+        self.assertLess(m.replays, 10 + 4)
+        self.assertEqual(m.replays, sum(harness.batchSizes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# ./tests/test_workdirMaterializer.py
+import json
+import os
+import tempfile
+import unittest
+from FuzzingHarness.workdirMaterializer import WorkdirMaterializer
+
+class WorkdirMaterializerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "ext")
+        self.dst = os.path.join(self.tmp.name, "copy")
+        for rel in ("package.json", "src/extension.ts", "src/util/a.ts", "out/extension.js",
+                    "node_modules/x/index.js", "ext-1.0.vsix", ".git/HEAD", "media/logo.png"):
+            self.write(os.path.join(self.src, *rel.split("/")), rel)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def files(self, root):
+        found = set()
+        for dirPath, _, files in os.walk(root):
+            for f in files:
+                found.add(os.path.relpath(os.path.join(dirPath, f), root).replace(os.sep, "/"))
+        return found
+
+    def testDefaultExcludes(self):
+        WorkdirMaterializer(linkMode="hardlink").materialize(self.src, self.dst)
+        self.assertEqual(self.files(self.dst), {"package.json", "src/extension.ts", "src/util/a.ts", "media/logo.png"})
+
+    def testManifestPatterns(self):
+        manifest = os.path.join(self.tmp.name, "manifest.json")
+        with open(manifest, "w", encoding="utf-8") as fh:
+            json.dump({"include": ["*.ts", "package.json"], "exclude": ["util", "node_modules"]}, fh)
+        materializer = WorkdirMaterializer(manifest, linkMode="copy")
+        self.assertTrue(materializer.isExcluded("src/util/a.ts"))
+        self.assertFalse(materializer.isIncluded("media/logo.png"))
+        materializer.materialize(self.src, self.dst)
+        # out/ is no longer excluded, but holds nothing the include list wants
+        self.assertEqual(self.files(self.dst), {"package.json", "src/extension.ts"})
+
+    def testPatchedFilesArePrivateCopies(self):
+        materializer = WorkdirMaterializer(linkMode="hardlink")
+        materializer.materialize(self.src, self.dst, patched=["src/extension.ts"])
+        for rel in ("package.json", "src/extension.ts"):
+            self.assertEqual(os.stat(os.path.join(self.dst, *rel.split("/"))).st_nlink, 1)
+        self.assertEqual(os.stat(os.path.join(self.dst, "src", "util", "a.ts")).st_nlink, 2)
+        self.assertEqual(materializer.stats["copy"], 2)
+
+    def testDetachCopiesOnlyLinkedFiles(self):
+        WorkdirMaterializer(linkMode="hardlink").materialize(self.src, self.dst)
+        linked = os.path.join(self.dst, "src", "util", "a.ts")
+        original = os.path.join(self.src, "src", "util", "a.ts")
+        self.assertTrue(os.path.samefile(linked, original))
+        WorkdirMaterializer().detach(linked)
+        self.assertFalse(os.path.samefile(linked, original))
+        with open(linked, "w", encoding="utf-8") as fh:
+            fh.write("mutated")
+        with open(original, encoding="utf-8") as fh:
+            self.assertEqual(fh.read(), "src/util/a.ts")
+        # A private file is left alone
+        inode = os.stat(linked).st_ino
+        WorkdirMaterializer().detach(linked)
+        self.assertEqual(os.stat(linked).st_ino, inode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# ./tests/test_workerPool.py
+import unittest
+from FuzzingHarness.workerPool import WorkerPool
+
+class FakeCommunicator:
+    def session(self, sessionId):
+        return sessionId
+
+    def address(self):
+        return "http://127.0.0.1:5000"
+
+class FakeFuzzer:
+    harnessMode = "sidecar"
+
+    def __init__(self, fail):
+        self.fail = fail
+        self.closed = False
+
+    def startFuzzSession(self):
+        if self.fail:
+            raise RuntimeError("VS Code did not start")
+
+    def closeFuzzSession(self):
+        self.closed = True
+
+class WorkerPoolTest(unittest.TestCase):
+    def testFailedSidecarStartIsNotReused(self):
+        fuzzers = []
+
+        def factory(workerId, communicator):
+            fuzzers.append(FakeFuzzer(fail=not fuzzers))
+            return fuzzers[-1]
+
+        ran = []
+        pool = WorkerPool(1, factory, sharedCommunicator=FakeCommunicator())
+        pool.run(["a.ts", "b.ts", "c.ts"], lambda fuzzer, communicator, path: ran.append((fuzzer, path)))
+        self.assertEqual(len(fuzzers), 2)
+        self.assertTrue(fuzzers[0].closed)
+        self.assertEqual(ran, [(fuzzers[1], "b.ts"), (fuzzers[1], "c.ts")])
+        self.assertEqual(pool.sidecarFuzzers, {0: fuzzers[1]})
+        self.assertEqual(pool.activeFuzzers, [fuzzers[1]])
+
+
+if __name__ == "__main__":
+    unittest.main()